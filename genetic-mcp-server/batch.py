@@ -0,0 +1,117 @@
+from typing import Any, Dict, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import os
+
+from genetic_algorithm.logger import logger_config
+logger = logger_config(process_name="batch", pretty=True)
+
+# A job: (position in the batch, problem, options with a built fitness function, generations)
+Job = Tuple[int, str, Dict[str, Any], int]
+
+# Jobs are packed together until their estimated cost (genes evaluated) reaches this amount
+PACK_COST = int(os.getenv("BATCH_PACK_COST", 2_000_000))
+
+# Worker processes are started once and reused by every batch
+MAX_WORKERS = int(os.getenv("BATCH_MAX_WORKERS", os.cpu_count() or 1))
+_executor: Optional[ProcessPoolExecutor] = None
+
+def job_cost(job: Job) -> int:
+    """
+    Estimate the cost of a job as the number of genes evaluated over the whole run.
+
+    :param job: The job.
+    :return: The estimated cost.
+    """
+    _, _, options, generations = job
+    return int(options.get("population_size", 1000)) * int(options.get("chromosome_size", 10)) * max(int(generations), 1)
+
+def pack_jobs(jobs: List[Job], pack_cost: Optional[int] = PACK_COST) -> List[List[Job]]:
+    """
+    Group consecutive small jobs into packs, so each worker task amortizes its scheduling and transfer
+    overhead over several jobs. Jobs costing more than `pack_cost` get a pack of their own.
+
+    :param jobs: The jobs, in batch order.
+    :param pack_cost (optional): Estimated cost at which a pack is closed.
+    :return: The packs.
+    """
+    packs = []
+    pack = []
+    cost = 0
+    for job in jobs:
+        pack.append(job)
+        cost += job_cost(job)
+        if cost >= pack_cost:
+            packs.append(pack)
+            pack = []
+            cost = 0
+
+    if pack:
+        packs.append(pack)
+
+    return packs
+
+def run_pack(pack: List[Job]) -> List[Tuple[int, Dict[str, Any]]]:
+    """
+    Run the jobs of a pack one after the other, in a worker process.
+    A failing job gets an {"error": ...} result instead of failing the whole pack. Portfolio jobs race their
+    configurations in turn, so a worker never starts processes of its own beyond the pool size.
+
+    :param pack: The jobs.
+    :return: The position and result of each job.
+    """
+    from genetic_algorithm.main import main as genetic_algorithm_main
+
+    results = []
+    for index, problem, options, generations in pack:
+        if options.get("portfolio"):
+            options = {**options, "portfolio_parallel": False}
+        try:
+            result = genetic_algorithm_main(options=options, problem=problem, generations=generations)
+        except Exception as error:
+            result = {"error": f"{type(error).__name__}: {error}"}
+        results.append((index, result))
+
+    return results
+
+def _get_executor() -> ProcessPoolExecutor:
+    """
+    Get the shared worker pool, starting it on first use.
+
+    :return: The worker pool.
+    """
+    global _executor
+    if _executor is None:
+        logger.info(f"Starting a pool of {MAX_WORKERS} batch workers.")
+        _executor = ProcessPoolExecutor(max_workers=MAX_WORKERS)
+    return _executor
+
+async def run_batch(jobs: List[Job], max_workers: Optional[int] = None, progress: Optional[Any] = None) -> Dict[int, Dict[str, Any]]:
+    """
+    Run jobs on the worker pool, with at most `max_workers` packs running at the same time.
+
+    :param jobs: The jobs.
+    :param max_workers (optional): Maximum number of packs running concurrently. Default is the pool size.
+    :param progress (optional): An async callable receiving the number of finished jobs after each pack.
+    :return: The result of each job, by position.
+    """
+    if max_workers is not None and max_workers <= 0:
+        raise ValueError("Max workers must be a positive integer.")
+
+    packs = pack_jobs(jobs)
+    logger.info(f"Running {len(jobs)} jobs in {len(packs)} packs.")
+    executor = _get_executor()
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(min(max_workers or MAX_WORKERS, MAX_WORKERS))
+
+    async def run(pack: List[Job]) -> List[Tuple[int, Dict[str, Any]]]:
+        async with semaphore:
+            return await loop.run_in_executor(executor, run_pack, pack)
+
+    results = {}
+    for finished in asyncio.as_completed([run(pack) for pack in packs]):
+        results.update(await finished)
+        if progress is not None:
+            await progress(len(results))
+
+    return results
@@ -0,0 +1,150 @@
+"""
+Backend benchmark of the genetic algorithm.
+
+Compares the pure-Python backend with the compiled one (Numba, when installed) on a random traveling salesman
+instance and a random knapsack instance: first each kernel on its own (tour lengths of a population, OX/PMX
+crossover, swap mutation, knapsack repair), then whole runs with the same seeds and settings.
+
+The one-off costs of the compiled backend are reported apart from the steady-state timings: importing Numba,
+and the first call of each kernel (compiling it, or loading it from the on-disk cache of a previous run).
+
+Run from the genetic-mcp-server directory:
+    python benchmarks/backends.py [--cities 500] [--items 500] [--generations 20] [--seeds 3]
+"""
+from typing import Callable, Dict, List, Tuple
+from array import array
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+# Logging is configured on first import; keep the runs quiet
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from genetic_algorithm.main import build_fitness_function, main as genetic_algorithm_main
+from genetic_algorithm.chromosome import Chromosome
+from genetic_algorithm.kernels import resolve_backend, select_operator
+
+def measure(function: Callable[[], None], repeat: int) -> Tuple[float, float]:
+    """
+    Time the first call of a function (which compiles the kernels) apart from the following ones.
+
+    :param function: The function.
+    :param repeat: The number of timed calls after the first one.
+    :return: The time of the first call, and the mean time of the following ones, in microseconds.
+    """
+    start = time.perf_counter()
+    function()
+    first = (time.perf_counter() - start) * 1e6
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return first, (time.perf_counter() - start) / repeat * 1e6
+
+def kernel_benchmarks(backend: str, tsp, knapsack, population: int, repeat: int) -> Dict[str, Tuple[float, float]]:
+    """
+    Time every kernel with a backend.
+
+    :param backend: "python" or "numba".
+    :param tsp: The traveling salesman fitness function.
+    :param knapsack: The knapsack fitness function.
+    :param population: The number of tours evaluated at once.
+    :param repeat: The number of timed calls of each kernel.
+    :return: The time of the first call and the mean time of the following ones of each kernel, in microseconds.
+    """
+    random.seed(0)
+    size = len(tsp.cities)
+    tours = [Chromosome(size=size, values=random.sample(tsp.cities, size)) for _ in range(population)]
+    parent1, parent2 = tours[0].values, tours[1].values
+    child1, child2 = array("i", parent1), array("i", parent2)
+    mutated = array("i", parent1)
+    items = len(knapsack.weight)
+    units = [random.randint(0, capacity) for capacity in knapsack.capacity]
+
+    tsp = tsp.with_backend(backend)
+    knapsack = knapsack.with_backend(backend)
+    timings = {"tour lengths": measure(lambda: tsp.calculate_fitness_batch(tours), max(1, repeat // population))}
+    for name in ("ox", "pmx"):
+        crossover = select_operator("crossover", name, backend)
+        timings[f"{name} crossover"] = measure(lambda: crossover(parent1, parent2, child1, child2), repeat)
+    mutation = select_operator("mutation", "swap", backend)
+    timings["swap mutation"] = measure(lambda: mutation(mutated, 0.05, None, lambda: True), repeat)
+    timings["knapsack repair"] = measure(lambda: knapsack.repair_chromosome(units, items), repeat)
+    return timings
+
+def run_benchmarks(backend: str, tsp, generations: int, seeds: int) -> List[float]:
+    """
+    Time whole traveling salesman runs with a backend.
+
+    :param backend: "python" or "numba".
+    :param tsp: The traveling salesman fitness function.
+    :param generations: The number of generations of each run.
+    :param seeds: The number of seeds run.
+    :return: The median run time, in seconds, and the mean best distance.
+    """
+    times, distances = [], []
+    for seed in range(seeds):
+        options = {
+            "population_size": 100, "chromosome_size": len(tsp.cities), "crossover": "ox", "mutation": "swap",
+            "fitness_function": tsp, "seed": seed, "backend": backend,
+        }
+        start = time.perf_counter()
+        result = genetic_algorithm_main(options=options, problem="traveling_salesman", generations=generations)
+        times.append(time.perf_counter() - start)
+        distances.append(result["distance"])
+    return [statistics.median(times), statistics.mean(distances)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the pure-Python and the compiled backends.")
+    parser.add_argument("--cities", type=int, default=500, help="Number of cities of the traveling salesman instance.")
+    parser.add_argument("--items", type=int, default=500, help="Number of items of the knapsack instance.")
+    parser.add_argument("--population", type=int, default=100, help="Number of tours evaluated at once.")
+    parser.add_argument("--repeat", type=int, default=1000, help="Number of timed calls of each kernel.")
+    parser.add_argument("--generations", type=int, default=20, help="Number of generations of the whole runs.")
+    parser.add_argument("--seeds", type=int, default=3, help="Number of seeds of the whole runs.")
+    args = parser.parse_args()
+
+    random.seed(0)
+    tsp = build_fitness_function("traveling_salesman", {
+        "coordinates": [[random.uniform(0, 1000), random.uniform(0, 1000)] for _ in range(args.cities)],
+    })
+    knapsack = build_fitness_function("knapsack", {
+        "capacity": [random.randint(1, 5) for _ in range(args.items)],
+        "weight": [random.randint(1, 100) for _ in range(args.items)],
+        "value": [random.randint(1, 100) for _ in range(args.items)],
+        "max_weight": 25 * args.items,
+    })
+
+    backends = ["python"]
+    start = time.perf_counter()
+    if resolve_backend("numba") == "numba":
+        backends.append("numba")
+        print(f"Numba import: {time.perf_counter() - start:.3f} s")
+    else:
+        print("Numba is not installed: only the pure-Python backend is measured.")
+
+    kernels = {backend: kernel_benchmarks(backend, tsp, knapsack, args.population, args.repeat) for backend in backends}
+    print(f"Kernels: {args.cities} cities, {args.items} items, tour lengths of {args.population} tours per call")
+    print(f"{'kernel':<20}" + "".join(f"{backend + ' (us)':>16}" for backend in backends)
+          + (f"{'speedup':>10}{'first call (ms)':>18}" if len(backends) > 1 else ""))
+    for name in kernels["python"]:
+        row = f"{name:<20}" + "".join(f"{kernels[backend][name][1]:>16.1f}" for backend in backends)
+        if len(backends) > 1:
+            row += f"{kernels['python'][name][1] / kernels['numba'][name][1]:>9.1f}x{kernels['numba'][name][0] / 1000:>18.1f}"
+        print(row)
+    if len(backends) > 1:
+        compile_time = sum(first - mean for first, mean in kernels["numba"].values()) / 1e6
+        print(f"Compile (or cache load) time of the kernels: {compile_time:.3f} s, not included in the timings above")
+
+    runs = {backend: run_benchmarks(backend, tsp, args.generations, args.seeds) for backend in backends}
+    # The kernels are compiled by now, so the runs only measure the steady state
+    print(f"\nRuns: {args.cities} cities, {args.generations} generations, {args.seeds} seeds, OX crossover and swap mutation")
+    print(f"{'backend':<12}{'median time (s)':>16}{'mean distance':>16}")
+    for backend, (median, distance) in runs.items():
+        print(f"{backend:<12}{median:>16.3f}{distance:>16.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Operator benchmark of the genetic algorithm.
+
+Runs a sample problem with every applicable combination of selection, crossover and mutation operators,
+on the same seeds and settings, and reports the run time and the best fitness of each combination.
+
+Run from the genetic-mcp-server directory:
+    python benchmarks/operators.py genetic_algorithm/samples/tsp.json [--seeds 3] [--generations 50]
+"""
+from typing import Any, Dict, List
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+# Logging is configured on first import; keep the runs quiet
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from genetic_algorithm.main import build_fitness_function, main as genetic_algorithm_main
+from genetic_algorithm.operators import SELECTION_OPERATORS, CROSSOVER_OPERATORS, MUTATION_OPERATORS, PERMUTATION_OPERATORS
+
+def combinations(permutation: bool) -> List[Dict[str, str]]:
+    """
+    List the operator combinations applicable to a problem.
+
+    :param permutation: Whether the problem's chromosomes are permutations.
+    :return: The combinations, as "selection", "crossover" and "mutation" options.
+    """
+    def applicable(kind: str, registry: Dict[str, Any]) -> List[str]:
+        return [name for name in registry if permutation or name not in PERMUTATION_OPERATORS.get(kind, ())]
+
+    return [
+        {"selection": selection, "crossover": crossover, "mutation": mutation}
+        for selection in applicable("selection", SELECTION_OPERATORS)
+        for crossover in applicable("crossover", CROSSOVER_OPERATORS)
+        for mutation in applicable("mutation", MUTATION_OPERATORS)
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the genetic operators on a sample problem.")
+    parser.add_argument("sample", help="Problem file, as used by genetic_algorithm.main.")
+    parser.add_argument("--seeds", type=int, default=3, help="Number of seeds run for each combination.")
+    parser.add_argument("--generations", type=int, default=None, help="Number of generations (default: the sample's).")
+    args = parser.parse_args()
+
+    with open(args.sample, "r") as file:
+        data = json.load(file)
+    problem = data["problem"]
+    generations = args.generations or data.get("generations", 100)
+    # The instance is built once and shared by every run
+    fitness_function = build_fitness_function(problem, data["options"]["fitness_function"])
+
+    rows = []
+    for operators in combinations(fitness_function.PERMUTATION):
+        times, fitnesses = [], []
+        for seed in range(args.seeds):
+            options = {**data["options"], **operators, "fitness_function": fitness_function, "seed": seed}
+            start = time.perf_counter()
+            result = genetic_algorithm_main(options=options, problem=problem, generations=generations)
+            times.append(time.perf_counter() - start)
+            fitnesses.append(result["best_fitness"])
+        rows.append((operators, statistics.median(times), statistics.mean(fitnesses)))
+
+    print(f"{problem}: {generations} generations, {args.seeds} seeds per combination")
+    print(f"{'selection':<12}{'crossover':<12}{'mutation':<14}{'median time (s)':>16}{'mean best fitness':>20}")
+    for operators, median, fitness in sorted(rows, key=lambda row: row[2], reverse=True):
+        print(f"{operators['selection']:<12}{operators['crossover']:<12}{operators['mutation']:<14}{median:>16.3f}{fitness:>20.6g}")
+
+if __name__ == "__main__":
+    main()
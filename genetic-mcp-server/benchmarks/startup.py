@@ -0,0 +1,72 @@
+"""
+Startup-time benchmark of the MCP server.
+
+MCP clients spawn the server over stdio for each session, so the time to import `server` is user-visible
+latency. This benchmark imports it in fresh interpreters, reports the timings, checks that the solvers are
+not imported at startup, and fails if the median exceeds the budget.
+
+Run from the genetic-mcp-server directory:
+    python benchmarks/startup.py [--runs 10] [--budget 1.5]
+"""
+from typing import List
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Default budget, in seconds, for importing the server (most of it is spent importing the MCP SDK)
+STARTUP_BUDGET = float(os.getenv("STARTUP_BUDGET", 1.5))
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import server
+elapsed = time.perf_counter() - start
+solvers = sorted(name for name in sys.modules if name.startswith("genetic_algorithm.") and name != "genetic_algorithm.logger")
+print(json.dumps({"elapsed": elapsed, "solvers": solvers}))
+"""
+
+def measure(runs: int) -> List[dict]:
+    """
+    Import the server in `runs` fresh interpreters.
+
+    :param runs: The number of runs.
+    :return: The import time and the solver modules loaded by each run.
+    """
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE],
+            cwd=SERVER_DIR, capture_output=True, text=True, check=True,
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    return samples
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the startup time of the MCP server.")
+    parser.add_argument("--runs", type=int, default=10, help="Number of fresh interpreters to measure.")
+    parser.add_argument("--budget", type=float, default=STARTUP_BUDGET, help="Maximum median import time, in seconds.")
+    args = parser.parse_args()
+
+    samples = measure(args.runs)
+    times = [sample["elapsed"] for sample in samples]
+    median = statistics.median(times)
+    print(f"Server import over {args.runs} runs: median {median:.3f}s, min {min(times):.3f}s, max {max(times):.3f}s (budget {args.budget:.3f}s)")
+
+    failed = False
+    solvers = samples[0]["solvers"]
+    if solvers:
+        print(f"FAIL: solver modules imported at startup: {', '.join(solvers)}")
+        failed = True
+    if median > args.budget:
+        print(f"FAIL: median startup time exceeds the budget by {median - args.budget:.3f}s")
+        failed = True
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+from collections import OrderedDict
+import copy
+import hashlib
+import json
+import os
+import time
+
+import sys
+
+from genetic_algorithm.logger import logger_config
+logger = logger_config(process_name="cache", pretty=True)
+
+# The solvers are imported on first use, to keep the server startup fast
+if TYPE_CHECKING:
+    from genetic_algorithm.fitness_functions.fitness_function import FitnessFunction
+    from genetic_algorithm.gen_alg import GeneticAlgorithm
+
+def canonical_json(data: Any) -> str:
+    """
+    Serialize JSON-like data with sorted keys and no whitespace.
+
+    :param data: The data to serialize.
+    :return: The JSON string.
+    """
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+
+class InstanceCache:
+    """
+    An in-memory cache of validated problem instances, keyed by the hash of their content.
+
+    Building a fitness function parses and validates its parameters (and precomputes lookups such as the
+    city index), so instances solved repeatedly are built once and reused. The least recently used
+    instances are evicted when the total size of their parameters exceeds `max_bytes`.
+    """
+    def __init__(self, max_bytes: Optional[int] = None):
+        """
+        Initialize the instance cache.
+
+        :param max_bytes (optional): Maximum total size of the cached instances, measured on their JSON parameters.
+        Default is the INSTANCE_CACHE_MAX_BYTES environment variable, or 256 MB.
+        """
+        if max_bytes is None:
+            max_bytes = int(os.getenv("INSTANCE_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+        if max_bytes < 0:
+            raise ValueError("Instance cache size must be a non-negative integer.")
+
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._instances: "OrderedDict[str, Tuple[str, FitnessFunction, int]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._instances)
+
+    def __contains__(self, instance_id: str) -> bool:
+        return instance_id in self._instances
+
+    def add(self, problem: str, fields: Dict[str, Any]) -> str:
+        """
+        Validate an instance and cache its fitness function. Instances already cached are not rebuilt.
+
+        :param problem: The problem type.
+        :param fields: The fitness function parameters.
+        :return: The instance ID.
+        """
+        payload = canonical_json({"problem": problem, "fitness_function": fields})
+        instance_id = hashlib.sha256(payload.encode()).hexdigest()[:32]
+        if instance_id in self._instances:
+            self._instances.move_to_end(instance_id)
+            return instance_id
+
+        from genetic_algorithm.main import build_fitness_function
+        fitness_function = build_fitness_function(problem, fields)
+        size = len(payload)
+        self._instances[instance_id] = (problem, fitness_function, size)
+        self.total_bytes += size
+        logger.debug(f"Cached {problem} instance {instance_id} ({size} bytes).")
+
+        # Evict the least recently used instances, but always keep the new one
+        while self.total_bytes > self.max_bytes and len(self._instances) > 1:
+            evicted_id, (_, _, evicted_size) = self._instances.popitem(last=False)
+            self.total_bytes -= evicted_size
+            logger.debug(f"Evicted instance {evicted_id} ({evicted_size} bytes).")
+
+        return instance_id
+
+    def get(self, instance_id: str, problem: Optional[str] = None) -> "FitnessFunction":
+        """
+        Get the fitness function of a cached instance.
+
+        :param instance_id: The instance ID.
+        :param problem (optional): The expected problem type.
+        :return: The fitness function.
+        """
+        if instance_id not in self._instances:
+            raise ValueError(f"Unknown instance ID: {instance_id}. It may have been evicted; upload the instance again.")
+
+        cached_problem, fitness_function, _ = self._instances[instance_id]
+        if problem is not None and cached_problem != problem:
+            raise ValueError(f"Instance {instance_id} is a {cached_problem} instance, not a {problem} instance.")
+
+        self._instances.move_to_end(instance_id)
+        return fitness_function
+
+    def resolve(self, problem: str, fitness_function: Optional[Dict[str, Any]], instance_id: Optional[str]) -> Tuple[str, "FitnessFunction"]:
+        """
+        Get the fitness function of a solve request, given either inline parameters or an instance ID.
+
+        :param problem: The problem type.
+        :param fitness_function: The fitness function parameters, if sent inline.
+        :param instance_id: The ID returned by `add`, if the instance was uploaded.
+        :return: The instance ID and the fitness function.
+        """
+        if not instance_id:
+            if not fitness_function or not isinstance(fitness_function, dict):
+                raise ValueError("Fitness function parameters or an instance ID must be provided.")
+            instance_id = self.add(problem, fitness_function)
+
+        return instance_id, self.get(instance_id, problem)
+
+class ResultCache:
+    """
+    An in-memory cache of completed solve results, keyed by the hash of the problem, the instance and the
+    genetic algorithm options (including the seed). Only seeded runs are cached: a run without a seed asks
+    for a fresh stochastic result every time.
+
+    Entries expire after `ttl` seconds, and the least recently used ones are evicted when their total
+    estimated size exceeds `max_bytes`. The latest genetic algorithm of each run is kept with its result,
+    so a request that only asks for more generations can continue it instead of starting over. Continued
+    (warm-started) results are kept apart from the reproducible ones: they are only returned to requests
+    that allow warm starts.
+    """
+    def __init__(self, ttl: Optional[float] = None, max_bytes: Optional[int] = None):
+        """
+        Initialize the result cache.
+
+        :param ttl (optional): Lifetime of an entry, in seconds. Default is the RESULT_CACHE_TTL environment
+        variable, or 3600.
+        :param max_bytes (optional): Maximum total estimated size of the entries. Default is the
+        RESULT_CACHE_MAX_BYTES environment variable, or 64 MB.
+        """
+        if ttl is None:
+            ttl = float(os.getenv("RESULT_CACHE_TTL", 3600))
+        if max_bytes is None:
+            max_bytes = int(os.getenv("RESULT_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+        if ttl < 0 or max_bytes < 0:
+            raise ValueError("Result cache TTL and size must be non-negative.")
+
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        # (run key, generations, warm-started) -> (expiry time, result, genetic algorithm or None, size)
+        self._entries: "OrderedDict[Tuple[str, int, bool], Tuple[float, Dict[str, Any], Optional[GeneticAlgorithm], int]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def run_key(problem: str, instance_id: str, options: Dict[str, Any]) -> str:
+        """
+        Hash everything that determines a run, except the number of generations.
+
+        :param problem: The problem type.
+        :param instance_id: The instance ID.
+        :param options: The genetic algorithm options (the fitness function is identified by `instance_id`).
+        :return: The run key.
+        """
+        settings = {key: value for key, value in options.items() if key != "fitness_function"}
+        data = {"problem": problem, "instance_id": instance_id, "options": settings}
+        return hashlib.sha256(canonical_json(data).encode()).hexdigest()
+
+    def solve(self, problem: str, instance_id: str, options: Dict[str, Any], generations: int, warm_start: Optional[bool] = False) -> Dict[str, Any]:
+        """
+        Get the result of a solve request from the cache, or run the genetic algorithm and cache its result.
+
+        :param problem: The problem type.
+        :param instance_id: The ID of the instance in the instance cache.
+        :param options: The genetic algorithm options, with the built fitness function.
+        :param generations: The number of generations.
+        :param warm_start (optional): Whether to continue a cached run of the same request with fewer generations,
+        instead of starting a new one. Default is False.
+        :return: The result, with "cached": True if it comes from the cache.
+        """
+        cached = self.get(problem, instance_id, options, generations, warm_start=warm_start)
+        if cached is not None:
+            return cached
+
+        run_key = self.run_key(problem, instance_id, options)
+
+        # Continue the cached run with the most generations below the requested ones
+        genetic_algorithm = None
+        previous = None
+        if warm_start:
+            previous = max(
+                ((cached_generations, warm) for key, cached_generations, warm in self._entries
+                 if key == run_key and cached_generations < generations and self._entries[(key, cached_generations, warm)][2] is not None),
+                default=None
+            )
+        if previous is not None:
+            expiry, previous_result, genetic_algorithm, size = self._entries[(run_key, *previous)]
+            # The algorithm moves on to the new entry; the previous result stays cached on its own
+            result_size = len(canonical_json(previous_result))
+            self._entries[(run_key, *previous)] = (expiry, previous_result, None, result_size)
+            previous = previous[0]
+            self.total_bytes -= size - result_size
+            logger.info(f"Warm-starting {problem} run {run_key[:12]} from generation {previous} to {generations}.")
+
+        from genetic_algorithm.main import solve
+        result, genetic_algorithm = solve(
+            options=options,
+            problem=problem,
+            generations=generations - previous if previous is not None else generations,
+            genetic_algorithm=genetic_algorithm,
+        )
+        if previous is not None:
+            result["warm_start"] = previous
+
+        return self.put(problem, instance_id, options, generations, result, genetic_algorithm, warm=previous is not None)
+
+    def get(self, problem: str, instance_id: str, options: Dict[str, Any], generations: int, warm_start: Optional[bool] = False) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached result of a solve request.
+
+        :param problem: The problem type.
+        :param instance_id: The ID of the instance in the instance cache.
+        :param options: The genetic algorithm options.
+        :param generations: The number of generations.
+        :param warm_start (optional): Whether a warm-started result may be returned, when the run from scratch
+        is not cached. Default is False.
+        :return: A copy of the result with "cached": True, or None if it is not cached.
+        """
+        self._expire()
+        run_key = self.run_key(problem, instance_id, options)
+        keys = [(run_key, generations, False), (run_key, generations, True)] if warm_start else [(run_key, generations, False)]
+        key = next((key for key in keys if key in self._entries), None)
+        if key is None:
+            return None
+        entry = self._entries[key]
+
+        self._entries.move_to_end(key)
+        logger.info(f"Returning cached result for {problem} run {key[0][:12]} ({generations} generations).")
+        result = copy.deepcopy(entry[1])
+        result["cached"] = True
+        return result
+
+    def put(
+            self,
+            problem: str,
+            instance_id: str,
+            options: Dict[str, Any],
+            generations: int,
+            result: Dict[str, Any],
+            genetic_algorithm: Optional["GeneticAlgorithm"] = None,
+            warm: Optional[bool] = False
+    ) -> Dict[str, Any]:
+        """
+        Cache the result of a solve request. Results of runs without a seed are not cached.
+
+        :param problem: The problem type.
+        :param instance_id: The ID of the instance in the instance cache.
+        :param options: The genetic algorithm options.
+        :param generations: The number of generations.
+        :param result: The result.
+        :param genetic_algorithm (optional): The genetic algorithm that produced it, kept for warm starts.
+        :param warm (optional): Whether the run continued a cached one. Default is False.
+        :return: A copy of the result with "cached": False.
+        """
+        if options.get("seed") is not None:
+            self._store((self.run_key(problem, instance_id, options), generations, warm), result, genetic_algorithm)
+        result = copy.deepcopy(result)
+        result["cached"] = False
+        return result
+
+    def _store(self, key: Tuple[str, int, bool], result: Dict[str, Any], genetic_algorithm: Optional["GeneticAlgorithm"]):
+        """
+        Cache a result and its genetic algorithm, evicting the least recently used entries if needed.
+
+        :param key: The run key, the number of generations and whether the run was warm-started.
+        :param result: The result.
+        :param genetic_algorithm: The genetic algorithm that produced it, if it can be continued.
+        """
+        # Estimate the size from the serialized result and the genotypes of the population
+        size = len(canonical_json(result))
+        if genetic_algorithm is not None:
+            size += sum(sys.getsizeof(chromosome.values) for chromosome in genetic_algorithm.population.chromosomes)
+        if key in self._entries:
+            self.total_bytes -= self._entries.pop(key)[3]
+
+        self._entries[key] = (time.monotonic() + self.ttl, copy.deepcopy(result), genetic_algorithm, size)
+        self.total_bytes += size
+
+        while self.total_bytes > self.max_bytes and self._entries:
+            evicted_key, (_, _, _, evicted_size) = self._entries.popitem(last=False)
+            self.total_bytes -= evicted_size
+            logger.debug(f"Evicted cached result {evicted_key[0][:12]} ({evicted_key[1]} generations, {evicted_size} bytes).")
+
+    def _expire(self):
+        """
+        Remove the expired entries.
+        """
+        now = time.monotonic()
+        for key in [key for key, entry in self._entries.items() if entry[0] <= now]:
+            self.total_bytes -= self._entries.pop(key)[3]
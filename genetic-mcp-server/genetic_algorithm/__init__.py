@@ -0,0 +1,5 @@
+"""
+Genetic algorithm solvers for the knapsack, traveling salesman and vehicle routing problems.
+
+Modules are imported on demand: importing the package does not load the solvers.
+"""
@@ -1,22 +1,116 @@
-from typing import List
-from gene import Gene
+from array import array
+from typing import Any, Iterable, List, Optional, Sequence
+from genetic_algorithm.gene import Gene
+
+def compact_values(values: Iterable[Any]) -> Sequence[Any]:
+    """
+    Store gene values compactly: as an array('i') when they are all (32-bit) integers, or as a list otherwise.
+
+    :param values: The gene values. An array('i') is used as is.
+    :return: An array('i') or a list with the values.
+    """
+    if isinstance(values, array) and values.typecode == "i":
+        return values
+
+    values = list(values)
+    if all(type(value) is int for value in values):
+        try:
+            return array("i", values)
+        except OverflowError:
+            pass
+
+    return values
 
 class Chromosome:
     """
     A class to represent a chromosome in a genetic algorithm.
+
+    The gene values are stored in a single compact sequence (`values`); `genes` builds Gene objects on demand.
     """
+    __slots__ = ("size", "values", "fitness", "mutation_rate", "crossover_rate", "weight", "distance", "routes", "violation")
+
+    # Metrics cached on the chromosome by the fitness functions and the constraint handling
+    METRICS = ("weight", "distance", "routes", "violation")
 
-    def __init__(self, size: int, genes: List[Gene]):
+    def __init__(self, size: int, genes: Optional[List[Gene]] = None, values: Optional[Iterable[Any]] = None):
         """
         Initialize a chromosome with a given size and optional genes.
         
         :param size: The size of the chromosome.
         :param genes: Optional list of genes to initialize the chromosome with.
+        :param values: Optional gene values to initialize the chromosome with (instead of `genes`).
         """
         if size <= 0:
             raise ValueError("Chromosome size must be greater than 0.")
         
         self.size = size
-        self.genes = genes
+        self.values = compact_values(values if values is not None else (gene.value for gene in genes or []))
         self.fitness = 0
-    
+
+        # Per-chromosome rates, only used by self-adaptive runs
+        self.mutation_rate = None
+        self.crossover_rate = None
+
+        # Metrics cached by the fitness functions
+        self.weight = None
+        self.distance = None
+        self.routes = None
+
+        # Normalized constraint violation (0 when feasible)
+        self.violation = 0
+
+    @property
+    def genes(self) -> List[Gene]:
+        """
+        The genes of the chromosome, built from its values.
+        Changing these Gene objects does not change the chromosome; assign `genes` or `values` instead.
+        """
+        return [Gene(value) for value in self.values]
+
+    @genes.setter
+    def genes(self, genes: List[Gene]):
+        self.values = compact_values(gene.value for gene in genes)
+
+    def key(self) -> Any:
+        """
+        Get a hashable key identifying the gene values of the chromosome.
+
+        :return: The bytes of the values array, or a tuple of the values.
+        """
+        return self.values.tobytes() if isinstance(self.values, array) else tuple(self.values)
+
+    def assign(self, other: "Chromosome"):
+        """
+        Overwrite this chromosome with the values, fitness, rates and metrics of another one,
+        reusing the existing values buffer when possible.
+
+        :param other: The chromosome to copy from.
+        """
+        if type(self.values) is type(other.values) and len(self.values) == len(other.values):
+            self.values[:] = other.values
+        else:
+            self.values = other.values[:]
+
+        self.size = other.size
+        self.fitness = other.fitness
+        self.mutation_rate = other.mutation_rate
+        self.crossover_rate = other.crossover_rate
+        for metric in self.METRICS:
+            setattr(self, metric, getattr(other, metric))
+
+    def copy(self) -> "Chromosome":
+        """
+        Create an independent copy of the chromosome.
+
+        The values are copied as well, so mutating the copy never touches the original.
+
+        :return: A new Chromosome with the same gene values and fitness.
+        """
+        chromosome = Chromosome(size=self.size, values=self.values[:])
+        chromosome.fitness = self.fitness
+        chromosome.mutation_rate = self.mutation_rate
+        chromosome.crossover_rate = self.crossover_rate
+        for metric in self.METRICS:
+            setattr(chromosome, metric, getattr(self, metric))
+
+        return chromosome
@@ -0,0 +1,3 @@
+"""
+Fitness functions of the supported problems.
+"""
@@ -0,0 +1,254 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from collections import OrderedDict
+import math
+
+from genetic_algorithm.logger import logger_config
+logger = logger_config(process_name="distance_source", pretty=True)
+
+# Mean Earth radius, in kilometers
+EARTH_RADIUS = 6371.0088
+
+# NumPy is optional: when installed, it reads coordinates given as arrays (e.g. from instance files) and
+# computes whole distance rows at once
+np = None
+
+def _import_numpy() -> bool:
+    """
+    Import NumPy on first use.
+
+    :return: True if NumPy is installed.
+    """
+    global np
+    if np is None:
+        try:
+            import numpy as np
+        except ImportError:
+            return False
+    return True
+
+def _coordinate_pairs(coordinates: Any) -> Tuple[List[float], List[float]]:
+    """
+    Validate coordinates and split them into two lists.
+
+    :param coordinates: A non-empty (n, 2) array-like: a list of [x, y] pairs or a (memory-mapped) NumPy array.
+    :return: The first and second coordinate of every location, as Python floats.
+    """
+    if _import_numpy():
+        try:
+            points = np.asarray(coordinates, dtype=np.float64)
+        except (TypeError, ValueError):
+            points = None
+        if points is None or points.ndim != 2 or points.shape[0] == 0 or points.shape[1] != 2:
+            raise ValueError("Coordinates must be a non-empty list of [x, y] pairs.")
+        return points[:, 0].tolist(), points[:, 1].tolist()
+
+    try:
+        if not coordinates or not all(len(point) == 2 for point in coordinates):
+            raise ValueError("Coordinates must be a non-empty list of [x, y] pairs.")
+        return [float(point[0]) for point in coordinates], [float(point[1]) for point in coordinates]
+    except TypeError:
+        raise ValueError("Coordinates must be a non-empty list of [x, y] pairs.")
+
+class DistanceSource:
+    """
+    A class to represent the distances between the locations of a routing problem.
+
+    Rows are accessed like a matrix (`source[i][j]`), and single distances through `distance(i, j)`.
+    """
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: int) -> Sequence[float]:
+        return self.row(index)
+
+    def row(self, index: int) -> Sequence[float]:
+        """
+        Get the distances from one location to every location.
+
+        :param index: The index of the location.
+        :return: A sequence with the distance to every location.
+        """
+        raise NotImplementedError
+
+    def distance(self, origin: int, destination: int) -> float:
+        """
+        Get the distance between two locations.
+
+        :param origin: The index of the origin.
+        :param destination: The index of the destination.
+        :return: The distance.
+        """
+        return self.row(origin)[destination]
+
+class DenseDistances(DistanceSource):
+    """
+    Distances given as a full (nested lists) distance matrix.
+    """
+    def __init__(self, matrix: List[List[float]]):
+        """
+        Initialize the distances with a square matrix.
+
+        :param matrix: The distance matrix, as nested lists or as a 2-D (memory-mapped) NumPy array.
+        """
+        # NumPy arrays are kept as they are (zero-copy); their rows and distances are returned as Python numbers
+        self.is_array = hasattr(matrix, "shape")
+        if self.is_array:
+            if len(matrix.shape) != 2 or matrix.shape[0] != matrix.shape[1]:
+                raise ValueError("Distance matrix must be a square matrix.")
+        elif not all(len(row) == len(matrix) for row in matrix):
+            raise ValueError("Distance matrix must be a square matrix.")
+
+        self.matrix = matrix
+        self.size = len(matrix)
+
+    def row(self, index: int) -> Sequence[float]:
+        return self.matrix[index].tolist() if self.is_array else self.matrix[index]
+
+    def distance(self, origin: int, destination: int) -> float:
+        if self.is_array:
+            return self.matrix[origin, destination].item()
+        return self.matrix[origin][destination]
+
+class CoordinateDistances(DistanceSource):
+    """
+    Distances computed on demand from the coordinates of the locations.
+
+    Whole rows are computed at once (vectorized with NumPy when it is installed) and kept in a bounded LRU
+    cache, so memory stays at O(n * cache_size) instead of the O(n^2) of a dense matrix.
+    """
+    METRICS = ("euclidean", "manhattan", "haversine")
+
+    def __init__(self, coordinates: List[Sequence[float]], metric: Optional[str] = "euclidean", cache_size: Optional[int] = 256):
+        """
+        Initialize the distances with the coordinates of every location.
+
+        :param coordinates: A list of [x, y] coordinates, or [latitude, longitude] in degrees for "haversine". Any
+        (n, 2) array-like is accepted, e.g. a (memory-mapped) NumPy array loaded from an instance file.
+        :param metric (optional): The distance metric: "euclidean", "manhattan" or "haversine" (great-circle distance in km). Default is "euclidean".
+        :param cache_size (optional): Maximum number of rows kept in the cache. Default is 256.
+        """
+        if metric not in self.METRICS:
+            raise ValueError(f"Unknown metric: {metric}. Must be one of {', '.join(self.METRICS)}.")
+        xs, ys = _coordinate_pairs(coordinates)
+        if cache_size is None or cache_size < 0:
+            raise ValueError("Cache size must be a non-negative integer.")
+
+        self.metric = metric
+        self.size = len(xs)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[int, List[float]]" = OrderedDict()
+
+        if metric == "haversine":
+            # Work in radians, with the cosine of the latitude precomputed
+            self.xs = [math.radians(x) for x in xs]
+            self.ys = [math.radians(y) for y in ys]
+            self.cos_xs = [math.cos(x) for x in self.xs]
+        else:
+            self.xs = xs
+            self.ys = ys
+
+        # Arrays of the coordinates for the vectorized rows; the lists above serve single distances, which are
+        # faster on Python floats
+        self._arrays = None
+        if _import_numpy():
+            self._arrays = (np.array(self.xs), np.array(self.ys), np.array(self.cos_xs) if metric == "haversine" else None)
+
+    def row(self, index: int) -> Sequence[float]:
+        cached = self._cache.get(index)
+        if cached is not None:
+            self._cache.move_to_end(index)
+            return cached
+
+        x, y = self.xs[index], self.ys[index]
+        if self._arrays is not None:
+            # Rows are returned as lists of Python floats, which callers index faster than arrays
+            xs, ys, cos_xs = self._arrays
+            if self.metric == "euclidean":
+                row = np.hypot(x - xs, y - ys).tolist()
+            elif self.metric == "manhattan":
+                row = (np.abs(x - xs) + np.abs(y - ys)).tolist()
+            else:
+                haversine = np.sin((xs - x) / 2) ** 2 + self.cos_xs[index] * cos_xs * np.sin((ys - y) / 2) ** 2
+                row = (2 * EARTH_RADIUS * np.arcsin(np.sqrt(np.minimum(1.0, haversine)))).tolist()
+        elif self.metric == "euclidean":
+            row = [math.hypot(x - other_x, y - other_y) for other_x, other_y in zip(self.xs, self.ys)]
+        elif self.metric == "manhattan":
+            row = [abs(x - other_x) + abs(y - other_y) for other_x, other_y in zip(self.xs, self.ys)]
+        else:
+            cos_x = self.cos_xs[index]
+            row = [
+                2 * EARTH_RADIUS * math.asin(math.sqrt(min(1.0,
+                    math.sin((other_x - x) / 2) ** 2 + cos_x * cos_other_x * math.sin((other_y - y) / 2) ** 2
+                )))
+                for other_x, other_y, cos_other_x in zip(self.xs, self.ys, self.cos_xs)
+            ]
+
+        if self.cache_size:
+            self._cache[index] = row
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return row
+
+    def distance(self, origin: int, destination: int) -> float:
+        cached = self._cache.get(origin)
+        if cached is not None:
+            return cached[destination]
+
+        x, y = self.xs[origin], self.ys[origin]
+        other_x, other_y = self.xs[destination], self.ys[destination]
+        if self.metric == "euclidean":
+            return math.hypot(x - other_x, y - other_y)
+        if self.metric == "manhattan":
+            return abs(x - other_x) + abs(y - other_y)
+
+        haversine = math.sin((other_x - x) / 2) ** 2 + self.cos_xs[origin] * self.cos_xs[destination] * math.sin((other_y - y) / 2) ** 2
+        return 2 * EARTH_RADIUS * math.asin(math.sqrt(min(1.0, haversine)))
+
+def insert_cheapest(tour: List[int], locations: Sequence[int], distances: DistanceSource) -> List[int]:
+    """
+    Insert locations into a closed tour, one by one, where each one increases the tour length the least.
+
+    :param tour: The tour (indices of the locations), modified in place.
+    :param locations: The locations to insert.
+    :param distances: The distances between the locations.
+    :return: The tour.
+    """
+    distance = distances.distance
+    for location in locations:
+        if len(tour) < 2:
+            tour.append(location)
+            continue
+
+        row = distances.row(location)
+        best = min(
+            range(len(tour)),
+            key=lambda i: distance(tour[i - 1], location) + row[tour[i]] - distance(tour[i - 1], tour[i])
+        )
+        tour.insert(best, location)
+
+    return tour
+
+def distance_source(fields: Dict[str, Any]) -> DistanceSource:
+    """
+    Build the distance source described by the fitness function fields: either a dense 'distance_matrix',
+    or 'coordinates' with an optional 'metric' and 'cache_size'.
+
+    :param fields: The fitness function fields.
+    :return: A DistanceSource.
+    """
+    if "distance_matrix" in fields:
+        if not isinstance(fields["distance_matrix"], list) and not hasattr(fields["distance_matrix"], "shape"):
+            raise ValueError("Distance matrix must be a list of lists.")
+        return DenseDistances(fields["distance_matrix"])
+
+    if "coordinates" in fields:
+        distances = CoordinateDistances(
+            fields["coordinates"],
+            metric=fields.get("metric", "euclidean"),
+            cache_size=int(fields.get("cache_size", 256)),
+        )
+        logger.debug(f"Using {distances.metric} distances computed from {len(distances)} coordinates.")
+        return distances
+
+    raise ValueError("Fields must contain either 'distance_matrix' or 'coordinates'.")
@@ -1,25 +1,41 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from abc import ABC, abstractmethod
+import copy
 
-from chromosome import Chromosome
-from gene import Gene
-from population import Population
+from genetic_algorithm.chromosome import Chromosome
+from genetic_algorithm.gene import Gene
+from genetic_algorithm.population import Population
+from genetic_algorithm.fitness_functions.instance_files import load_instance_fields
 
 # Implement an interface for fitness functions
 class FitnessFunction(ABC):
     """
     A class to represent a fitness function for a genetic algorithm.
     """
+    # Objectives available to multi-objective runs, with their sense ("max" or "min")
+    OBJECTIVES: Dict[str, str] = {}
+
+    # Whether chromosomes are permutations of the genes (tours), which enables the permutation operators
+    PERMUTATION = False
+
+    # Implementation of the hot loops: "python", or "numba" for the compiled kernels (see `kernels`)
+    backend = "python"
+
     def __init__(self, fields: Dict[str, Any]):
         """
         Initialize the fitness function with the required fields.
         
         :param fields: A list of dictionaries representing the fields required by the fitness function.
+        Fields may reference binary .npy/.npz files instead of holding the data inline (see `load_instance_fields`).
         """
-        self.fields = fields
+        self.fields = load_instance_fields(fields) if fields else fields
         if not self.fields:
             raise ValueError("Fitness function must have at least one field.")
 
+        # Compiled kernels, prepared on first use with the "numba" backend and shared with the copies made by
+        # `with_backend`
+        self._kernels: Dict[str, Any] = {}
+
     @abstractmethod
     def generate_gene(self, index: Optional[int] = None, value: Optional[float] = None) -> Gene:
         """
@@ -49,13 +65,119 @@ class FitnessFunction(ABC):
         """
         pass
 
+    def calculate_fitness_batch(self, chromosomes: List[Chromosome]) -> List[float]:
+        """
+        Calculate the fitness of a batch of chromosomes.
+
+        Fitness functions with a cheaper way of evaluating many chromosomes at once should override this method.
+
+        :param chromosomes: The chromosomes for which to calculate fitness.
+        :return: The fitness value of each chromosome, in the same order.
+        """
+        return [self.calculate_fitness(chromosome) for chromosome in chromosomes]
+
+    def with_backend(self, backend: str) -> "FitnessFunction":
+        """
+        Get the fitness function with the implementation of its hot loops selected. Fitness functions with compiled
+        kernels use them with the "numba" backend, and the pure-Python path otherwise.
+
+        The fitness function itself is left unchanged, as a cached instance may serve runs with different backends
+        at once: another backend gets a shallow copy, which shares the instance data and the prepared kernels.
+
+        :param backend: The resolved backend, "python" or "numba" (see `kernels.resolve_backend`).
+        :return: The fitness function, or a copy of it using the backend.
+        """
+        if backend == self.backend:
+            return self
+
+        fitness_function = copy.copy(self)
+        fitness_function.backend = backend
+        return fitness_function
+
+    def objective(self, chromosome: Chromosome, name: str) -> float:
+        """
+        Get the value of an objective for an evaluated chromosome.
+
+        :param chromosome: The chromosome, after `calculate_fitness_batch`.
+        :param name: The name of the objective, one of `OBJECTIVES`.
+        :return: The objective value.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support multi-objective runs.")
+
+    def calculate_objectives_batch(self, chromosomes: List[Chromosome], objectives: Sequence[str]) -> List[Tuple[float, ...]]:
+        """
+        Calculate the objective vectors of a batch of chromosomes. The fitness (and the metrics cached on the
+        chromosomes) is calculated in the same pass.
+
+        :param chromosomes: The chromosomes to evaluate.
+        :param objectives: The names of the objectives.
+        :return: The objective values of each chromosome, in the same order.
+        """
+        unknown = [name for name in objectives if name not in self.OBJECTIVES]
+        if unknown:
+            raise ValueError(f"Unknown objectives: {', '.join(unknown)}. Must be among {', '.join(self.OBJECTIVES) or 'none'}.")
+
+        self.calculate_fitness_batch(chromosomes)
+        return [tuple(self.objective(chromosome, name) for name in objectives) for chromosome in chromosomes]
+
+    def is_valid(self, chromosome: Chromosome) -> bool:
+        """
+        Check the hard constraints of a chromosome, i.e. those of its encoding (e.g. a tour must be a
+        permutation). Invalid chromosomes never enter the population, whatever the constraint handling.
+
+        :param chromosome: The chromosome.
+        :return: True if the chromosome is valid.
+        """
+        return True
+
+    def constraint_violation(self, chromosome: Chromosome) -> float:
+        """
+        Measure how much a chromosome violates the soft constraints of the problem, from its gene values.
+        Depending on the constraint handling, violating chromosomes are rejected or kept with a penalty.
+
+        Fitness functions with such constraints should override this method. The violation is normalized
+        (e.g. the relative excess over a limit) so penalty weights mean the same for every problem.
+
+        :param chromosome: The chromosome.
+        :return: 0 if the chromosome is feasible, a positive number otherwise.
+        """
+        return 0.0
+
+    def calculate_violation_batch(self, chromosomes: List[Chromosome]) -> List[float]:
+        """
+        Measure the constraint violation of a batch of chromosomes, right after `calculate_fitness_batch`.
+        Overrides may reuse the metrics cached on the chromosomes by the fitness calculation.
+
+        :param chromosomes: The evaluated chromosomes.
+        :return: The violation of each chromosome, in the same order.
+        """
+        return [self.constraint_violation(chromosome) for chromosome in chromosomes]
+
+    def repair_chromosome(self, values: Sequence[Any], chromosome_size: int) -> Chromosome:
+        """
+        Turn caller-supplied gene values (e.g. the best chromosome of a previous run) into a valid chromosome.
+
+        Fitness functions whose instances can grow or change between runs should override this method to adapt
+        values built for the previous instance, e.g. by adding the new items or cities.
+
+        :param values: The gene values.
+        :param chromosome_size: The size of the chromosome.
+        :return: The chromosome.
+        """
+        if len(values) != chromosome_size:
+            raise ValueError(f"Initial chromosome {list(values)} must have {chromosome_size} genes.")
+
+        return Chromosome(size=chromosome_size, values=values)
+
     @abstractmethod
-    def generate_population(self, size: int, chromosome_size: int) -> Population:
+    def generate_population(self, size: int, chromosome_size: int, seed_fraction: Optional[float] = 0.0) -> Population:
         """
         Generate a population of chromosomes based on the fitness function's requirements.
         
         :param size: The number of chromosomes in the population.
         :param chromosome_size: The size of each chromosome.
+        :param seed_fraction (optional): Fraction of the population built with problem-specific
+        constructive heuristics instead of at random. Default is 0.
         :return: A list of chromosomes.
         """
         pass
@@ -0,0 +1,178 @@
+from typing import Any, Dict, Tuple
+import copyreg
+import mmap
+import os
+import struct
+import zipfile
+
+from genetic_algorithm.logger import logger_config
+logger = logger_config(process_name="instance_files", pretty=True)
+
+# NumPy is only needed (and imported) for binary instance files
+np = None
+
+def is_file_reference(value: Any) -> bool:
+    """
+    Check whether a fitness function field references a binary file instead of holding the data inline.
+
+    :param value: The field value.
+    :return: True if the value is a {"file": ..., "key": ...} reference.
+    """
+    return isinstance(value, dict) and "file" in value
+
+def load_instance_fields(fields: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Resolve the binary file references of the fitness function fields.
+
+    - "instance_file": path to a .npz file; every array in it becomes a field (inline fields take precedence).
+    - Any field may be {"file": "path.npy"} or {"file": "path.npz", "key": "array_name"}.
+
+    Matrices (2 or more dimensions) are memory-mapped read-only, so concurrent runs share them through the
+    page cache instead of each parsing and copying them. They are pickled as their file, offset and layout, so
+    batch worker processes map the same pages again instead of receiving a copy.
+
+    1-D arrays are copied into lists, and 0-d arrays into scalars: the fitness functions read them element by
+    element in their hot loops (and validate them as lists), where Python numbers are much faster than NumPy
+    scalars. The copy is O(n) once per instance, against the O(n^2) matrices that stay mapped.
+
+    :param fields: The fitness function fields.
+    :return: The fields with every file reference replaced by its data.
+    """
+    if "instance_file" not in fields and not any(is_file_reference(value) for value in fields.values()):
+        return fields
+
+    global np
+    if np is None:
+        try:
+            import numpy as np
+        except ImportError:
+            raise ValueError("NumPy is required to load binary instance files (.npy/.npz).")
+        copyreg.pickle(np.memmap, _reduce_memmap)
+
+    resolved = {}
+    if "instance_file" in fields:
+        path = fields["instance_file"]
+        for key in _npz_keys(path):
+            resolved[key] = _to_field(_load_array(path, key))
+
+    for key, value in fields.items():
+        if key == "instance_file":
+            continue
+        resolved[key] = _to_field(_load_array(value["file"], value.get("key", key))) if is_file_reference(value) else value
+
+    logger.debug(f"Loaded instance fields from binary files: {list(resolved)}")
+    return resolved
+
+def _to_field(array: Any) -> Any:
+    """
+    Convert a loaded array to the value stored in the fields. 1-D arrays are copied into lists (see
+    `load_instance_fields`).
+
+    :param array: The array.
+    :return: A scalar, a list, or the (memory-mapped) array itself.
+    """
+    if array.ndim == 0:
+        return array.item()
+    if array.ndim == 1:
+        return array.tolist()
+    return array
+
+def _reduce_memmap(array: Any) -> Tuple[Any, tuple]:
+    """
+    Pickle a read-only memory-mapped array as the location of its data in its file, so unpickling maps the
+    file again instead of copying the data. Other memmaps (writable, or views of a mapping) are pickled as
+    plain arrays.
+
+    :param array: The memory-mapped array.
+    :return: The reconstruction function and its arguments.
+    """
+    if array.mode == "r" and array.filename and isinstance(array.base, mmap.mmap):
+        order = "F" if array.flags.f_contiguous and not array.flags.c_contiguous else "C"
+        return _remap, (array.filename, array.dtype.str, array.offset, array.shape, order)
+    return np.array, (np.asarray(array),)
+
+def _remap(path: str, dtype: str, offset: int, shape: Tuple[int, ...], order: str) -> Any:
+    """
+    Memory-map an array pickled by `_reduce_memmap`.
+
+    :param path: Path to the file.
+    :param dtype: The data type.
+    :param offset: Offset of the data in the file.
+    :param shape: The shape.
+    :param order: "C" or "F".
+    :return: The memory-mapped array.
+    """
+    global np
+    if np is None:
+        import numpy as np
+    return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape, order=order)
+
+def _npz_keys(path: str) -> list:
+    """
+    List the arrays stored in a .npz file.
+
+    :param path: Path to the .npz file.
+    :return: The names of the arrays.
+    """
+    with zipfile.ZipFile(path) as archive:
+        return [name[:-len(".npy")] for name in archive.namelist() if name.endswith(".npy")]
+
+def _load_array(path: str, key: str) -> Any:
+    """
+    Open an array from a .npy file, or from a member of a .npz file, memory-mapped when possible.
+
+    :param path: Path to the .npy or .npz file.
+    :param key: Name of the array inside a .npz file.
+    :return: The (memory-mapped) array.
+    """
+    if not os.path.isfile(path):
+        raise ValueError(f"Instance file not found: {path}")
+
+    if path.endswith(".npy"):
+        return np.load(path, mmap_mode="r", allow_pickle=False)
+    if path.endswith(".npz"):
+        return _memmap_npz_member(path, key)
+
+    raise ValueError(f"Unsupported instance file: {path}. Must be a .npy or .npz file.")
+
+def _memmap_npz_member(path: str, key: str) -> Any:
+    """
+    Memory-map an array stored uncompressed in a .npz file (as written by numpy.savez).
+    Compressed members (numpy.savez_compressed) cannot be mapped and are read into memory.
+
+    :param path: Path to the .npz file.
+    :param key: Name of the array.
+    :return: The array.
+    """
+    with zipfile.ZipFile(path) as archive:
+        try:
+            info = archive.getinfo(f"{key}.npy")
+        except KeyError:
+            raise ValueError(f"Array '{key}' not found in {path}.")
+
+        if info.compress_type != zipfile.ZIP_STORED:
+            logger.warning(f"Array '{key}' in {path} is compressed and cannot be memory-mapped. Loading it into memory.")
+            with np.load(path, allow_pickle=False) as data:
+                return data[key]
+
+        with archive.open(info) as member:
+            version = np.lib.format.read_magic(member)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(member)
+            elif version == (2, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(member)
+            else:
+                raise ValueError(f"Array '{key}' in {path} uses .npy format version {version[0]}.{version[1]}, which cannot be memory-mapped. Save it with version 1.0 or 2.0.")
+            header_size = member.tell()
+
+    if dtype.hasobject:
+        raise ValueError(f"Array '{key}' in {path} contains Python objects and cannot be loaded.")
+
+    # The member data starts after its local file header (30 bytes + file name + extra field)
+    with open(path, "rb") as file:
+        file.seek(info.header_offset)
+        local_header = file.read(30)
+    name_length, extra_length = struct.unpack("<HH", local_header[26:30])
+    offset = info.header_offset + 30 + name_length + extra_length + header_size
+
+    return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape, order="F" if fortran_order else "C")
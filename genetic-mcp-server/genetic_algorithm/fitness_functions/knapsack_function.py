@@ -1,20 +1,21 @@
-from typing import Dict, Optional, Any
+from typing import Dict, List, Optional, Any, Sequence
+import logging
 import random
 
-import sys
-sys.path.append("fitness_functions")  # Adjust the path to import from the parent directory
-from fitness_functions.fitness_function import FitnessFunction
-from chromosome import Chromosome
-from gene import Gene
-from population import Population
+from genetic_algorithm.fitness_functions.fitness_function import FitnessFunction
+from genetic_algorithm.chromosome import Chromosome
+from genetic_algorithm.gene import Gene
+from genetic_algorithm.population import Population
 
-from logger import logger_config
+from genetic_algorithm.logger import logger_config
 logger = logger_config(process_name="fitness_function", pretty=True)
 
 class KnapsackFitnessFunction(FitnessFunction):
     """
     A fitness function for the knapsack problem.
     """
+    OBJECTIVES = {"value": "max", "weight": "min"}
+
     def __init__(self, fields: Dict[str, Any]):
         """
         Initialize the knapsack fitness function.
@@ -22,6 +23,7 @@ class KnapsackFitnessFunction(FitnessFunction):
         :param fields: A dictionary containing 'capacity', 'weight', and 'value' lists.
         """
         super().__init__(fields)
+        fields = self.fields
         logger.debug(f"Initializing KnapsackFitnessFunction with fields: {fields}")
 
         # Validate required keys
@@ -38,6 +40,12 @@ class KnapsackFitnessFunction(FitnessFunction):
         self.value = fields["value"]
         self.max_weight = fields.get("max_weight", sum(self.capacity))  # Default max weight if not provided
 
+        # Items with a positive weight, by increasing value/weight ratio: the first ones removed by repairs
+        self.repair_order = sorted(
+            (i for i in range(len(self.weight)) if self.weight[i] > 0),
+            key=lambda i: self.value[i] / self.weight[i]
+        )
+
     def generate_gene(self, index: Optional[int] = None, value: Optional[float] = None) -> Gene:
         """
         Generate a gene for the knapsack problem.
@@ -81,29 +89,33 @@ class KnapsackFitnessFunction(FitnessFunction):
             
             total_weight = sum(genes[i].value * self.weight[i] for i in range(len(genes)))
             if total_weight <= self.max_weight:
-                logger.debug(f"Generated genes: {[gene.value for gene in genes]}, Total weight: {total_weight}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Generated genes: {[gene.value for gene in genes]}, Total weight: {total_weight}")
                 chromosome.genes = genes
                 success_flag = True
             
         return chromosome
     
-    def generate_population(self, size: int, chromosome_size: int) -> Population:
+    def generate_population(self, size: int, chromosome_size: int, seed_fraction: Optional[float] = 0.0) -> Population:
         """
         Generate a population of chromosomes for the knapsack problem.
 
         :param size: The number of chromosomes in the population.
         :param chromosome_size: The size of each chromosome.
+        :param seed_fraction (optional): Fraction of the population built greedily by value/weight
+        ratio (with randomly perturbed ratios) instead of at random. Default is 0.
         :return: A Population object containing the generated chromosomes.
         """
         logger.debug(f"Generating population of size: {size} with chromosome size: {chromosome_size}")
-        chromosomes = []
+        chromosomes = [self.generate_greedy_chromosome(chromosome_size, perturbation=0.0 if k == 0 else 0.3)
+                       for k in range(int(size * seed_fraction))] if seed_fraction else []
 
-        for _ in range(size):
+        for _ in range(size - len(chromosomes)):
             genes = [self.generate_gene(index=i) for i in range(chromosome_size)]
             chromosome = Chromosome(size=chromosome_size, genes=genes)
 
             # Validate chromosome weight against max_weight
-            total_weight = sum(gene.value * self.weight[i] for i, gene in enumerate(chromosome.genes))
+            total_weight = sum(value * weight for value, weight in zip(chromosome.values, self.weight))
             if total_weight <= self.max_weight:
                 chromosomes.append(chromosome)
             else:
@@ -114,6 +126,102 @@ class KnapsackFitnessFunction(FitnessFunction):
 
         return Population(size=size, chromosomes=chromosomes)
 
+    def generate_greedy_chromosome(self, chromosome_size: int, perturbation: Optional[float] = 0.3) -> Chromosome:
+        """
+        Generate a chromosome by taking as many units as fit of each item, in decreasing order of
+        value/weight ratio. Each ratio is multiplied by a random factor in [1 - perturbation, 1 + perturbation],
+        so repeated calls produce different good solutions.
+
+        :param chromosome_size: The size of the chromosome to generate.
+        :param perturbation (optional): Relative noise applied to the ratios. Default is 0.3.
+        :return: A Chromosome object representing the generated chromosome.
+        """
+        def ratio(i: int) -> float:
+            noise = random.uniform(1 - perturbation, 1 + perturbation)
+            return noise * (self.value[i] / self.weight[i] if self.weight[i] > 0 else float("inf"))
+
+        units = [0] * chromosome_size
+        remaining = self.max_weight
+        for i in sorted(range(chromosome_size), key=ratio, reverse=True):
+            fitting = self.capacity[i] if self.weight[i] <= 0 else int(remaining // self.weight[i])
+            units[i] = max(0, min(self.capacity[i], fitting))
+            remaining -= units[i] * self.weight[i]
+
+        logger.debug(f"Generated greedy chromosome: {units}")
+        return Chromosome(size=chromosome_size, values=units)
+
+    def repair_chromosome(self, values: Sequence[Any], chromosome_size: int) -> Chromosome:
+        """
+        Adapt the units of a previous solution to this instance: items added since then start with 0 units,
+        units are clamped to the capacity of each item, and units of the items with the lowest value/weight
+        ratio are removed until the maximum weight is respected. The "numba" backend runs it as a compiled kernel.
+
+        :param values: The units taken of each item.
+        :param chromosome_size: The size of the chromosome.
+        :return: The chromosome.
+        """
+        if self.backend == "numba":
+            repair = self._kernels.get("repair")
+            if repair is None:
+                from genetic_algorithm.kernels import KnapsackRepair
+                repair = self._kernels["repair"] = KnapsackRepair(self.capacity, self.weight, self.repair_order, self.max_weight)
+            units = repair.repair(values, chromosome_size)
+        else:
+            units = [max(0, min(int(unit), self.capacity[i])) for i, unit in enumerate(list(values)[:chromosome_size])]
+            units += [0] * (chromosome_size - len(units))
+
+            excess = sum(unit * weight for unit, weight in zip(units, self.weight)) - self.max_weight
+            for i in [i for i in self.repair_order if i < chromosome_size]:
+                if excess <= 0:
+                    break
+                removed = min(units[i], -(-excess // self.weight[i]))
+                units[i] -= int(removed)
+                excess -= removed * self.weight[i]
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Repaired chromosome {list(values)} into {units}")
+        return Chromosome(size=chromosome_size, values=units)
+
+    def objective(self, chromosome: Chromosome, name: str) -> float:
+        """
+        Get the total value or the total weight of an evaluated knapsack chromosome.
+
+        :param chromosome: The evaluated chromosome.
+        :param name: "value" or "weight".
+        :return: The objective value.
+        """
+        return chromosome.fitness if name == "value" else chromosome.weight
+
+    def constraint_violation(self, chromosome: Chromosome) -> float:
+        """
+        Measure the excess weight of a knapsack chromosome, relative to the maximum weight.
+
+        :param chromosome: The chromosome.
+        :return: 0 if the chromosome fits, the relative excess weight otherwise.
+        """
+        total_weight = sum(units * weight for units, weight in zip(chromosome.values, self.weight))
+        return self._excess(total_weight)
+
+    def calculate_violation_batch(self, chromosomes: List[Chromosome]) -> List[float]:
+        """
+        Measure the relative excess weight of evaluated chromosomes, from their cached weight.
+
+        :param chromosomes: The evaluated chromosomes.
+        :return: The violation of each chromosome.
+        """
+        return [self._excess(chromosome.weight) for chromosome in chromosomes]
+
+    def _excess(self, total_weight: float) -> float:
+        """
+        Get the weight above the maximum weight, relative to it.
+
+        :param total_weight: The total weight.
+        :return: The relative excess, or 0.
+        """
+        if total_weight <= self.max_weight:
+            return 0.0
+        return (total_weight - self.max_weight) / self.max_weight if self.max_weight > 0 else float("inf")
+
     def calculate_fitness(self, chromosome: Chromosome) -> float:
         """
         Calculate the fitness of a knapsack chromosome.
@@ -121,16 +229,14 @@ class KnapsackFitnessFunction(FitnessFunction):
         :param chromosome: The chromosome representing the knapsack solution.
         :return: The fitness value of the chromosome.
         """
-        logger.debug(f"Calculating fitness for chromosome: {[g.value for g in chromosome.genes]}")
+        values = chromosome.values
 
         # Calculate fitness
-        fitness = sum(gene.value * self.value[i] for i, gene in enumerate(chromosome.genes))  # Access gene.value
+        fitness = sum(units * value for units, value in zip(values, self.value))
         chromosome.fitness = fitness
-        logger.debug(f"Calculated fitness: {fitness} for chromosome: {[g.value for g in chromosome.genes]}")
 
         # Calculate total weight
-        total_weight = sum(gene.value * self.weight[i] for i, gene in enumerate(chromosome.genes))
+        total_weight = sum(units * weight for units, weight in zip(values, self.weight))
         chromosome.weight = total_weight
-        logger.debug(f"Calculated weight: {total_weight} for chromosome: {[g.value for g in chromosome.genes]}")
 
         return fitness
\ No newline at end of file
@@ -1,43 +1,57 @@
-from typing import Dict, Optional, Any
+from typing import Dict, List, Optional, Any, Sequence, Tuple
+from math import perm
+import heapq
+import logging
 import random
 
-import sys
-sys.path.append("fitness_functions")  # Adjust the path to import from the parent directory
-from fitness_functions.fitness_function import FitnessFunction
-from chromosome import Chromosome
-from gene import Gene
-from population import Population
+from genetic_algorithm.fitness_functions.fitness_function import FitnessFunction
+from genetic_algorithm.fitness_functions.distance_source import distance_source, insert_cheapest
+from genetic_algorithm.chromosome import Chromosome
+from genetic_algorithm.gene import Gene
+from genetic_algorithm.population import Population
 
-from logger import logger_config
+from genetic_algorithm.logger import logger_config
 logger = logger_config(process_name="fitness_function", pretty=True)
 
 class TravelingSalesmanFitnessFunction(FitnessFunction):
     """
     A fitness function for the traveling salesman problem.
     """
+    OBJECTIVES = {"distance": "min", "longest_edge": "min"}
+    PERMUTATION = True
+
+    # Nearest cities of each city whose edges are candidates of the greedy-edge tour
+    GREEDY_NEIGHBORS = 16
+
     def __init__(self, fields: Dict[str, Any]):
         """
         Initialize the Traveling Salesman fitness function.
         
-        : param fields: A dictionary containing 'cities' and 'distance_matrix'.
+        : param fields: A dictionary containing 'cities' and either 'distance_matrix', or 'coordinates' (with an
+        optional 'metric': "euclidean", "manhattan" or "haversine", and an optional 'cache_size' for the rows kept
+        in memory). With coordinates, 'cities' defaults to the indices of the coordinates.
         """
         super().__init__(fields)
-        logger.debug(f"Initializing TravelingSalesmanFitnessFunction with fields: {fields}")
+        fields = self.fields
+        logger.debug(f"Initializing TravelingSalesmanFitnessFunction with fields: {list(fields)}")
 
         # Validate required keys
-        if not all(key in fields for key in ["cities", "distance_matrix"]) or not all(isinstance(fields[key], list) for key in ["cities", "distance_matrix"]):
-            raise ValueError("Fields must contain 'cities' and 'distance_matrix' as lists.")
-        
-        # Ensure distance_matrix is a square matrix
-        if not all(len(row) == len(fields["cities"]) for row in fields["distance_matrix"]):
-            raise ValueError("Distance matrix must be a square matrix with the same number of rows and columns as the number of cities.")
-        
-        # Ensure distance_matrix has the same number of rows and columns as the number of cities
-        if len(fields["distance_matrix"]) != len(fields["cities"]):
-            raise ValueError("Distance matrix must have the same number of rows and columns as the number of cities.")
+        if "coordinates" in fields and "distance_matrix" not in fields and "cities" not in fields:
+            fields = {**fields, "cities": list(range(len(fields["coordinates"])))}
+        if "cities" not in fields or not isinstance(fields["cities"], list) or \
+            not any(key in fields for key in ["distance_matrix", "coordinates"]):
+            raise ValueError("Fields must contain 'cities' as a list and either 'distance_matrix' or 'coordinates'.")
+
+        self.distance_matrix = distance_source(fields)
+
+        # Ensure the distances have the same number of rows and columns as the number of cities
+        if len(self.distance_matrix) != len(fields["cities"]):
+            raise ValueError("Distance matrix (or coordinates) must have the same number of rows and columns as the number of cities.")
         
         self.cities = fields["cities"]
-        self.distance_matrix = fields["distance_matrix"]
+
+        # Position of every city in the distance matrix
+        self.city_index = {city: index for index, city in enumerate(self.cities)}
 
     def generate_gene(self, index: Optional[int] = None, value: Optional[int] = None) -> Gene:
         """
@@ -73,59 +87,262 @@ class TravelingSalesmanFitnessFunction(FitnessFunction):
         if not self.cities:
             raise ValueError("Cities list is empty. Cannot generate chromosome.")
 
-        aux = []
-        current_cities = self.cities[:]
-        for _ in range(chromosome_size):
-            city = random.choice(current_cities)
-            current_cities.remove(city)
-            aux.append(self.generate_gene(value=city))
-
+        # random.sample shuffles in O(n), without the O(n) list.remove for every city
         chromosome = Chromosome(
             size=chromosome_size,
-            genes=aux
+            values=random.sample(self.cities, chromosome_size)
         )
-        logger.debug(f"Generated chromosome: {[gene.value for gene in chromosome.genes]}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Generated chromosome: {list(chromosome.values)}")
 
         return chromosome
 
-    def generate_population(self, size: int, chromosome_size: int) -> Population:
+    def generate_population(self, size: int, chromosome_size: int, seed_fraction: Optional[float] = 0.0) -> Population:
         """
         Generate a population.
 
         :param size: The population size.
         :param chromosome_size: The chromosome size.
+        :param seed_fraction (optional): Fraction of the population built with the greedy-edge and
+        nearest-neighbor heuristics instead of at random. Default is 0.
         :return: A Population object containing the generated chromosomes.
         """
         logger.debug(f"Generating population with size: {size} with chromosome size: {chromosome_size}")
-        aux = []
-
-        for _ in range(size):
-            valid_flag = False
-            while not valid_flag:
-                chromosome = self.generate_chromosome(chromosome_size)
-                if chromosome in aux:
-                    logger.debug(f"Chromosome already exists in population, generating a new one.")
-                    continue
-                # Ensure the chromosome has unique cities
-                if len(set(gene.value for gene in chromosome.genes)) != len(chromosome.genes):
-                    logger.debug(f"Chromosome has duplicate cities, generating a new one.")
-                    continue
-
-                # Add the chromosome to the population if it is valid
-                valid_flag = True
-
-            aux.append(chromosome)
-            logger.debug(f"Generated chromosome: {[gene.value for gene in chromosome.genes]}")
-        
+        if not self.cities:
+            raise ValueError("Cities list is empty. Cannot generate population.")
+
+        max_size = perm(len(self.cities), chromosome_size)
+        if size > max_size:
+            raise ValueError(f"Population size must not exceed the number of possible tours ({max_size}).")
+
+        tours = []
+        if seed_fraction and chromosome_size == len(self.cities):
+            tours = self.generate_heuristic_tours(int(size * seed_fraction))
+        elif seed_fraction:
+            logger.warning("Heuristic seeding needs chromosomes visiting every city. Using random tours only.")
+        seen = set(tours)
+
+        if 2 * size > max_size:
+            # The population covers a large share of all tours: rejection sampling would keep hitting
+            # duplicates, so draw distinct permutation ranks instead and decode them.
+            # Drawing `size` ranks leaves enough of them even if all the seeded tours are among them.
+            logger.debug(f"Sampling {size} unique permutation ranks out of {max_size}.")
+            for rank in random.sample(range(max_size), size):
+                if len(tours) == size:
+                    break
+                tour = self._unrank_permutation(rank, chromosome_size)
+                if tour not in seen:
+                    seen.add(tour)
+                    tours.append(tour)
+        else:
+            # Shuffle a batch of tours and deduplicate them through a hash set
+            while len(tours) < size:
+                for tour in (tuple(random.sample(self.cities, chromosome_size)) for _ in range(size - len(tours))):
+                    if tour not in seen:
+                        seen.add(tour)
+                        tours.append(tour)
+
         population = Population(
             size=size,
-            chromosomes=aux
+            chromosomes=[Chromosome(size=chromosome_size, values=tour) for tour in tours]
         )
         logger.debug(f"Generated population with {len(population.chromosomes)} chromosomes.")
-        logger.debug(f"Population chromosomes: {[ [gene.value for gene in chromosome.genes] for chromosome in population.chromosomes]}")
 
         return population
 
+    def generate_heuristic_tours(self, count: int) -> List[Tuple[Any, ...]]:
+        """
+        Build up to `count` distinct tours with constructive heuristics: one greedy-edge tour,
+        followed by nearest-neighbor tours from random starting cities.
+
+        :param count: The number of tours to build.
+        :return: A list of tours (tuples of cities).
+        """
+        if count <= 0:
+            return []
+
+        tours = [self._greedy_edge_tour()]
+        seen = set(tours)
+        starts = random.sample(range(len(self.cities)), min(count - 1, len(self.cities)))
+        for start in starts:
+            tour = self._nearest_neighbor_tour(start)
+            if tour not in seen:
+                seen.add(tour)
+                tours.append(tour)
+
+        logger.debug(f"Seeded {len(tours)} heuristic tours.")
+        return tours[:count]
+
+    def _nearest_neighbor_tour(self, start: int) -> Tuple[Any, ...]:
+        """
+        Build a tour by always moving to the closest unvisited city.
+
+        :param start: Index of the starting city.
+        :return: A tuple of cities.
+        """
+        unvisited = set(range(len(self.cities)))
+        unvisited.remove(start)
+        order = [start]
+        while unvisited:
+            row = self.distance_matrix[order[-1]]
+            closest = min(unvisited, key=lambda city: row[city])
+            unvisited.remove(closest)
+            order.append(closest)
+
+        return tuple(self.cities[city] for city in order)
+
+    def _greedy_edge_tour(self) -> Tuple[Any, ...]:
+        """
+        Build a tour by adding the shortest edges first, as long as no city gets more than two
+        edges and no premature cycle is closed, then join the resulting paths into a tour.
+
+        Only the edges to the GREEDY_NEIGHBORS nearest cities of each city are candidates, so memory stays
+        O(n * GREEDY_NEIGHBORS) instead of O(n^2). The paths they leave are joined nearest endpoint first.
+
+        :return: A tuple of cities.
+        """
+        n = len(self.cities)
+        if n < 3:
+            return tuple(self.cities)
+
+        neighbors_count = min(self.GREEDY_NEIGHBORS, n - 1)
+        edges = set()
+        for i in range(n):
+            row = self.distance_matrix[i]
+            nearest = heapq.nsmallest(neighbors_count + 1, range(n), key=row.__getitem__)
+            edges.update((row[j], min(i, j), max(i, j)) for j in nearest if j != i)
+        edges = sorted(edges)
+        degree = [0] * n
+        neighbors = [[] for _ in range(n)]
+        component = list(range(n))
+
+        def find(city: int) -> int:
+            while component[city] != city:
+                component[city] = component[component[city]]
+                city = component[city]
+            return city
+
+        added = 0
+        for _, i, j in edges:
+            if degree[i] < 2 and degree[j] < 2 and find(i) != find(j):
+                component[find(i)] = find(j)
+                degree[i] += 1
+                degree[j] += 1
+                neighbors[i].append(j)
+                neighbors[j].append(i)
+                added += 1
+                if added == n - 1:
+                    break
+
+        # The edges form paths (a single one when every needed edge was a candidate): walk each from one end
+        paths = []
+        visited = [False] * n
+        for start in range(n):
+            if visited[start] or degree[start] == 2:
+                continue
+            path, previous, current = [], None, start
+            while current is not None:
+                visited[current] = True
+                path.append(current)
+                previous, current = current, next((city for city in neighbors[current] if city != previous), None)
+            paths.append(path)
+
+        # Join the paths, each time to the one with the closest end (reversed if needed)
+        order = paths.pop(0)
+        while paths:
+            row = self.distance_matrix[order[-1]]
+            index, reverse = min(
+                ((index, reverse) for index in range(len(paths)) for reverse in (False, True)),
+                key=lambda choice: row[paths[choice[0]][-1 if choice[1] else 0]]
+            )
+            path = paths.pop(index)
+            order.extend(reversed(path) if reverse else path)
+
+        return tuple(self.cities[city] for city in order)
+
+    def _unrank_permutation(self, rank: int, chromosome_size: int) -> Tuple[Any, ...]:
+        """
+        Decode a rank in [0, P(n, k)) into the corresponding k-permutation of the cities (Lehmer code).
+
+        :param rank: The rank of the permutation.
+        :param chromosome_size: The length of the permutation.
+        :return: A tuple of cities.
+        """
+        available: List[Any] = list(self.cities)
+        tour = []
+        for position in range(chromosome_size):
+            block = perm(len(available) - 1, chromosome_size - position - 1)
+            index, rank = divmod(rank, block)
+            tour.append(available.pop(index))
+
+        return tuple(tour)
+
+    def repair_chromosome(self, values: Sequence[Any], chromosome_size: int) -> Chromosome:
+        """
+        Adapt a previous tour to this instance: cities that no longer exist or repeat are dropped, and the
+        missing cities (e.g. added since then) are inserted where they lengthen the tour the least.
+
+        :param values: The tour (list of cities).
+        :param chromosome_size: The size of the chromosome.
+        :return: The chromosome.
+        """
+        tour = list(dict.fromkeys(self.city_index[city] for city in values if city in self.city_index))[:chromosome_size]
+        visited = set(tour)
+        missing = [city for city in range(len(self.cities)) if city not in visited]
+        if chromosome_size - len(tour) < len(missing):
+            missing = random.sample(missing, chromosome_size - len(tour))
+
+        insert_cheapest(tour, missing, self.distance_matrix)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Repaired tour {list(values)} into {[self.cities[city] for city in tour]}")
+        return Chromosome(size=chromosome_size, values=[self.cities[city] for city in tour])
+
+    def objective(self, chromosome: Chromosome, name: str) -> float:
+        """
+        Get the total distance or the longest edge of an evaluated tour.
+
+        :param chromosome: The evaluated chromosome.
+        :param name: "distance" or "longest_edge".
+        :return: The objective value.
+        """
+        if name == "distance":
+            return chromosome.distance
+
+        tour = [self.city_index[city] for city in chromosome.values]
+        return max(self.distance_matrix.distance(tour[k - 1], tour[k]) for k in range(len(tour)))
+
+    def is_valid(self, chromosome: Chromosome) -> bool:
+        """
+        Check that a tour is a permutation, i.e. that no location repeats.
+
+        :param chromosome: The chromosome.
+        :return: True if no location repeats.
+        """
+        return len(chromosome.values) == len(set(chromosome.values))
+
+    def calculate_fitness_batch(self, chromosomes: List[Chromosome]) -> List[float]:
+        """
+        Calculate the fitness of a batch of chromosomes. With the "numba" backend, the tour lengths of the whole
+        batch are computed by a compiled kernel (see `kernels.TourLengths`).
+
+        :param chromosomes: The chromosomes for which to calculate fitness.
+        :return: The fitness value of each chromosome, in the same order.
+        """
+        if self.backend == "numba":
+            tour_lengths = self._kernels.get("tour_lengths")
+            if tour_lengths is None:
+                from genetic_algorithm.kernels import TourLengths
+                tour_lengths = self._kernels["tour_lengths"] = TourLengths(self.cities, self.distance_matrix)
+
+            distances = tour_lengths.lengths(chromosomes)
+            if distances is not None:
+                for chromosome, total_distance in zip(chromosomes, distances):
+                    chromosome.distance = total_distance
+                    chromosome.fitness = 1 / total_distance if total_distance > 0 else float('inf')
+                return [chromosome.fitness for chromosome in chromosomes]
+
+        return super().calculate_fitness_batch(chromosomes)
+
     def calculate_fitness(self, chromosome: Chromosome) -> float:
         """
         Calculate the fitness of a given chromosome.
@@ -133,24 +350,20 @@ class TravelingSalesmanFitnessFunction(FitnessFunction):
         :param chromosome: The chromosome for which to calculate fitness.
         :return: The fitness value of the chromosome.
         """
-        logger.debug(f"Calculating fitness for chromosome: {chromosome}")
-        if not chromosome.genes or len(chromosome.genes) != len(self.cities):
+        values = chromosome.values
+        if not values or len(values) != len(self.cities):
             raise ValueError("Chromosome genes must match the number of cities.")
         
         total_distance = 0
-        for i in range(len(chromosome.genes)):
-            city_from = chromosome.genes[i].value
-            city_to = chromosome.genes[(i + 1) % len(chromosome.genes)].value
-            logger.debug(f"Calculating distance from {city_from} to {city_to}")
+        for i in range(len(values)):
+            city_from = values[i]
+            city_to = values[(i + 1) % len(values)]
 
             # Validate that the cities exist in the distance matrix
-            if city_from not in self.cities or city_to not in self.cities:
+            if city_from not in self.city_index or city_to not in self.city_index:
                 raise ValueError(f"City {city_from} or {city_to} not found in cities list.")
             
-            distance = self.distance_matrix[self.cities.index(city_from)][self.cities.index(city_to)]
-            total_distance += distance
-            logger.debug(f"Current total distance: {total_distance}")
-        logger.debug(f"Total distance for chromosome: {total_distance}")
+            total_distance += self.distance_matrix.distance(self.city_index[city_from], self.city_index[city_to])
 
         # The fitness is the inverse of the total distance (lower distance = higher fitness)
         fitness = 1 / total_distance if total_distance > 0 else float('inf')
@@ -159,6 +372,5 @@ class TravelingSalesmanFitnessFunction(FitnessFunction):
         chromosome.distance = total_distance 
  
         chromosome.fitness = fitness
-        logger.debug(f"Calculated fitness: {fitness} and total distance: {total_distance} for chromosome: {[gene.value for gene in chromosome.genes]}")
 
         return fitness
\ No newline at end of file
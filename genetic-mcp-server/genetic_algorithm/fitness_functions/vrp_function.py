@@ -1,49 +1,87 @@
-from typing import Dict, Optional, Any
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Sequence, Tuple
+import logging
+import random
 
-import sys
-sys.path.append("fitness_functions")
-from fitness_functions.fitness_function import FitnessFunction
-from chromosome import Chromosome
-from gene import Gene
-from population import Population
+from genetic_algorithm.fitness_functions.fitness_function import FitnessFunction
+from genetic_algorithm.fitness_functions.distance_source import DenseDistances, insert_cheapest
+from genetic_algorithm.chromosome import Chromosome
+from genetic_algorithm.gene import Gene
+from genetic_algorithm.population import Population
 
-from logger import logger_config
+from genetic_algorithm.logger import logger_config
 logger = logger_config(process_name="fitness_function", pretty=True)
 
 class VehicleRoutingFitnessFunction(FitnessFunction):
     """
-    A fitness function for the vehicle routing problem.
+    A fitness function for the capacitated vehicle routing problem.
+
+    A chromosome is a "giant tour": a permutation of all the clients (every location except the depot).
+    The giant tour is split into capacity-feasible routes, each starting and ending at the depot, by
+    a shortest-path (Bellman) split over the tour, so every chromosome decodes to its best set of routes.
     """
+    OBJECTIVES = {"distance": "min", "vehicles": "min"}
+    PERMUTATION = True
+    # Number of giant tours whose split is kept, so rejection checks and evaluations of the same tour split it once
+    SPLIT_CACHE_SIZE = 1024
+
     def __init__(self, fields: Dict[str, Any]):
         """
         Initialize the vehicle routing fitness function.
 
-        :param fields: A dictionary containing 'depot', 'client_demands', 'vehicle_capacity', 'distance_matrix' lists
+        :param fields: A dictionary containing 'depot', 'client_demands', 'vehicle_capacity' and 'distance_matrix'.
+            - depot: Index of the depot in the distance matrix.
+            - client_demands: Demand of every location (the depot's demand is ignored).
+            - vehicle_capacity: Either a number (unlimited fleet of identical vehicles) or a list with the capacity
+              of each available vehicle.
+            - distance_matrix: Square matrix with the distance between every pair of locations.
         """
         super().__init__(fields)
-        logger.debug(f"Initializing TravelingSalesmanFitnessFunction with fields: {fields}")
+        fields = self.fields
+        logger.debug(f"Initializing VehicleRoutingFitnessFunction with fields: {list(fields)}")
 
         # Validate required keys
-        required_keys = ["vehicle_capacity", "client_demands", "distance_matrix"]
-        if not all(key in fields for key in required_keys + ["depot"]) or not all(isinstance(fields[key], list) for key in required_keys):
-            raise ValueError("Fields must contain 'cities' and 'distance_matrix' as lists.")
-        
-        if not isinstance(fields["depot"], (int, list)):
-            raise ValueError("Depot must be an integer or a list representing the depot location(s).")
-        
-        # Ensure distance_matrix is a square matrix
-        if not all(len(row) == len(fields["client_demands"]) for row in fields["distance_matrix"]):
-            raise ValueError("Distance matrix must be a square matrix with the same number of rows and columns as the number of clients.")
-        
-        # Ensure distance_matrix has the same number of rows and columns as the number of cities
-        if len(fields["distance_matrix"]) != len(fields["cities"]):
-            raise ValueError("Distance matrix must have the same number of rows and columns as the number of cities.")
-        
+        required_keys = ["depot", "client_demands", "vehicle_capacity", "distance_matrix"]
+        if not all(key in fields for key in required_keys) or not isinstance(fields["client_demands"], list) or \
+            not hasattr(fields["distance_matrix"], "__len__"):
+            raise ValueError("Fields must contain 'depot', 'vehicle_capacity', and 'client_demands' and 'distance_matrix' as lists.")
+
+        depot = fields["depot"]
+        if isinstance(depot, list):
+            if len(depot) != 1:
+                raise ValueError("Only a single depot is supported.")
+            depot = depot[0]
+        if not isinstance(depot, int) or not (0 <= depot < len(fields["client_demands"])):
+            raise ValueError("Depot must be the index of a location in 'client_demands' and 'distance_matrix'.")
+
+        # Ensure distance_matrix is a square matrix with one row per location
+        distance_matrix = DenseDistances(fields["distance_matrix"])
+        if len(distance_matrix) != len(fields["client_demands"]):
+            raise ValueError("Distance matrix must be a square matrix with the same number of rows and columns as the number of locations in 'client_demands'.")
+
+        vehicle_capacity = fields["vehicle_capacity"]
+        capacities = vehicle_capacity if isinstance(vehicle_capacity, list) else [vehicle_capacity]
+        if not capacities or not all(isinstance(capacity, (int, float)) and capacity > 0 for capacity in capacities):
+            raise ValueError("Vehicle capacity must be a positive number or a non-empty list of positive numbers.")
+
+        self.depot = depot
         self.client_demands = fields["client_demands"]
-        self.vehicle_capacity = fields["vehicle_capacity"]
-        self.depot = fields["depot"]
-        self.distance_matrix = fields["distance_matrix"]
-    
+        self.vehicle_capacity = vehicle_capacity
+        self.distance_matrix = distance_matrix
+        self.clients = [location for location in range(len(self.client_demands)) if location != self.depot]
+
+        # A list of capacities limits the fleet; the biggest vehicles are used first
+        self.fleet = sorted(capacities, reverse=True) if isinstance(vehicle_capacity, list) else None
+
+        # Distances from and to the depot, used by every route
+        self.from_depot = list(self.distance_matrix.row(self.depot))
+        self.to_depot = [self.distance_matrix.distance(location, self.depot) for location in range(len(self.client_demands))]
+
+        if any(self.client_demands[client] > max(capacities) for client in self.clients):
+            raise ValueError("Every client demand must fit in a vehicle.")
+
+        self._splits: "OrderedDict[Tuple[int, ...], Tuple[float, List[List[int]]]]" = OrderedDict()
+
     def generate_gene(self, index: Optional[int] = None, value: Optional[float] = None) -> Gene:
         """
         Generate a gene for the vehicle routing problem.
@@ -52,7 +90,13 @@ class VehicleRoutingFitnessFunction(FitnessFunction):
         :param value: An optional value for the gene.
         :return: A Gene object representing the generated gene.
         """
-        pass
+        if value is not None:
+            return Gene(value)
+
+        if not self.clients:
+            raise ValueError("Clients list is empty. Cannot generate gene.")
+
+        return Gene(random.choice(self.clients))
 
     def generate_chromosome(self, chromosome_size: int) -> Chromosome:
         """
@@ -61,17 +105,283 @@ class VehicleRoutingFitnessFunction(FitnessFunction):
         :param chromosome_size: The size of the chromosome to generate.
         :return: A Chromosome object representing the generated chromosome.
         """
-        pass
+        if chromosome_size != len(self.clients):
+            raise ValueError(f"Chromosome size must be the number of clients ({len(self.clients)}).")
 
-    def generate_population(self, size: int, chromosome_size: int) -> Population:
+        return Chromosome(size=chromosome_size, values=random.sample(self.clients, chromosome_size))
+
+    def generate_population(self, size: int, chromosome_size: int, seed_fraction: Optional[float] = 0.0) -> Population:
         """
         Generate a population of chromosomes for the vehicle routing problem.
 
         :param size: The number of chromosomes in the population.
         :param chromosome_size: The size of each chromosome.
+        :param seed_fraction (optional): Fraction of the population built as nearest-neighbor giant tours
+        from random starting clients. Default is 0.
         :return: A Population object containing the generated chromosomes.
         """
-        pass
+        logger.debug(f"Generating population of size: {size} with chromosome size: {chromosome_size}")
+        if chromosome_size != len(self.clients):
+            raise ValueError(f"Chromosome size must be the number of clients ({len(self.clients)}).")
+
+        tours = []
+        seen = set()
+        if seed_fraction:
+            starts = random.sample(self.clients, min(int(size * seed_fraction), len(self.clients)))
+            for tour in (self._nearest_neighbor_tour(start) for start in starts):
+                if tour not in seen:
+                    seen.add(tour)
+                    tours.append(tour)
+
+        # Shuffle the remaining giant tours and deduplicate them through a hash set
+        attempts = 0
+        while len(tours) < size and attempts < 10:
+            attempts += 1
+            for tour in (tuple(random.sample(self.clients, chromosome_size)) for _ in range(size - len(tours))):
+                if tour not in seen:
+                    seen.add(tour)
+                    tours.append(tour)
+
+        if len(tours) < size:
+            raise ValueError(f"Could not generate {size} unique chromosomes for {chromosome_size} clients.")
+
+        logger.debug(f"Generated population with {len(tours)} chromosomes.")
+        return Population(
+            size=size,
+            chromosomes=[Chromosome(size=chromosome_size, values=tour) for tour in tours]
+        )
+
+    def _nearest_neighbor_tour(self, start: int) -> Tuple[int, ...]:
+        """
+        Build a giant tour by always moving to the closest unvisited client.
+
+        :param start: The starting client.
+        :return: A tuple of clients.
+        """
+        unvisited = set(self.clients)
+        unvisited.remove(start)
+        order = [start]
+        while unvisited:
+            row = self.distance_matrix[order[-1]]
+            closest = min(unvisited, key=lambda client: row[client])
+            unvisited.remove(closest)
+            order.append(closest)
+
+        return tuple(order)
+
+    def repair_chromosome(self, values: Sequence[Any], chromosome_size: int) -> Chromosome:
+        """
+        Adapt a previous giant tour to this instance: locations that are not clients or repeat are dropped, and
+        the missing clients (e.g. added since then) are inserted where they lengthen the tour the least.
+
+        :param values: The giant tour (list of clients).
+        :param chromosome_size: The size of the chromosome.
+        :return: The chromosome.
+        """
+        if chromosome_size != len(self.clients):
+            raise ValueError(f"Chromosome size must be the number of clients ({len(self.clients)}).")
+
+        clients = set(self.clients)
+        tour = [self.depot] + list(dict.fromkeys(location for location in values if location in clients))
+        visited = set(tour)
+        insert_cheapest(tour, [client for client in self.clients if client not in visited], self.distance_matrix)
+
+        # Rotate the closed tour so it starts after the depot
+        start = tour.index(self.depot)
+        tour = tour[start + 1:] + tour[:start]
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Repaired giant tour {list(values)} into {tour}")
+        return Chromosome(size=chromosome_size, values=tour)
+
+    def split(self, tour: List[int], relaxed: Optional[bool] = False) -> Tuple[float, List[List[int]]]:
+        """
+        Split a giant tour into capacity-feasible routes with the minimum total distance.
+
+        The split is a shortest path over the tour positions, where an arc (i, j) is the route serving
+        tour[i:j]. Routes stop growing as soon as their load exceeds the capacity, so the cost is O(n * m)
+        for n clients and at most m clients per route, or O(n * m * k) with a fleet of k vehicles.
+
+        :param tour: The giant tour (list of clients).
+        :param relaxed (optional): Ignore the size of a limited fleet, i.e. split with as many vehicles of the
+        largest capacity as needed. Default is False.
+        :return: The total distance (inf if no feasible split exists) and the list of routes.
+        """
+        fleet = None if relaxed else self.fleet
+        vehicle_capacity = self.fleet[0] if relaxed and self.fleet is not None else self.vehicle_capacity
+        n = len(tour)
+        distance_between = self.distance_matrix.distance
+        demands = self.client_demands
+        from_depot = self.from_depot
+        to_depot = self.to_depot
+        infinity = float("inf")
+
+        capacities = fleet if fleet is not None else [vehicle_capacity]
+        # Unlimited fleet: a single layer of labels reused for every route
+        layers = len(capacities) if fleet is not None else 1
+
+        cost = [[infinity] * (n + 1) for _ in range(layers + 1)]
+        predecessor = [[0] * (n + 1) for _ in range(layers + 1)]
+        cost[0][0] = 0
+
+        for vehicle in range(layers):
+            capacity = capacities[vehicle]
+            source = cost[vehicle] if fleet is not None else cost[0]
+            target = cost[vehicle + 1] if fleet is not None else cost[0]
+            target_predecessor = predecessor[vehicle + 1] if fleet is not None else predecessor[0]
+
+            for i in range(n):
+                if source[i] == infinity:
+                    continue
+
+                load = 0
+                distance = 0
+                for j in range(i, n):
+                    client = tour[j]
+                    load += demands[client]
+                    if load > capacity:
+                        break
+
+                    if j == i:
+                        distance = from_depot[client]
+                    else:
+                        distance += distance_between(tour[j - 1], client)
+
+                    total = source[i] + distance + to_depot[client]
+                    if total < target[j + 1]:
+                        target[j + 1] = total
+                        target_predecessor[j + 1] = i
+
+        if n == 0:
+            return 0, []
+
+        # Pick the best number of vehicles and rebuild the routes
+        layer = 0 if fleet is None else min(range(1, layers + 1), key=lambda k: cost[k][n])
+        best = cost[layer][n]
+        if best == infinity:
+            return infinity, []
+
+        routes = []
+        j = n
+        while j > 0:
+            i = predecessor[layer][j]
+            routes.append(list(tour[i:j]))
+            j = i
+            if fleet is not None:
+                layer -= 1
+
+        routes.reverse()
+        return best, routes
+
+    def calculate_fitness_batch(self, chromosomes: List[Chromosome]) -> List[float]:
+        """
+        Calculate the fitness of a batch of vehicle routing chromosomes.
+
+        Each chromosome gets its decoded `routes` and total `distance` attached. The fitness is the inverse of
+        the total distance. A giant tour that cannot be split with the available fleet is split without the fleet
+        limit instead, and reported through `constraint_violation`, so its fitness stays positive.
+
+        :param chromosomes: The chromosomes representing the giant tours.
+        :return: The fitness value of each chromosome.
+        """
+        fitnesses = []
+        for chromosome in chromosomes:
+            tour = chromosome.values
+            if len(tour) != len(self.clients):
+                raise ValueError("Chromosome genes must match the number of clients.")
+
+            distance, routes = self._decode(tour)
+            chromosome.distance = distance
+            chromosome.routes = routes
+            chromosome.fitness = 1 / distance if distance > 0 else float("inf")
+            fitnesses.append(chromosome.fitness)
+
+        return fitnesses
+
+    def objective(self, chromosome: Chromosome, name: str) -> float:
+        """
+        Get the total distance or the number of vehicles of an evaluated giant tour (infinite if it cannot be split
+        with the available fleet).
+
+        :param chromosome: The evaluated chromosome.
+        :param name: "distance" or "vehicles".
+        :return: The objective value.
+        """
+        if self._fleet_violation(chromosome.routes):
+            return float("inf")
+        return chromosome.distance if name == "distance" else len(chromosome.routes)
+
+    def is_valid(self, chromosome: Chromosome) -> bool:
+        """
+        Check that a giant tour is a permutation, i.e. that no location repeats.
+
+        :param chromosome: The chromosome.
+        :return: True if no location repeats.
+        """
+        return len(chromosome.values) == len(set(chromosome.values))
+
+    def constraint_violation(self, chromosome: Chromosome) -> float:
+        """
+        Measure how much a giant tour exceeds the available fleet.
+
+        :param chromosome: The chromosome.
+        :return: 0 if the tour can be split with the fleet, the relative excess load otherwise (see `_fleet_violation`).
+        """
+        if self.fleet is None:
+            return 0.0
+        return self._fleet_violation(self._decode(chromosome.values)[1])
+
+    def calculate_violation_batch(self, chromosomes: List[Chromosome]) -> List[float]:
+        """
+        Measure how much evaluated giant tours exceed the available fleet, from their cached routes.
+
+        :param chromosomes: The evaluated chromosomes.
+        :return: The violation of each chromosome.
+        """
+        return [self._fleet_violation(chromosome.routes) for chromosome in chromosomes]
+
+    def _decode(self, tour: Sequence[int]) -> Tuple[float, List[List[int]]]:
+        """
+        Split a giant tour with the fleet or, if it cannot be split with the fleet, without the fleet limit.
+        The splits of the last `SPLIT_CACHE_SIZE` tours are cached.
+
+        The tour is first split without the fleet limit, a single layer of labels instead of one per vehicle.
+        Those routes are a lower bound on the fleet split, so when they fit the fleet (see `_fleet_violation`)
+        they are its optimum; only tours whose relaxed routes exceed the fleet are split again with it.
+
+        :param tour: The giant tour.
+        :return: The total distance and the routes, which exceed the fleet if the tour cannot be split with it.
+        """
+        key = tuple(tour)
+        cached = self._splits.get(key)
+        if cached is not None:
+            self._splits.move_to_end(key)
+            return cached
+
+        distance, routes = self.split(tour, relaxed=True)
+        if self._fleet_violation(routes):
+            fleet_distance, fleet_routes = self.split(tour)
+            if fleet_distance != float("inf"):
+                distance, routes = fleet_distance, fleet_routes
+
+        self._splits[key] = (distance, routes)
+        if len(self._splits) > self.SPLIT_CACHE_SIZE:
+            self._splits.popitem(last=False)
+        return distance, routes
+
+    def _fleet_violation(self, routes: List[List[int]]) -> float:
+        """
+        Get the load of routes exceeding the fleet, relative to the total demand. The i-th route is served by
+        the i-th vehicle (largest first, as in `split`); routes beyond the fleet exceed it by their whole load.
+
+        :param routes: The routes.
+        :return: The relative excess load, or 0 for an unlimited fleet.
+        """
+        if self.fleet is None or not routes:
+            return 0.0
+
+        loads = [sum(self.client_demands[client] for client in route) for route in routes]
+        excess = sum(max(0, load - (self.fleet[k] if k < len(self.fleet) else 0)) for k, load in enumerate(loads))
+        return excess / sum(loads) if excess else 0.0
 
     def calculate_fitness(self, chromosome: Chromosome) -> float:
         """
@@ -80,4 +390,4 @@ class VehicleRoutingFitnessFunction(FitnessFunction):
         :param chromosome: The chromosome representing the vehicle routing solution.
         :return: The fitness value of the chromosome.
         """
-        pass
\ No newline at end of file
+        return self.calculate_fitness_batch([chromosome])[0]
@@ -1,9 +1,22 @@
-from typing import List, Optional
+from typing import TYPE_CHECKING, Any, List, Optional, Sequence, Tuple
+from collections import Counter
+import heapq
+import logging
+import math
 import random
 
-from fitness_functions.fitness_function import FitnessFunction
-from chromosome import Chromosome
-from logger import logger_config
+from genetic_algorithm.fitness_functions.fitness_function import FitnessFunction
+from genetic_algorithm.chromosome import Chromosome
+from genetic_algorithm.pareto import fast_non_dominated_sort, crowding_distance
+from genetic_algorithm.operators import (
+    SELECTION_OPERATORS, CROSSOVER_OPERATORS, MUTATION_OPERATORS, PERMUTATION_OPERATORS, roulette_selection, tournament_selection
+)
+from genetic_algorithm.telemetry import History, Telemetry
+from genetic_algorithm.kernels import resolve_backend, select_operator
+from genetic_algorithm.logger import logger_config
+
+if TYPE_CHECKING:
+    from genetic_algorithm.islands import Migration
 
 logger = logger_config(process_name="genetic_algorithm", pretty=True)
 
@@ -11,6 +24,21 @@ class GeneticAlgorithm:
     """
     A class to represent a genetic algorithm.
     """
+    REPLACEMENT_STRATEGIES = ("generational", "elitism", "steady_state", "mu_plus_lambda")
+    ADAPTATION_STRATEGIES = ("fixed", "diversity", "self_adaptive")
+    DIVERSITY_MEASURES = ("hamming", "edge_entropy")
+    CONSTRAINT_HANDLING = ("rejection", "static_penalty", "adaptive_penalty")
+
+    # Bounds and step used when adapting the rates
+    MIN_MUTATION_RATE, MAX_MUTATION_RATE = 0.001, 0.5
+    MIN_CROSSOVER_RATE, MAX_CROSSOVER_RATE = 0.3, 1.0
+    ADAPTATION_FACTOR = 1.2
+
+    # Bounds and steps of the adaptive penalty weight. It grows faster than it shrinks, to avoid cycling
+    MIN_PENALTY_WEIGHT, MAX_PENALTY_WEIGHT = 0.01, 1e6
+    PENALTY_INCREASE, PENALTY_DECREASE = 2.0, 1.5
+
+    COUNTERS = ("evaluations", "crossovers", "failed_crossovers", "rejected_mutations")
 
     def __init__(
             self, 
@@ -20,7 +48,23 @@ class GeneticAlgorithm:
             mutation_rate: Optional[float] = 0.05, 
             crossover_rate: Optional[float] = 0.8,
             method: Optional[str] = "roulette",
-            problem: Optional[str] = "knapsack"
+            problem: Optional[str] = "knapsack",
+            replacement: Optional[str] = "generational",
+            elite_size: Optional[int] = 1,
+            adaptation: Optional[str] = "fixed",
+            diversity_measure: Optional[str] = None,
+            diversity_bounds: Optional[Tuple[float, float]] = (0.1, 0.4),
+            seed_fraction: Optional[float] = 0.0,
+            initial_population: Optional[List[Sequence[Any]]] = None,
+            objectives: Optional[List[str]] = None,
+            constraint_handling: Optional[str] = "rejection",
+            penalty_weight: Optional[float] = 1.0,
+            crossover_operator: Optional[str] = "two_point",
+            mutation_operator: Optional[str] = "random_reset",
+            migration: Optional["Migration"] = None,
+            telemetry: Optional[Telemetry] = None,
+            history: Optional[bool] = False,
+            backend: Optional[str] = None
     ):
         """
         Initialize the genetic algorithm with a population of chromosomes.
@@ -30,41 +74,344 @@ class GeneticAlgorithm:
         :param fitness_function: An optional fitness function to guide the evolution process.
         :param mutation_rate (optional): The mutation rate for the algorithm.
         :param crossover_rate (optional): The crossover rate for the algorithm.
-        :param method (optional): Parent selection method. Can be either "roulette" or "tournament". Default is "roulette".
+        :param method (optional): Parent selection operator: "roulette", "tournament", "rank" or "sus" (stochastic
+        universal sampling), or any name registered in `operators.SELECTION_OPERATORS`. Default is "roulette".
         :param problem (optional): Type of problem to be solved. Can be either "traveling_salesman", "knapsack" or "vehicle_routing".
+        :param replacement (optional): Replacement strategy. Can be "generational", "elitism", "steady_state" or "mu_plus_lambda". Default is "generational".
+        :param elite_size (optional): Number of best chromosomes kept untouched when using "elitism". Default is 1.
+        :param adaptation (optional): How the mutation and crossover rates evolve. Can be "fixed", "diversity" (rates are
+        raised or lowered each generation according to the population diversity) or "self_adaptive" (each chromosome
+        carries its own rates, which are inherited and perturbed by its offspring). Default is "fixed".
+        :param diversity_measure (optional): Diversity measure, either "hamming" or "edge_entropy". Defaults to
+        "edge_entropy" for the traveling salesman and vehicle routing problems and "hamming" otherwise.
+        :param diversity_bounds (optional): (low, high) diversity window used by the "diversity" adaptation. Below it
+        the mutation rate is raised and the crossover rate lowered, above it the opposite. Default is (0.1, 0.4).
+        :param seed_fraction (optional): Fraction of the initial population built with the fitness function's
+        constructive heuristics (e.g. nearest-neighbor tours, greedy knapsack fillings). Default is 0.
+        :param initial_population (optional): Gene values to start from, e.g. the best chromosome of a previous run
+        or a saved population. They are repaired to fit the current instance (see `FitnessFunction.repair_chromosome`),
+        and the remaining slots are generated as usual.
+        :param objectives (optional): Names of two or more objectives of the fitness function (see
+        `FitnessFunction.OBJECTIVES`). When given, the run is multi-objective (NSGA-II): the replacement strategy
+        is replaced by non-dominated sorting with crowding distance, and the result includes the Pareto front.
+        :param constraint_handling (optional): How the soft constraints of the fitness function (see
+        `FitnessFunction.constraint_violation`) are enforced; hard constraints (`FitnessFunction.is_valid`) always
+        are. "rejection" discards infeasible offspring and mutations, "static_penalty" keeps them with their fitness
+        divided by (1 + penalty_weight * violation), and "adaptive_penalty" does the same while raising the weight
+        when the best chromosome is infeasible and lowering it when it is feasible. Default is "rejection".
+        :param penalty_weight (optional): The (initial) penalty weight. Default is 1.
+        :param crossover_operator (optional): Crossover operator: "two_point", "uniform", or for permutation problems
+        "ox" (order crossover) and "pmx" (partially mapped crossover). Default is "two_point".
+        :param mutation_operator (optional): Mutation operator: "random_reset", or for permutation problems "swap"
+        and "inversion". Default is "random_reset".
+        :param migration (optional): Makes the run an island of a distributed island model (see `islands.Migration`):
+        every `migration.interval` generations, copies of the best chromosomes are sent to the other islands and
+        the migrants received replace the worst chromosomes. Default is None (a single population).
+        :param telemetry (optional): Receives a structured record of every generation (see `telemetry.Telemetry`).
+        Default is a Telemetry logging a summary line per generation.
+        :param history (optional): Whether to keep the history of the run (see `telemetry.History`). Default is False.
+        :param backend (optional): Implementation of the hot loops (tour lengths, OX/PMX crossover, swap mutation,
+        knapsack repair): "python", "numba" (compiled kernels, see `kernels`) or "auto" ("numba" when
+        installed and the chromosomes have at least `kernels.NUMBA_MIN_SIZE` genes). Falls back to "python" when
+        Numba is not installed. Default is the GA_BACKEND environment variable, or "auto".
         """
+        if fitness_function == None:
+            raise ValueError("A fitness function must be provided.")
+
+        # Select the backend first: the fitness function already uses it to repair the initial population. The run
+        # gets its own view of the (possibly cached and shared) fitness function with that backend
+        self.backend = resolve_backend(backend, chromosome_size)
+        fitness_function = fitness_function.with_backend(self.backend)
+        if not (0 <= seed_fraction <= 1):
+            raise ValueError("Seed fraction must be between 0 and 1.")
+
         # Initialize the population with the specified size and chromosome size
-        self.population = fitness_function.generate_population(population_size, chromosome_size)
+        self.population = fitness_function.generate_population(population_size, chromosome_size, seed_fraction=seed_fraction)
+        if initial_population:
+            self.warm_start(fitness_function, initial_population, chromosome_size)
 
         # Set the fitness function, mutation rate, and crossover rate
-        if fitness_function == None:
-            raise ValueError("A fitness function must be provided.")
         if not (0 <= mutation_rate <= 1):
             raise ValueError("Mutation rate must be between 0 and 1.")
         if not (0 <= crossover_rate <= 1):
             raise ValueError("Crossover rate must be between 0 and 1.")
+        if replacement not in self.REPLACEMENT_STRATEGIES:
+            raise ValueError(f"Unknown replacement strategy: {replacement}. Must be one of {', '.join(self.REPLACEMENT_STRATEGIES)}.")
+        if elite_size is None or not (0 <= elite_size <= len(self.population.chromosomes)):
+            raise ValueError("Elite size must be between 0 and the population size.")
+        if adaptation not in self.ADAPTATION_STRATEGIES:
+            raise ValueError(f"Unknown adaptation strategy: {adaptation}. Must be one of {', '.join(self.ADAPTATION_STRATEGIES)}.")
+        if diversity_measure is None:
+            diversity_measure = "edge_entropy" if problem in ("traveling_salesman", "vehicle_routing") else "hamming"
+        if diversity_measure not in self.DIVERSITY_MEASURES:
+            raise ValueError(f"Unknown diversity measure: {diversity_measure}. Must be one of {', '.join(self.DIVERSITY_MEASURES)}.")
+        if len(diversity_bounds) != 2 or not (0 <= diversity_bounds[0] <= diversity_bounds[1] <= 1):
+            raise ValueError("Diversity bounds must be a (low, high) pair with 0 <= low <= high <= 1.")
+        method = method.lower() if method else "roulette"
+        for kind, name, registry in (
+            ("selection", method, SELECTION_OPERATORS),
+            ("crossover", crossover_operator, CROSSOVER_OPERATORS),
+            ("mutation", mutation_operator, MUTATION_OPERATORS),
+        ):
+            if name not in registry:
+                raise ValueError(f"Unknown {kind} operator: {name}. Must be one of {', '.join(registry)}.")
+            if name in PERMUTATION_OPERATORS.get(kind, ()) and not fitness_function.PERMUTATION:
+                raise ValueError(f"The {name} {kind} operator only applies to permutation problems.")
+        if constraint_handling not in self.CONSTRAINT_HANDLING:
+            raise ValueError(f"Unknown constraint handling: {constraint_handling}. Must be one of {', '.join(self.CONSTRAINT_HANDLING)}.")
+        if penalty_weight is None or penalty_weight < 0:
+            raise ValueError("Penalty weight must be a non-negative number.")
+        if objectives is not None and constraint_handling != "rejection":
+            raise ValueError("Multi-objective runs only support the \"rejection\" constraint handling.")
+        if objectives is not None and migration is not None:
+            raise ValueError("Multi-objective runs do not support migration.")
+        if objectives is not None:
+            if len(objectives) < 2:
+                raise ValueError("A multi-objective run needs at least two objectives.")
+            unknown = [name for name in objectives if name not in fitness_function.OBJECTIVES]
+            if unknown:
+                raise ValueError(f"Unknown objectives: {', '.join(unknown)}. Must be among {', '.join(fitness_function.OBJECTIVES) or 'none'}.")
         
         # Initialize the genetic algorithm parameters
         self.problem = problem
-        self.method = method.lower() if method else "roulette"
+        self.method = method
+        self.crossover_operator = crossover_operator
+        self.mutation_operator = mutation_operator
+        self._crossover = select_operator("crossover", crossover_operator, self.backend)
+        self._mutation = select_operator("mutation", mutation_operator, self.backend)
         self.fitness_function = fitness_function
         self.mutation_rate = mutation_rate
         self.crossover_rate = crossover_rate
+        self.replacement = replacement
+        self.elite_size = elite_size
+        self.adaptation = adaptation
+        self.diversity_measure = diversity_measure
+        self.diversity_bounds = tuple(diversity_bounds)
+        self.diversity = None
+        self.objectives = list(objectives) if objectives else None
+        self.constraint_handling = constraint_handling
+        self.penalty_weight = penalty_weight
+        self.migration = migration
+        self.telemetry = telemetry or Telemetry()
+        self.history = History() if history else None
+
+        # Operator counters of the current generation, reported by the telemetry
+        self.counters = dict.fromkeys(self.COUNTERS, 0)
+        # Whether per-chromosome debug lines are built at all (set by `run`)
+        self._debug = False
+
+        # Reusable crossover buffers and the keys of the population, used to reject duplicates
+        self._offspring = None
+        self._population_keys = set()
+
+        # Objective vectors of the population, kept between multi-objective generations
+        self._objective_vectors = None
+
+        # With self-adaptation, every chromosome starts with the global rates
+        if self.adaptation == "self_adaptive":
+            for chromosome in self.population.chromosomes:
+                chromosome.mutation_rate = self.mutation_rate
+                chromosome.crossover_rate = self.crossover_rate
 
         # Initialize generation count and best chromosome
         self.generation = 0
         self.best_chromosome = None
         self.best_fitness = float("-inf") # Initialize best fitness to negative infinity
 
+    def warm_start(self, fitness_function: FitnessFunction, initial_population: List[Sequence[Any]], chromosome_size: int):
+        """
+        Put caller-supplied chromosomes at the front of the population, keeping the generated chromosomes
+        that are not duplicates of them in the remaining slots.
+
+        :param fitness_function: The fitness function used to repair the supplied gene values.
+        :param initial_population: The gene values of the supplied chromosomes.
+        :param chromosome_size: The size of each chromosome.
+        """
+        size = len(self.population.chromosomes)
+        seeded = []
+        keys = set()
+        for values in initial_population[:size]:
+            chromosome = fitness_function.repair_chromosome(values, chromosome_size)
+            if chromosome.key() not in keys:
+                keys.add(chromosome.key())
+                seeded.append(chromosome)
+
+        generated = [chromosome for chromosome in self.population.chromosomes if chromosome.key() not in keys]
+        self.population.chromosomes = seeded + generated[:size - len(seeded)]
+        logger.info(f"Warm-started the population with {len(seeded)} supplied chromosomes.")
+
     def evaluate_fitness(self):
         """
         Evaluate the fitness of all chromosomes in the population.
         """
-        for chromosome in self.population.chromosomes:
-            chromosome.fitness = self.fitness_function.calculate_fitness(chromosome)
-            gene_genes = [gene.value for gene in chromosome.genes]  # Extract gene genes
-            logger.debug(f"Chromosome {gene_genes} fitness: {chromosome.fitness}")
+        self.evaluate(self.population.chromosomes)
+
+    def evaluate(self, chromosomes: List[Chromosome]):
+        """
+        Evaluate the fitness and the constraint violation of chromosomes in one batch pass.
+        With a penalty constraint handling, the fitness of infeasible chromosomes is penalized.
+
+        :param chromosomes: The chromosomes to evaluate.
+        """
+        fitnesses = self.fitness_function.calculate_fitness_batch(chromosomes)
+        violations = self.fitness_function.calculate_violation_batch(chromosomes)
+        self.counters["evaluations"] += len(chromosomes)
+        penalize = self.constraint_handling != "rejection"
+        for chromosome, fitness, violation in zip(chromosomes, fitnesses, violations):
+            chromosome.violation = violation
+            chromosome.fitness = fitness / (1 + self.penalty_weight * violation) if penalize and violation else fitness
+            if self._debug:
+                logger.debug(f"Chromosome {list(chromosome.values)} fitness: {chromosome.fitness}")
+
+    def adapt_penalty(self):
+        """
+        With the "adaptive_penalty" constraint handling, raise the penalty weight when the best chromosome
+        is infeasible (infeasible chromosomes are too attractive) and lower it when it is feasible.
+        """
+        if self.constraint_handling != "adaptive_penalty" or not self.population.chromosomes:
+            return
+
+        best = max(self.population.chromosomes, key=lambda c: c.fitness)
+        if best.violation:
+            self.penalty_weight = min(self.MAX_PENALTY_WEIGHT, max(self.penalty_weight, self.MIN_PENALTY_WEIGHT) * self.PENALTY_INCREASE)
+        else:
+            self.penalty_weight = max(self.MIN_PENALTY_WEIGHT, self.penalty_weight / self.PENALTY_DECREASE)
+        logger.debug(f"Penalty weight in generation {self.generation}: {self.penalty_weight}")
+
+    def migrate(self):
+        """
+        Send copies of the best chromosomes of the (evaluated) population to the other islands, and replace
+        the worst chromosomes with the migrants received, when they are acceptable (see `_is_acceptable`).
+        """
+        chromosomes = self.population.chromosomes
+        ranked = sorted(chromosomes, key=lambda c: (not c.violation, c.fitness), reverse=True)
+        emigrants = [list(chromosome.values) for chromosome in ranked[:self.migration.size]]
+
+        self._index_population()
+        immigrants = []
+        for values in self.migration.exchange(emigrants)[:len(chromosomes) - len(emigrants)]:
+            chromosome = self.fitness_function.repair_chromosome(values, chromosomes[0].size)
+            if self._is_acceptable(chromosome):
+                self._population_keys.add(chromosome.key())
+                immigrants.append(chromosome)
+        if not immigrants:
+            return
+
+        self.evaluate(immigrants)
+        if self.adaptation == "self_adaptive":
+            for chromosome in immigrants:
+                chromosome.mutation_rate = self.mutation_rate
+                chromosome.crossover_rate = self.crossover_rate
+        ranked[-len(immigrants):] = immigrants
+        self.population.chromosomes = ranked
+        logger.info(f"Island {self.migration.island} received {len(immigrants)} migrants in generation {self.generation}.")
+
+    def _is_acceptable(self, chromosome: Chromosome) -> bool:
+        """
+        Check whether a new or changed chromosome can enter the population: it must be valid, not a duplicate
+        and, with the "rejection" constraint handling, feasible.
+
+        :param chromosome: The chromosome.
+        :return: True if the chromosome is acceptable.
+        """
+        if not self.fitness_function.is_valid(chromosome) or self._is_duplicate(chromosome):
+            return False
+        return self.constraint_handling != "rejection" or not self.fitness_function.constraint_violation(chromosome)
     
+    def evaluate_objectives(self, chromosomes: List[Chromosome]) -> List[Tuple[float, ...]]:
+        """
+        Evaluate the objectives (and the fitness) of chromosomes, as vectors where every objective is maximized.
+
+        :param chromosomes: The chromosomes to evaluate.
+        :return: The objective vector of each chromosome, with the minimized objectives negated.
+        """
+        signs = [1 if self.fitness_function.OBJECTIVES[name] == "max" else -1 for name in self.objectives]
+        return [
+            tuple(sign * value for sign, value in zip(signs, values))
+            for values in self.fitness_function.calculate_objectives_batch(chromosomes, self.objectives)
+        ]
+
+    def nsga2_generation(self):
+        """
+        Create the next generation with NSGA-II: offspring are bred from parents chosen by crowded binary
+        tournaments, then parents and offspring are sorted into Pareto fronts, and the best fronts survive,
+        the last one truncated by crowding distance.
+        """
+        population = self.population.chromosomes
+        mu = len(population)
+        # The survivors' vectors were computed by the previous generation
+        vectors = self._objective_vectors
+        if vectors is None or len(vectors) != mu:
+            vectors = self.evaluate_objectives(population)
+        self.adapt_rates()
+        self._index_population()
+
+        rank = [0] * mu
+        crowding = [0.0] * mu
+        for level, front in enumerate(fast_non_dominated_sort(vectors)):
+            for i, distance in zip(front, crowding_distance(vectors, front)):
+                rank[i] = level
+                crowding[i] = distance
+
+        def tournament() -> Chromosome:
+            i, j = random.randrange(mu), random.randrange(mu)
+            return population[i] if (rank[i], -crowding[i]) <= (rank[j], -crowding[j]) else population[j]
+
+        offspring = []
+        while len(offspring) < mu:
+            parent1, parent2 = tournament(), tournament()
+            children = None
+            if parent1 is not parent2 and self._should_crossover(parent1, parent2):
+                children = self.crossover(parent1, parent2, chromosome_length=parent1.size)
+            for child in (children or (parent1, parent2)):
+                child = child.copy()
+                self.mutate(child)
+                offspring.append(child)
+
+        # Parents and offspring compete together; duplicated chromosomes only count once, unless
+        # there are too few distinct ones to fill the population
+        pool = []
+        keys = set()
+        for chromosome in population + offspring:
+            if chromosome.key() not in keys:
+                keys.add(chromosome.key())
+                pool.append(chromosome)
+        if len(pool) < mu:
+            pool.extend(offspring[:mu - len(pool)])
+
+        known = {id(chromosome): vector for chromosome, vector in zip(population, vectors)}
+        new = [chromosome for chromosome in pool if id(chromosome) not in known]
+        known.update(zip(map(id, new), self.evaluate_objectives(new)))
+        pool_vectors = [known[id(chromosome)] for chromosome in pool]
+
+        survivors = []
+        for front in fast_non_dominated_sort(pool_vectors):
+            if len(survivors) + len(front) <= mu:
+                survivors.extend(front)
+                continue
+
+            distances = crowding_distance(pool_vectors, front)
+            ranked = sorted(range(len(front)), key=lambda k: distances[k], reverse=True)
+            survivors.extend(front[k] for k in ranked[:mu - len(survivors)])
+            break
+
+        self.population.chromosomes = [pool[i] for i in survivors]
+        self._objective_vectors = [pool_vectors[i] for i in survivors]
+        logger.debug(f"NSGA-II kept {mu} of {len(pool)} chromosomes.")
+
+    def pareto_front(self) -> List[Tuple[Chromosome, Tuple[float, ...]]]:
+        """
+        Get the non-dominated chromosomes of the population (without duplicates).
+
+        :return: The chromosomes of the first front with their objective values, sorted by the first objective.
+        """
+        chromosomes = list({chromosome.key(): chromosome for chromosome in self.population.chromosomes}.values())
+        vectors = self.evaluate_objectives(chromosomes)
+        front = sorted(fast_non_dominated_sort(vectors)[0], key=lambda i: vectors[i], reverse=True)
+
+        signs = [1 if self.fitness_function.OBJECTIVES[name] == "max" else -1 for name in self.objectives]
+        return [(chromosomes[i], tuple(sign * value for sign, value in zip(signs, vectors[i]))) for i in front]
+
     def select_best_chromosome(self) -> Chromosome:
         """
         Select the best chromosome from the population based on fitness.
@@ -75,14 +422,14 @@ class GeneticAlgorithm:
             logger.error("Population is empty. Cannot select the best chromosome.")
             return None
 
-        self.best_chromosome = max(self.population.chromosomes, key=lambda c: c.fitness, default=None)
+        # Feasible chromosomes come first: with penalties, the population may hold infeasible ones
+        self.best_chromosome = max(self.population.chromosomes, key=lambda c: (not c.violation, c.fitness), default=None)
         if self.best_chromosome:
-            gene_genes = [gene.value for gene in self.best_chromosome.genes]  # Extract gene genes
-            logger.debug(f"Best chromosome: {gene_genes} with fitness: {self.best_chromosome.fitness}")
+            logger.debug(f"Best chromosome: {list(self.best_chromosome.values)} with fitness: {self.best_chromosome.fitness}")
             
             if self.best_chromosome.fitness > self.best_fitness:
                 self.best_fitness = self.best_chromosome.fitness
-                logger.info(f"New best fitness found: {self.best_fitness} in generation {self.generation}")
+                logger.debug(f"New best fitness found: {self.best_fitness} in generation {self.generation}")
         else:
             logger.warning("No valid chromosome found in the population.")
             return
@@ -91,21 +438,20 @@ class GeneticAlgorithm:
 
     def select_parents(self, method: Optional[str] = "roulette", parent_proportion: Optional[float] = 0.8) -> List[Chromosome]:
         """
-        Select parents for crossover based on their fitness.
+        Select parents for crossover based on their fitness, and group them into pairs.
         
-        :param method (optional): The selection method to use ('roulette', 'tournament', etc.). Default is 'roulette'.
+        :param method (optional): The selection operator to use (see `operators.SELECTION_OPERATORS`). Default is 'roulette'.
         :param parent_proportion (optional): The ratio between parents and population. Default is 0.8.
-        :return: A list of selected parent chromosomes.
-        """
-        if method == "roulette":
-            logger.info("Using roulette wheel selection for parent selection.")
-            selected = self.roulette_selection(parents=int(len(self.population.chromosomes) * parent_proportion))
-        elif method == "tournament":
-            logger.info("Using tournament selection for parent selection.")
-            selected = self.tournament_selection(parents=int(len(self.population.chromosomes) * parent_proportion))
-        else:
+        :return: A list of selected parent pairs.
+        """
+        if method not in SELECTION_OPERATORS:
             logger.error(f"Unknown selection method: {method}")
             raise ValueError(f"Unknown selection method: {method}")
+
+        parents = SELECTION_OPERATORS[method](self.population.chromosomes, int(len(self.population.chromosomes) * parent_proportion))
+        selected = [parents[i:i + 2] for i in range(0, len(parents), 2)]
+        if self._debug:
+            logger.debug(f"Selected parents ({method} selection): {[list(chromosome.values) for chromosome in parents]}")
         
         # Verifying if all pairs contain 2 elements
         if any(len(pair) != 2 for pair in selected):
@@ -115,167 +461,336 @@ class GeneticAlgorithm:
         return selected
 
         
-    def roulette_selection(self, parents: int) -> List[Chromosome]:
+    def roulette_selection(self, parents: int) -> List[List[Chromosome]]:
         """
-        Select parents using roulette wheel selection.
+        Select parents using roulette wheel selection (see `operators.roulette_selection`).
         
         :param parents: The number of parents to select.
-        :return: A list of selected parent chromosomes.
+        :return: The selected parents, grouped into pairs.
         """
-        logger.info("Starting roulette wheel selection for parent selection.")
+        selected = roulette_selection(self.population.chromosomes, parents)
+        return [selected[i:i + 2] for i in range(0, len(selected), 2)]
 
-        selected = []
-        current_pop = [chromosome for chromosome in self.population.chromosomes]
-        logger.debug(f"Current population: {[ [g.value for g in chromosome.genes] for chromosome in current_pop ]}")
-        
-        total_fitness = sum([chromosome.fitness for chromosome in self.population.chromosomes])
-        logger.debug(f"Total fitness of population: {total_fitness}")
-        current_sum = 0
-
-        while len(selected) < parents:
-            logger.debug(f"Selecting {parents} parents, currently selected: {len(selected)}")
-            random_number = random.uniform(0, total_fitness)
-            
-            for chromosome in current_pop:
-                current_sum += chromosome.fitness
-
-                if random_number < current_sum:
-                    selected.append(chromosome)
-                    current_pop.remove(chromosome) # Remove parents
-                    break # Break out of for loop
-                
-            current_sum = 0
-
-        # Group selected parents into pairs
-        selected = [selected[i:i + 2] for i in range(0, len(selected), 2)]
-        logger.debug(f"Selected parents: {[g.value for pair in selected for chromosome in pair for g in chromosome.genes]}")
-    
-        return selected
-
-    def tournament_selection(self, parents: int, tournament_size: Optional[int] = 3) -> List[Chromosome]:
+    def tournament_selection(self, parents: int, tournament_size: Optional[int] = 3) -> List[List[Chromosome]]:
         """
-        Select parents using tournament selection.
+        Select parents using tournament selection (see `operators.tournament_selection`).
         
         :param parents: The number of parents to select.
         :param tournament_size (optional): The number of chromosomes to include in each tournament.
-        :return: A list of selected parent chromosomes.
-        """
-        logger.info("Starting tournament selection for parent selection.")
-        selected = []
-        current_pop = [chromosome for chromosome in self.population.chromosomes]
-        logger.debug(f"Current population: {[g.value for chromosome in current_pop for g in chromosome.genes]}")
-
-        while len(selected) < parents:
-            logger.debug(f"Selecting {parents} parents, currently selected: {len(selected)}")
-            tournament = random.sample(current_pop, tournament_size)
-            winner = max(tournament, key=lambda c: c.fitness)
-            logger.debug(f"Tournament participants: {[g.value for chromosome in tournament for g in chromosome.genes]}, winner: {winner.genes} with fitness: {winner.fitness}")
-            
-            selected.append(winner)
-            current_pop.remove(winner)
-
-        selected = [selected[i:i + 2] for i in range(0, len(selected), 2)]
-        logger.debug(f"Selected parents: {[g.value for pair in selected for chromosome in pair for g in chromosome.genes]}")
-
-        return selected
+        :return: The selected parents, grouped into pairs.
+        """
+        selected = tournament_selection(self.population.chromosomes, parents, tournament_size=tournament_size)
+        return [selected[i:i + 2] for i in range(0, len(selected), 2)]
 
-    def crossover(self, parent1: Chromosome, parent2: Chromosome, chromosome_length: int, attempts: Optional[int] = 5) -> Chromosome:
+    def crossover(self, parent1: Chromosome, parent2: Chromosome, chromosome_length: int, attempts: Optional[int] = 5) -> Optional[Tuple[Chromosome, Chromosome]]:
         """
-        Perform crossover between two parent chromosomes to create a new child chromosome.
+        Perform crossover between two parent chromosomes to create two new offspring chromosomes.
+        The parents are left untouched; the replacement strategy decides where the offspring go.
         
         :param parent1: The first parent chromosome.
         :param parent2: The second parent chromosome.
         :param chromosome_length: The length of the chromosome.
         :param attempts (optional): The number of attempts to create valid offspring.
+        :return: A tuple with both offspring, or None if no valid offspring could be created. The offspring are
+        buffers reused by the next call: copy them to keep them.
         """
-        logger.info(f"Performing crossover between parents: {[g.value for g in parent1.genes]} and {[g.value for g in parent2.genes]}")
+        if self._debug:
+            logger.debug(f"Performing crossover between parents: {list(parent1.values)} and {list(parent2.values)}")
+        self.counters["crossovers"] += 1
         valid_flag = False
         attempts_counter = attempts
 
+        # Reuse the same two offspring buffers for every attempt and every crossover
+        if self._offspring is None or self._offspring[0].size != chromosome_length:
+            self._offspring = (
+                Chromosome(size=chromosome_length, values=parent1.values[:]),
+                Chromosome(size=chromosome_length, values=parent2.values[:]),
+            )
+        offspring1, offspring2 = self._offspring
+        offspring1.mutation_rate = offspring2.mutation_rate = None
+        offspring1.crossover_rate = offspring2.crossover_rate = None
+
         while valid_flag is False and attempts_counter > 0:
             attempts_counter -= 1
-            logger.debug(f"Attempts remaining: {attempts_counter}")
-
-            # Randomly select crossover points
-            i = random.randint(0, parent1.size - 1)
-            j = random.randint(0, parent2.size - 1)
-            logger.debug(f"Selected crossover points: {i}, {j}")
-
-            if i != j:
-                max_index = max(i, j)
-                min_index = min(i, j)
-
-                offspring1 = Chromosome(genes=parent1.genes[:], size=chromosome_length)
-                offspring1.genes[min_index:max_index] = parent2.genes[min_index:max_index][:]
-                logger.debug(f"Offspring1 genes after crossover: {[g.value for g in offspring1.genes]}")
-
-                offspring2 = Chromosome(genes=parent2.genes[:], size=chromosome_length)
-                offspring2.genes[min_index:max_index] = parent1.genes[min_index:max_index][:]
-                logger.debug(f"Offspring2 genes after crossover: {[g.value for g in offspring2.genes]}")
-            else:
-                offspring1 = Chromosome(genes=parent2.genes[:i]+parent1.genes[i:], size=chromosome_length)
-                logger.debug(f"Offspring1 genes after crossover: {[g.value for g in offspring1.genes]}")
-
-                offspring2 = Chromosome(genes=parent1.genes[:i]+parent2.genes[i:], size=chromosome_length)
-                logger.debug(f"Offspring2 genes after crossover: {[g.value for g in offspring2.genes]}")
-
-
-            # Check if the offspring are valid (i.e., their weight does not exceed the max sum)
-            # and if they are not already in the population
-            if self.problem == "knapsack":
-                if (
-                    offspring1 not in self.population.chromosomes and 
-                    offspring2 not in self.population.chromosomes and
-                    sum([offspring1.genes[k].value * self.fitness_function.weight[k] for k in range(chromosome_length)]) <= self.fitness_function.max_weight and
-                    sum([offspring2.genes[k].value * self.fitness_function.weight[k] for k in range(chromosome_length)]) <= self.fitness_function.max_weight
-                ):
-                    valid_flag = True
-            # For TSP, check if the offspring are valid (i.e., they do not contain duplicate genes)
-            elif self.problem == "traveling_salesman":
-                if (
-                    offspring1 not in self.population.chromosomes and
-                    offspring2 not in self.population.chromosomes and
-                    len([g.value for g in offspring1.genes]) == len(set(g.value for g in offspring1.genes)) and
-                    len([g.value for g in offspring2.genes]) == len(set(g.value for g in offspring2.genes))
-                ):
-                    valid_flag = True
+
+            self._crossover(parent1.values, parent2.values, offspring1.values, offspring2.values)
+            if self._debug:
+                logger.debug(f"Offspring genes after {self.crossover_operator} crossover: {list(offspring1.values)}, {list(offspring2.values)}")
+
+            # Check if the offspring are new and, when infeasible offspring are rejected, feasible
+            if self._is_acceptable(offspring1) and self._is_acceptable(offspring2):
+                valid_flag = True
         
         if valid_flag is True:
-            # Replace the parents with the offspring
-            parent1.genes = offspring1.genes
-            parent2.genes = offspring2.genes
+            if self.adaptation == "self_adaptive":
+                self._inherit_rates(offspring1, parent1, parent2)
+                self._inherit_rates(offspring2, parent1, parent2)
+            return offspring1, offspring2
+
+        # Counted in the telemetry rather than logged: it happens for most crossovers of converged populations
+        self.counters["failed_crossovers"] += 1
+        if self._debug:
+            logger.debug(f"Failed to create valid offspring after {attempts} attempts. Retaining original parents: {list(parent1.values)} and {list(parent2.values)}")
+        return None
+
+    def _inherit_rates(self, offspring: Chromosome, parent1: Chromosome, parent2: Chromosome):
+        """
+        Give an offspring the mean of its parents' rates, perturbed by a log-normal step.
+
+        :param offspring: The offspring receiving the rates.
+        :param parent1: The first parent chromosome.
+        :param parent2: The second parent chromosome.
+        """
+        tau = 1 / math.sqrt(max(offspring.size, 1))
+        mutation_rate = (self._mutation_rate(parent1) + self._mutation_rate(parent2)) / 2
+        crossover_rate = (self._crossover_rate(parent1) + self._crossover_rate(parent2)) / 2
+
+        offspring.mutation_rate = min(self.MAX_MUTATION_RATE, max(self.MIN_MUTATION_RATE, mutation_rate * math.exp(tau * random.gauss(0, 1))))
+        offspring.crossover_rate = min(self.MAX_CROSSOVER_RATE, max(self.MIN_CROSSOVER_RATE, crossover_rate * math.exp(tau * random.gauss(0, 1))))
+
+    def _mutation_rate(self, chromosome: Chromosome) -> float:
+        """
+        Get the mutation rate to apply to a chromosome (its own one when self-adaptive).
+
+        :param chromosome: The chromosome to be mutated.
+        :return: The mutation rate.
+        """
+        if self.adaptation == "self_adaptive" and chromosome.mutation_rate is not None:
+            return chromosome.mutation_rate
+        return self.mutation_rate
+
+    def _crossover_rate(self, chromosome: Chromosome) -> float:
+        """
+        Get the crossover rate of a chromosome (its own one when self-adaptive).
+
+        :param chromosome: The parent chromosome.
+        :return: The crossover rate.
+        """
+        if self.adaptation == "self_adaptive" and chromosome.crossover_rate is not None:
+            return chromosome.crossover_rate
+        return self.crossover_rate
+
+    def _should_crossover(self, parent1: Chromosome, parent2: Chromosome) -> bool:
+        """
+        Decide whether a pair of parents undergoes crossover.
+
+        :param parent1: The first parent chromosome.
+        :param parent2: The second parent chromosome.
+        :return: True if crossover should be performed.
+        """
+        return random.random() < (self._crossover_rate(parent1) + self._crossover_rate(parent2)) / 2
+
+    def measure_diversity(self) -> float:
+        """
+        Measure the diversity of the population, normalized between 0 (all chromosomes equal) and 1.
+
+        "hamming" is the mean fraction of chromosomes differing from the most common value at each locus.
+        "edge_entropy" is the entropy of the (undirected) edges used by the tours, divided by its maximum.
+
+        :return: The diversity of the population.
+        """
+        chromosomes = self.population.chromosomes
+        if len(chromosomes) < 2:
+            return 0.0
+
+        if self.diversity_measure == "edge_entropy":
+            edges = Counter()
+            for chromosome in chromosomes:
+                values = chromosome.values
+                for k in range(len(values)):
+                    edges[frozenset((values[k], values[(k + 1) % len(values)]))] += 1
+
+            total = sum(edges.values())
+            entropy = -sum((count / total) * math.log(count / total) for count in edges.values())
+            # Every chromosome has L edges; the entropy is maximal when all of them are different
+            size = len(chromosomes[0].values)
+            max_entropy = math.log(min(total, size * (size - 1) / 2)) if total > 1 else 0
+            return entropy / max_entropy if max_entropy > 0 else 0.0
+
+        size = len(chromosomes[0].values)
+        differing = 0
+        for locus in range(size):
+            counts = Counter(chromosome.values[locus] for chromosome in chromosomes)
+            differing += len(chromosomes) - counts.most_common(1)[0][1]
+
+        return differing / (size * (len(chromosomes) - 1))
+
+    def adapt_rates(self):
+        """
+        Measure the population diversity and, with the "diversity" adaptation, raise the mutation rate
+        (and lower the crossover rate) when it falls below the diversity bounds, or do the opposite
+        when it rises above them.
+        """
+        self.diversity = self.measure_diversity()
+        logger.debug(f"Population diversity ({self.diversity_measure}) in generation {self.generation}: {self.diversity}")
+
+        if self.adaptation != "diversity":
+            return
+
+        low, high = self.diversity_bounds
+        if self.diversity < low:
+            self.mutation_rate = min(self.MAX_MUTATION_RATE, self.mutation_rate * self.ADAPTATION_FACTOR)
+            self.crossover_rate = max(self.MIN_CROSSOVER_RATE, self.crossover_rate / self.ADAPTATION_FACTOR)
+        elif self.diversity > high:
+            self.mutation_rate = max(self.MIN_MUTATION_RATE, self.mutation_rate / self.ADAPTATION_FACTOR)
+            self.crossover_rate = min(self.MAX_CROSSOVER_RATE, self.crossover_rate * self.ADAPTATION_FACTOR)
         else:
-            logger.warning(f"Failed to create valid offspring after {attempts} attempts. Retaining original parents: {[g.value for g in parent1.genes]} and {[g.value for g in parent2.genes]}")
+            return
+
+        logger.debug(f"Adapted rates in generation {self.generation}: mutation rate {self.mutation_rate}, crossover rate {self.crossover_rate}")
 
     def mutate(self, chromosome: Chromosome):
         """
-        Mutate a chromosome by randomly changing one of its genes.
+        Mutate a chromosome in place with the mutation operator. Moves producing an unacceptable chromosome
+        (see `_is_acceptable`) are undone.
         
         :param chromosome: The chromosome to mutate.
         """
-        logger.info(f"Mutating chromosome: {[g.value for g in chromosome.genes]} in generation {self.generation}")
-        for index, gene in enumerate(chromosome.genes):
-            if random.random() <= self.mutation_rate:
-                # Replace the gene with a new random gene
-                original_value = gene.value
-                logger.debug(f"Mutating gene at index {index} with original value {original_value}")
-
-                new_gene = self.fitness_function.generate_gene(index=index)
-                logger.debug(f"New gene generated with value {new_gene.value}")
-
-                if new_gene != gene:
-                    gene.value = new_gene.value
-
-                    if self.problem == "knapsack":
-                        if any(chromosome.genes == pop_chromosome.genes for pop_chromosome in self.population.chromosomes) or \
-                        sum([chromosome.genes[k].value * self.fitness_function.weight[k] for k in range(chromosome.length)]) > self.fitness_function.max_weight:
-                            logger.warning(f"Mutation resulted in an invalid chromosome: {[g.value for g in chromosome.genes]}. Reverting to original value.")
-                            gene.value = original_value
-                    elif self.problem == "traveling_salesman":
-                        if any(chromosome.genes == pop_chromosome.genes for pop_chromosome in self.population.chromosomes) or \
-                            len([g.value for g in chromosome.genes]) != len(set([g.value for g in chromosome.genes])): 
-                                logger.warning(f"Mutation resulted in an invalid chromosome: {[g.value for g in chromosome.genes]}. Reverting to original value.")
-                                gene.value = original_value
+        if self._debug:
+            logger.debug(f"Mutating chromosome: {list(chromosome.values)} in generation {self.generation}")
+
+        def new_gene(index: int) -> Any:
+            return self.fitness_function.generate_gene(index=index).value
+
+        def accept() -> bool:
+            if self._is_acceptable(chromosome):
+                return True
+            self.counters["rejected_mutations"] += 1
+            if self._debug:
+                logger.debug(f"Mutation resulted in an invalid chromosome: {list(chromosome.values)}. Reverting the move.")
+            return False
+
+        self._mutation(chromosome.values, self._mutation_rate(chromosome), new_gene, accept)
+
+    def _is_duplicate(self, chromosome: Chromosome) -> bool:
+        """
+        Check whether the population already has a chromosome with the same gene values.
+        The check is a hash lookup against the keys indexed by `_index_population`.
+
+        :param chromosome: The chromosome to check.
+        :return: True if a chromosome with identical genes was in the population.
+        """
+        return chromosome.key() in self._population_keys
+
+    def _index_population(self):
+        """
+        Index the keys of the current population, used to reject duplicated chromosomes.
+        """
+        self._population_keys = {chromosome.key() for chromosome in self.population.chromosomes}
+
+    def select_elites(self) -> List[Chromosome]:
+        """
+        Select copies of the best chromosomes of the (already evaluated) population.
+
+        :return: A list with copies of the `elite_size` best chromosomes.
+        """
+        ranked = sorted(self.population.chromosomes, key=lambda c: c.fitness, reverse=True)
+        elites = [chromosome.copy() for chromosome in ranked[:self.elite_size]]
+        logger.debug(f"Selected elites: {[list(chromosome.values) for chromosome in elites]}")
+
+        return elites
+
+    def generational_replacement(self, parents: List[List[Chromosome]]):
+        """
+        Replace each pair of parents by its offspring and mutate the whole population.
+        With the "elitism" strategy, the best chromosomes of the previous generation
+        take the place of the worst ones of the new generation.
+
+        :param parents: The pairs of parents selected for crossover.
+        """
+        elites = self.select_elites() if self.replacement == "elitism" else []
+        keys = [chromosome.key() for chromosome in self.population.chromosomes] if elites else None
+
+        # Perform crossover; the offspring take the place of their parents
+        crossed = set()
+        for parent1, parent2 in parents:
+            if self._should_crossover(parent1, parent2):
+                offspring = self.crossover(parent1, parent2, chromosome_length=parent1.size)
+                if offspring:
+                    parent1.assign(offspring[0])
+                    parent2.assign(offspring[1])
+                    crossed.update((id(parent1), id(parent2)))
+
+        # Mutate the chromosomes in the population
+        for chromosome in self.population.chromosomes:
+            self.mutate(chromosome)
+
+        if elites:
+            # Only evaluate the new children, i.e. the chromosomes changed by crossover or mutation. The others keep
+            # their fitness, except infeasible ones under the adaptive penalty, whose weight changed since
+            self.evaluate([
+                chromosome for chromosome, key in zip(self.population.chromosomes, keys)
+                if id(chromosome) in crossed or chromosome.key() != key
+                or (self.constraint_handling == "adaptive_penalty" and chromosome.violation)
+            ])
+            self.population.chromosomes.sort(key=lambda c: c.fitness)
+            self.population.chromosomes[:len(elites)] = elites
+            logger.debug(f"Restored {len(elites)} elites into the population.")
+
+    def steady_state_replacement(self, parents: List[List[Chromosome]]):
+        """
+        Insert each (mutated) offspring in place of the worst chromosome of the population,
+        as long as the offspring is better and not a duplicate. The rest of the population is untouched.
+        The worst chromosome is found through a min-heap of (fitness, index), updated on each replacement.
+
+        :param parents: The pairs of parents selected for crossover.
+        """
+        # Ties go to the lowest index, as with a linear scan
+        worst = [(chromosome.fitness, index) for index, chromosome in enumerate(self.population.chromosomes)]
+        heapq.heapify(worst)
+
+        for parent1, parent2 in parents:
+            if not self._should_crossover(parent1, parent2):
+                continue
+
+            offspring = self.crossover(parent1, parent2, chromosome_length=parent1.size)
+            if not offspring:
+                continue
+
+            for child in offspring:
+                self.mutate(child)
+                self.evaluate([child])
+
+                worst_fitness, worst_index = worst[0]
+                if child.fitness > worst_fitness and not self._is_duplicate(child):
+                    if self._debug:
+                        logger.debug(f"Replacing worst chromosome {list(self.population.chromosomes[worst_index].values)} with offspring {list(child.values)}")
+                    self.population.chromosomes[worst_index] = child.copy()
+                    self._population_keys.add(child.key())
+                    heapq.heapreplace(worst, (child.fitness, worst_index))
+
+    def mu_plus_lambda_replacement(self, parents: List[List[Chromosome]]):
+        """
+        (mu + lambda) replacement: the parents (mu) and their mutated offspring (lambda) compete
+        together, and the best `population size` chromosomes survive.
+
+        :param parents: The pairs of parents selected for crossover.
+        """
+        offspring = []
+        for parent1, parent2 in parents:
+            if self._should_crossover(parent1, parent2):
+                children = self.crossover(parent1, parent2, chromosome_length=parent1.size)
+                if children:
+                    offspring.extend(child.copy() for child in children)
+
+        for child in offspring:
+            self.mutate(child)
+        self.evaluate(offspring)
+
+        mu = len(self.population.chromosomes)
+        pool = sorted(self.population.chromosomes + offspring, key=lambda c: c.fitness, reverse=True)
+        self.population.chromosomes = pool[:mu]
+        logger.debug(f"(mu + lambda) replacement kept {mu} of {len(pool)} chromosomes.")
+
+    def _record_generation(self):
+        """
+        Send the record of the current (evaluated) generation to the telemetry and the history, and reset the
+        operator counters.
+        """
+        record = self.telemetry.record(self)
+        if self.history is not None:
+            self.history.append(record)
+        self.counters = dict.fromkeys(self.COUNTERS, 0)
 
     def run(self, generations: int):
         """
@@ -286,44 +801,59 @@ class GeneticAlgorithm:
         'best_fitness' and 'generation').
         """
         logger.info(f"Starting genetic algorithm for {generations} generations with method: {self.method}")
-        for _ in range(generations):
-            self.generation += 1
-            logger.info(f"Generation {self.generation} started.")
-            
-            # Evaluate the fitness of the population
-            self.evaluate_fitness()
-            logger.debug(f"Population fitness after evaluation: {[chromosome.fitness for chromosome in self.population.chromosomes]}")
-
-            # Select parents for crossover
-            parents = self.select_parents(method=self.method)
-            logger.info(f"Selected parents for crossover: {[g.value for pair in parents for chromosome in pair for g in chromosome.genes]}")
-
-            # Perform crossover to create new chromosomes
-            for parent1, parent2 in parents:
-                if random.random() < self.crossover_rate:
-                    logger.info(f"Performing crossover between parents: {[g.value for g in parent1.genes]} and {[g.value for g in parent2.genes]}")
-                    self.crossover(parent1, parent2, chromosome_length=parent1.size)
-
-            # Mutate the chromosomes in the population
-            for chromosome in self.population.chromosomes:
-                self.mutate(chromosome)
-
-            # Select the best chromosome
-            best_chromosome = self.select_best_chromosome()
-            if best_chromosome:
-                logger.info(f"Best chromosome in generation {self.generation}: {[g.value for g in best_chromosome.genes]} with fitness: {best_chromosome.fitness}")
-            else:
-                logger.warning(f"No valid chromosome found in generation {self.generation}. Continuing to next generation.")
-                continue
-
+        self._debug = logger.isEnabledFor(logging.DEBUG)
+        try:
+            for _ in range(generations):
+                self.generation += 1
+
+                if self.objectives:
+                    self.nsga2_generation()
+                    self._record_generation()
+                    continue
+
+                # Evaluate the fitness of the population
+                self.evaluate_fitness()
+                if self.migration is not None and self.generation % self.migration.interval == 0:
+                    self.migrate()
+                self.adapt_penalty()
+                self.adapt_rates()
+                self._index_population()
+                self._record_generation()
+
+                # Select parents for crossover
+                parents = self.select_parents(method=self.method)
+
+                # Create the next generation according to the replacement strategy
+                if self.replacement in ("generational", "elitism"):
+                    self.generational_replacement(parents)
+                elif self.replacement == "steady_state":
+                    self.steady_state_replacement(parents)
+                elif self.replacement == "mu_plus_lambda":
+                    self.mu_plus_lambda_replacement(parents)
+
+                # Select the best chromosome
+                if not self.select_best_chromosome():
+                    logger.warning(f"No valid chromosome found in generation {self.generation}. Continuing to next generation.")
+        finally:
+            self.telemetry.close()
+
+        # Re-evaluate so the fitness and metrics of the returned chromosome match its final genes
+        self.evaluate_fitness()
         best = self.select_best_chromosome()
         if not best:
             logger.error("No valid solution found after running the genetic algorithm.")
             return None
         else:
-            logger.info(f"Best solution found: {[g.value for g in best.genes]} with fitness: {best.fitness} after {self.generation} generations.")
-            return {
+            logger.info(f"Best solution found: {list(best.values)} with fitness: {best.fitness} after {self.generation} generations.")
+            result = {
                 "best_chromosome": best,
                 "best_fitness": best.fitness,
                 "generation": self.generation
-            }
\ No newline at end of file
+            }
+            if self.objectives:
+                result["objectives"] = self.objectives
+                result["pareto_front"] = [
+                    {"chromosome": list(chromosome.values), "objectives": dict(zip(self.objectives, values))}
+                    for chromosome, values in self.pareto_front()
+                ]
+            return result
\ No newline at end of file
@@ -4,6 +4,8 @@ class Gene:
     """
     A class to represent a gene in a genetic algorithm.
     """
+    __slots__ = ("value",)
+
     def __init__(self, value: Optional[int] = None):
         """
         Initialize a gene with a given value.
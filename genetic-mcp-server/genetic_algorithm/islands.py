@@ -0,0 +1,410 @@
+"""
+Island model across processes and hosts.
+
+Every island is a `GeneticAlgorithm` run (e.g. `python -m genetic_algorithm.main` on a different host) with a
+"migration" option pointing at a shared broker. Every `interval` generations, an island sends copies of its
+best chromosomes to the broker and collects the migrants waiting for it, without ever waiting for another
+island: the broker keeps a small mailbox per island, and islands join a ring (per group) in arrival order.
+
+Run a broker with:
+    python -m genetic_algorithm.islands --port 5555
+
+The broker listens on 127.0.0.1 by default. The protocol is not authenticated: only listen on another address
+(e.g. --host 0.0.0.0 for islands on other hosts) inside a trusted network.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from array import array
+from collections import deque
+import argparse
+import json
+import os
+import socket
+import socketserver
+import struct
+import sys
+import threading
+
+from genetic_algorithm.logger import logger_config
+
+logger = logger_config(process_name="islands", pretty=True)
+
+# Migrant batches: magic, encoding, number of chromosomes, chromosome size, then the genes
+MIGRANTS_HEADER = struct.Struct("<4sBII")
+MIGRANTS_MAGIC = b"GAM1"
+INT32_ENCODING, JSON_ENCODING = 0, 1
+
+# Broker messages: operation and payload length, then the payload
+FRAME_HEADER = struct.Struct("<BI")
+HELLO, PUT, GET = 1, 2, 3
+
+# Migrant batches kept per island; older ones are dropped when an island does not collect them
+MAILBOX_SIZE = 8
+
+# Largest payload accepted in a broker message; larger ones close the connection before they are read
+MAX_FRAME_SIZE = int(os.getenv("MIGRATION_MAX_FRAME_SIZE", 16 * 1024 * 1024))
+
+def encode_migrants(chromosomes: Sequence[Sequence[Any]]) -> bytes:
+    """
+    Serialize the gene values of chromosomes. Integer genes are packed as little-endian 32-bit integers;
+    other genes (e.g. city names) fall back to JSON.
+
+    :param chromosomes: The gene values of the chromosomes, all of the same size.
+    :return: The migrant batch.
+    """
+    size = len(chromosomes[0]) if chromosomes else 0
+    genes = array("i")
+    try:
+        for values in chromosomes:
+            genes.extend(values)
+        encoding = INT32_ENCODING
+    except (TypeError, OverflowError):
+        encoding = JSON_ENCODING
+
+    if encoding == INT32_ENCODING:
+        if sys.byteorder != "little":
+            genes.byteswap()
+        body = genes.tobytes()
+    else:
+        body = json.dumps([list(values) for values in chromosomes], separators=(",", ":")).encode()
+
+    return MIGRANTS_HEADER.pack(MIGRANTS_MAGIC, encoding, len(chromosomes), size) + body
+
+def decode_migrants(data: bytes) -> List[List[Any]]:
+    """
+    Deserialize a migrant batch built by `encode_migrants`.
+
+    :param data: The migrant batch.
+    :return: The gene values of the chromosomes.
+    """
+    magic, encoding, count, size = MIGRANTS_HEADER.unpack_from(data)
+    if magic != MIGRANTS_MAGIC:
+        raise ValueError("Invalid migrant batch.")
+
+    body = data[MIGRANTS_HEADER.size:]
+    if encoding == JSON_ENCODING:
+        return json.loads(body.decode())
+
+    genes = array("i")
+    genes.frombytes(body)
+    if sys.byteorder != "little":
+        genes.byteswap()
+    if len(genes) != count * size:
+        raise ValueError("Truncated migrant batch.")
+    return [genes[k * size:(k + 1) * size].tolist() for k in range(count)]
+
+def _receive_exactly(sock: socket.socket, length: int) -> Optional[bytes]:
+    """
+    Read `length` bytes from a socket.
+
+    :param sock: The socket.
+    :param length: The number of bytes.
+    :return: The bytes, or None if the connection was closed.
+    """
+    chunks = []
+    while length:
+        chunk = sock.recv(length)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        length -= len(chunk)
+    return b"".join(chunks)
+
+def _send_frame(sock: socket.socket, operation: int, payload: bytes = b""):
+    """
+    Send a broker message.
+
+    :param sock: The socket.
+    :param operation: The operation (HELLO, PUT or GET).
+    :param payload (optional): The payload.
+    """
+    sock.sendall(FRAME_HEADER.pack(operation, len(payload)) + payload)
+
+def _receive_frame(sock: socket.socket, max_size: Optional[int] = MAX_FRAME_SIZE) -> Optional[Tuple[int, bytes]]:
+    """
+    Receive a broker message.
+
+    :param sock: The socket.
+    :param max_size (optional): The largest payload accepted, in bytes. Default is MAX_FRAME_SIZE.
+    :return: The operation and the payload, or None if the connection was closed.
+    """
+    header = _receive_exactly(sock, FRAME_HEADER.size)
+    if header is None:
+        return None
+    operation, length = FRAME_HEADER.unpack(header)
+    if length > max_size:
+        raise ConnectionError(f"Broker message of {length} bytes exceeds the maximum of {max_size} bytes.")
+    payload = _receive_exactly(sock, length) if length else b""
+    return None if payload is None else (operation, payload)
+
+class MigrationBroker(socketserver.ThreadingTCPServer):
+    """
+    A TCP hub relaying migrant batches between islands.
+
+    Islands of a group form a ring in arrival order: a batch sent by an island goes to the mailbox of the next
+    island. Mailboxes are bounded, so an island that falls behind only misses old migrants.
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(
+            self,
+            host: Optional[str] = "127.0.0.1",
+            port: Optional[int] = 0,
+            mailbox_size: Optional[int] = MAILBOX_SIZE,
+            max_frame_size: Optional[int] = MAX_FRAME_SIZE
+    ):
+        """
+        Initialize the broker (call `start` or `serve_forever` to serve).
+
+        :param host (optional): The address to listen on. Default is "127.0.0.1".
+        :param port (optional): The port to listen on; 0 picks a free port. Default is 0.
+        :param mailbox_size (optional): Migrant batches kept per island. Default is 8.
+        :param max_frame_size (optional): Largest message accepted from an island, and sent back to it, in bytes.
+        Default is the MIGRATION_MAX_FRAME_SIZE environment variable, or 16 MB.
+        """
+        if max_frame_size is None or max_frame_size <= 0:
+            raise ValueError("Max frame size must be a positive integer.")
+
+        super().__init__((host, port), _BrokerHandler)
+        self.mailbox_size = mailbox_size
+        self.max_frame_size = max_frame_size
+        self.lock = threading.Lock()
+        self.groups: Dict[str, List[int]] = {}
+        self.mailboxes: Dict[int, deque] = {}
+        self.next_island = 0
+
+    @property
+    def address(self) -> str:
+        """
+        The "host:port" address the broker listens on.
+        """
+        host, port = self.server_address[:2]
+        return f"{host}:{port}"
+
+    def start(self) -> "MigrationBroker":
+        """
+        Serve in a background thread, e.g. to run islands locally.
+
+        :return: The broker.
+        """
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        logger.info(f"Migration broker listening on {self.address}.")
+        return self
+
+    def join(self, group: str) -> int:
+        """
+        Add a new island at the end of the ring of a group.
+
+        :param group: The group.
+        :return: The island ID.
+        """
+        with self.lock:
+            island = self.next_island
+            self.next_island += 1
+            self.groups.setdefault(group, []).append(island)
+            self.mailboxes[island] = deque(maxlen=self.mailbox_size)
+        logger.info(f"Island {island} joined group {group}.")
+        return island
+
+    def leave(self, group: str, island: int):
+        """
+        Remove an island from the ring of its group, with its mailbox.
+
+        :param group: The group.
+        :param island: The island ID.
+        """
+        with self.lock:
+            self.groups.get(group, []).remove(island)
+            self.mailboxes.pop(island, None)
+        logger.info(f"Island {island} left group {group}.")
+
+    def put(self, group: str, island: int, payload: bytes):
+        """
+        Deliver a migrant batch to the mailbox of the next island of the ring.
+
+        :param group: The group of the sender.
+        :param island: The sender's island ID.
+        :param payload: The migrant batch.
+        """
+        with self.lock:
+            ring = self.groups.get(group, [])
+            if len(ring) > 1:
+                target = ring[(ring.index(island) + 1) % len(ring)]
+                self.mailboxes[target].append(payload)
+
+    def get(self, island: int) -> List[bytes]:
+        """
+        Take the migrant batches waiting in the mailbox of an island, as many as fit in one message; the
+        others wait for the next call.
+
+        :param island: The island ID.
+        :return: The migrant batches, oldest first.
+        """
+        payloads = []
+        size = 0
+        with self.lock:
+            mailbox = self.mailboxes.get(island)
+            while mailbox:
+                # Every batch is sent with its 4-byte length
+                if size + 4 + len(mailbox[0]) > self.max_frame_size:
+                    if not payloads:
+                        logger.warning(f"Dropped a migrant batch of {len(mailbox.popleft())} bytes for island {island}: too large to send.")
+                        continue
+                    break
+                payload = mailbox.popleft()
+                payloads.append(payload)
+                size += 4 + len(payload)
+        return payloads
+
+class _BrokerHandler(socketserver.BaseRequestHandler):
+    """
+    Serve one island connection: HELLO (group) -> island ID, PUT (migrants) -> nothing, GET -> waiting migrants.
+    """
+    def handle(self):
+        broker: MigrationBroker = self.server
+        group, island = None, None
+        try:
+            while True:
+                frame = _receive_frame(self.request, broker.max_frame_size)
+                if frame is None:
+                    break
+                operation, payload = frame
+                if operation == HELLO:
+                    group = payload.decode()
+                    island = broker.join(group)
+                    _send_frame(self.request, HELLO, struct.pack("<I", island))
+                elif island is None:
+                    break
+                elif operation == PUT:
+                    broker.put(group, island, payload)
+                elif operation == GET:
+                    payloads = broker.get(island)
+                    _send_frame(self.request, GET, b"".join(struct.pack("<I", len(p)) + p for p in payloads))
+        except OSError as error:
+            logger.warning(f"Island {island} connection failed: {error}")
+        finally:
+            if island is not None:
+                broker.leave(group, island)
+
+class Migration:
+    """
+    The migration settings of an island and its connection to the broker.
+
+    Network errors never stop the run: the island keeps evolving on its own and reconnects (as a new island)
+    at the next migration.
+    """
+    def __init__(
+            self,
+            broker: str,
+            group: Optional[str] = "default",
+            interval: Optional[int] = 10,
+            size: Optional[int] = 5,
+            timeout: Optional[float] = 2.0,
+            max_frame_size: Optional[int] = MAX_FRAME_SIZE
+    ):
+        """
+        Initialize the migration of an island.
+
+        :param broker: The "host:port" address of the broker.
+        :param group (optional): The group of islands exchanging migrants. Default is "default".
+        :param interval (optional): Number of generations between migrations. Default is 10.
+        :param size (optional): Number of chromosomes sent at each migration. Default is 5.
+        :param timeout (optional): Network timeout, in seconds. Default is 2.
+        :param max_frame_size (optional): Largest message accepted from the broker, in bytes. Default is the
+        MIGRATION_MAX_FRAME_SIZE environment variable, or 16 MB.
+        """
+        host, _, port = broker.rpartition(":")
+        if not host or not port.isdigit():
+            raise ValueError(f"Invalid broker address: {broker}. Must be \"host:port\".")
+        if interval is None or interval <= 0 or size is None or size <= 0:
+            raise ValueError("Migration interval and size must be positive integers.")
+        if max_frame_size is None or max_frame_size <= 0:
+            raise ValueError("Max frame size must be a positive integer.")
+
+        self.address = (host, int(port))
+        self.group = group
+        self.interval = int(interval)
+        self.size = int(size)
+        self.timeout = timeout
+        self.max_frame_size = int(max_frame_size)
+        self.island = None
+        self.sent = 0
+        self.received = 0
+        self._socket = None
+
+    def _connect(self) -> socket.socket:
+        """
+        Connect to the broker and join the group, unless already connected.
+
+        :return: The connected socket.
+        """
+        if self._socket is None:
+            self._socket = socket.create_connection(self.address, timeout=self.timeout)
+            _send_frame(self._socket, HELLO, self.group.encode())
+            frame = _receive_frame(self._socket, self.max_frame_size)
+            if frame is None or frame[0] != HELLO:
+                raise ConnectionError("The broker closed the connection.")
+            self.island = struct.unpack("<I", frame[1])[0]
+            logger.info(f"Joined migration group {self.group} as island {self.island}.")
+        return self._socket
+
+    def exchange(self, emigrants: Sequence[Sequence[Any]]) -> List[List[Any]]:
+        """
+        Send copies of chromosomes to the next island, and collect the migrants sent to this one.
+
+        :param emigrants: The gene values of the chromosomes to send.
+        :return: The gene values of the received migrants (possibly none).
+        """
+        try:
+            sock = self._connect()
+            if emigrants:
+                _send_frame(sock, PUT, encode_migrants(emigrants))
+                self.sent += len(emigrants)
+            _send_frame(sock, GET)
+            frame = _receive_frame(sock, self.max_frame_size)
+            if frame is None:
+                raise ConnectionError("The broker closed the connection.")
+        except OSError as error:
+            logger.warning(f"Migration failed, continuing without it: {error}")
+            self.close()
+            return []
+
+        immigrants = []
+        payload, offset = frame[1], 0
+        while offset < len(payload):
+            (length,) = struct.unpack_from("<I", payload, offset)
+            offset += 4
+            immigrants.extend(decode_migrants(payload[offset:offset + length]))
+            offset += length
+        self.received += len(immigrants)
+        return immigrants
+
+    def close(self):
+        """
+        Leave the group. A later exchange joins it again.
+        """
+        if self._socket is not None:
+            try:
+                self._socket.close()
+            finally:
+                self._socket = None
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Get the migration statistics of the island, reported with its result.
+
+        :return: The group, the island ID and the number of chromosomes sent and received.
+        """
+        return {"group": self.group, "island": self.island, "sent": self.sent, "received": self.received}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a migration broker for genetic algorithm islands.")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on (0.0.0.0 for islands on other hosts, on trusted networks only).")
+    parser.add_argument("--port", type=int, default=5555, help="Port to listen on.")
+    parser.add_argument("--mailbox-size", type=int, default=MAILBOX_SIZE, help="Migrant batches kept per island.")
+    parser.add_argument("--max-frame-size", type=int, default=MAX_FRAME_SIZE, help="Largest message accepted from an island, in bytes.")
+    args = parser.parse_args()
+
+    broker = MigrationBroker(args.host, args.port, args.mailbox_size, args.max_frame_size)
+    logger.info(f"Migration broker listening on {broker.address}.")
+    broker.serve_forever()
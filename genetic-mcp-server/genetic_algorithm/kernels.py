@@ -0,0 +1,368 @@
+"""
+Optional compiled backend for the hot loops of the genetic algorithm: tour lengths, OX/PMX crossover,
+swap mutation and knapsack repair. (The inversion mutation is left to the pure-Python operator: its slice
+reversal already runs natively, and a kernel call costs more.)
+
+The kernels are compiled with Numba on first use (and cached on disk). They work on NumPy views of the integer
+gene arrays (`Chromosome.values`), without copying them. When Numba is not installed, or the genes are not
+integers (e.g. city names), the pure-Python implementations are used instead.
+
+Random numbers are drawn from the `random` module as in the pure-Python operators, so both backends make the
+same runs for the same seed, except with the swap mutation: its per-gene draws are made by the kernel, from a
+seed drawn from `random`.
+"""
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, MutableSequence, Optional, Sequence
+from array import array
+import math
+import os
+import random
+
+from genetic_algorithm.operators import (
+    CROSSOVER_OPERATORS, MUTATION_OPERATORS, _cut_points, order_crossover, partially_mapped_crossover
+)
+from genetic_algorithm.fitness_functions.distance_source import EARTH_RADIUS, DistanceSource
+from genetic_algorithm.logger import logger_config
+
+if TYPE_CHECKING:
+    from genetic_algorithm.chromosome import Chromosome
+
+logger = logger_config(process_name="kernels", pretty=True)
+
+# NumPy and Numba are only needed (and imported) by the compiled backend
+np = None
+numba = None
+
+BACKENDS = ("auto", "python", "numba")
+
+# Backend used when a run does not choose one
+DEFAULT_BACKEND = os.getenv("GA_BACKEND", "auto")
+
+# Chromosome size from which "auto" selects the compiled backend: below it, importing Numba and loading the
+# kernels (about half a second per process, more when they are first compiled) costs more than they save
+NUMBA_MIN_SIZE = int(os.getenv("GA_NUMBA_MIN_SIZE", 200))
+
+# Compiled kernels, by name of their source function (filled by `_compile`)
+_kernels: Dict[str, Callable] = {}
+
+def resolve_backend(backend: Optional[str] = None, size: Optional[int] = None) -> str:
+    """
+    Resolve the backend of a run: "auto" selects "numba" when it is installed and the chromosomes have at
+    least NUMBA_MIN_SIZE genes, and "numba" falls back to "python" (with a warning) when it is not installed.
+
+    :param backend (optional): "auto", "python" or "numba". Default is the GA_BACKEND environment variable, or "auto".
+    :param size (optional): The chromosome size of the run. Default is None (no size threshold).
+    :return: "python" or "numba".
+    """
+    backend = backend or DEFAULT_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend: {backend}. Must be one of {', '.join(BACKENDS)}.")
+    if backend == "python":
+        return "python"
+    if backend == "auto" and size is not None and size < NUMBA_MIN_SIZE:
+        return "python"
+    if _compile():
+        return "numba"
+    if backend == "numba":
+        logger.warning("Numba is not installed. Using the pure-Python backend.")
+    return "python"
+
+def _compile() -> bool:
+    """
+    Import NumPy and Numba and wrap the kernels for compilation (each one is compiled on its first call).
+
+    :return: True if the compiled backend is available.
+    """
+    global np, numba
+    if _kernels:
+        return True
+
+    try:
+        import numpy as np
+        import numba
+    except ImportError:
+        return False
+
+    for kernel in (_matrix_tour_lengths, _coordinate_tour_lengths, _order_child, _pmx_child, _swap_moves, _repair_units):
+        _kernels[kernel.__name__] = numba.njit(cache=True)(kernel)
+    logger.debug(f"Compiled backend available with Numba {numba.__version__}.")
+    return True
+
+def _view(values: array) -> Any:
+    """
+    Get a NumPy view of an integer gene array, sharing its memory.
+    """
+    return np.frombuffer(values, dtype=np.int32)
+
+def _int_arrays(*sequences: Sequence[Any]) -> bool:
+    """
+    Check that gene sequences are integer arrays, which the kernels can work on.
+    """
+    return all(isinstance(values, array) and values.typecode == "i" for values in sequences)
+
+# Kernels, compiled by Numba: they only use NumPy arrays, numbers, and the sets and dicts Numba supports
+
+def _matrix_tour_lengths(tours, matrix, lengths):
+    """
+    Sum the distances along closed tours (rows of location indices), with a distance matrix, into `lengths`.
+    """
+    size = tours.shape[1]
+    for t in range(tours.shape[0]):
+        total = lengths[t]
+        for k in range(size):
+            total += matrix[tours[t, k], tours[t, (k + 1) % size]]
+        lengths[t] = total
+
+def _coordinate_tour_lengths(tours, xs, ys, cos_xs, metric, lengths):
+    """
+    Sum the distances along closed tours (rows of location indices), computed from coordinates with the metric
+    of `CoordinateDistances` (0: euclidean, 1: manhattan, 2: haversine), into `lengths`.
+    """
+    size = tours.shape[1]
+    for t in range(tours.shape[0]):
+        total = 0.0
+        for k in range(size):
+            origin, destination = tours[t, k], tours[t, (k + 1) % size]
+            if metric == 0:
+                total += math.hypot(xs[origin] - xs[destination], ys[origin] - ys[destination])
+            elif metric == 1:
+                total += abs(xs[origin] - xs[destination]) + abs(ys[origin] - ys[destination])
+            else:
+                haversine = math.sin((xs[destination] - xs[origin]) / 2) ** 2 + \
+                    cos_xs[origin] * cos_xs[destination] * math.sin((ys[destination] - ys[origin]) / 2) ** 2
+                total += 2 * EARTH_RADIUS * math.asin(math.sqrt(min(1.0, haversine)))
+        lengths[t] = total
+
+def _order_child(donor, other, child, a, b):
+    """
+    OX child: the segment [a, b) of `donor`, then the genes of `other` missing from it, in their order
+    starting after the segment.
+    """
+    size = donor.shape[0]
+    kept = set()
+    for k in range(a, b):
+        kept.add(donor[k])
+    child[:] = donor
+    position = b % size
+    for k in range(size):
+        gene = other[(b + k) % size]
+        if gene not in kept:
+            child[position] = gene
+            position = (position + 1) % size
+
+def _pmx_child(donor, other, child, a, b):
+    """
+    PMX child: the segment [a, b) of `donor` and the other genes of `other`, following the mapping of the
+    segment for the genes that would repeat.
+    """
+    child[:] = other
+    child[a:b] = donor[a:b]
+    mapping = dict()
+    for k in range(a, b):
+        mapping[donor[k]] = other[k]
+    for k in range(donor.shape[0]):
+        if a <= k < b:
+            continue
+        gene = other[k]
+        while gene in mapping:
+            gene = mapping[gene]
+        child[k] = gene
+
+def _swap_moves(size, rate, seed):
+    """
+    Draw the moves of a swap mutation: each index is swapped, with probability `rate`, with another random index.
+    """
+    np.random.seed(seed)
+    moves = np.empty((size, 2), dtype=np.int64)
+    count = 0
+    for index in range(size):
+        if np.random.random() <= rate:
+            other = np.random.randint(0, size)
+            if other != index:
+                moves[count, 0] = index
+                moves[count, 1] = other
+                count += 1
+    return moves[:count]
+
+def _repair_units(units, capacity, weight, order, max_weight):
+    """
+    Clamp the units of a knapsack solution to the capacity of each item, then remove units of the items in
+    `order` (lowest value/weight ratio first) until the maximum weight is respected.
+    """
+    total = 0
+    for i in range(units.shape[0]):
+        units[i] = max(0, min(units[i], capacity[i]))
+        total += units[i] * weight[i]
+
+    excess = total - max_weight
+    for i in order:
+        if excess <= 0:
+            break
+        removed = min(units[i], -(-excess // weight[i]))
+        units[i] -= int(removed)
+        excess -= removed * weight[i]
+
+# Operators of the compiled backend, with the signatures of the registered ones (see `operators`)
+
+def compiled_order_crossover(parent1: Sequence[Any], parent2: Sequence[Any], child1: MutableSequence[Any], child2: MutableSequence[Any]):
+    """
+    Order crossover (OX), compiled.
+    """
+    if not _int_arrays(parent1, parent2, child1, child2):
+        return order_crossover(parent1, parent2, child1, child2)
+
+    a, b = _cut_points(len(parent1))
+    parent1, parent2 = _view(parent1), _view(parent2)
+    _kernels["_order_child"](parent1, parent2, _view(child1), a, b)
+    _kernels["_order_child"](parent2, parent1, _view(child2), a, b)
+
+def compiled_partially_mapped_crossover(parent1: Sequence[Any], parent2: Sequence[Any], child1: MutableSequence[Any], child2: MutableSequence[Any]):
+    """
+    Partially mapped crossover (PMX), compiled.
+    """
+    if not _int_arrays(parent1, parent2, child1, child2):
+        return partially_mapped_crossover(parent1, parent2, child1, child2)
+
+    a, b = _cut_points(len(parent1))
+    parent1, parent2 = _view(parent1), _view(parent2)
+    _kernels["_pmx_child"](parent1, parent2, _view(child1), a, b)
+    _kernels["_pmx_child"](parent2, parent1, _view(child2), a, b)
+
+def compiled_swap_mutation(values: MutableSequence[Any], rate: float, new_gene: Callable[[int], Any], accept: Callable[[], bool]):
+    """
+    Swap mutation, with the per-gene draws compiled. Only the drawn moves are applied (and checked) in Python.
+    """
+    size = len(values)
+    if size < 2:
+        return
+
+    for index, other in _kernels["_swap_moves"](size, rate, random.getrandbits(32)).tolist():
+        values[index], values[other] = values[other], values[index]
+        if not accept():
+            values[index], values[other] = values[other], values[index]
+
+COMPILED_OPERATORS = {
+    "crossover": {"ox": compiled_order_crossover, "pmx": compiled_partially_mapped_crossover},
+    "mutation": {"swap": compiled_swap_mutation},
+}
+
+def select_operator(kind: str, name: str, backend: str) -> Callable:
+    """
+    Get the implementation of a registered crossover or mutation operator for a backend.
+
+    :param kind: "crossover" or "mutation".
+    :param name: The name of the operator.
+    :param backend: The resolved backend, "python" or "numba".
+    :return: The compiled operator if there is one, else the registered operator.
+    """
+    registry = {"crossover": CROSSOVER_OPERATORS, "mutation": MUTATION_OPERATORS}[kind]
+    if backend == "numba" and name in COMPILED_OPERATORS[kind]:
+        return COMPILED_OPERATORS[kind][name]
+    return registry[name]
+
+# Fitness helpers of the compiled backend
+
+class TourLengths:
+    """
+    Compiled tour lengths of a routing instance, with its distances and the index of each location as arrays.
+    """
+    def __init__(self, locations: Sequence[Any], distances: DistanceSource):
+        """
+        Prepare the arrays of an instance. Dense matrices given as arrays are used without copying them.
+
+        :param locations: The locations (gene values), in the order of the distances.
+        :param distances: The distances between the locations.
+        """
+        if not _compile():
+            raise ValueError("Numba is required by the compiled backend.")
+
+        self.size = len(locations)
+        self.metric = None
+        self.matrix = None
+        if hasattr(distances, "matrix"):
+            self.matrix = np.asarray(distances.matrix)
+        elif hasattr(distances, "metric"):
+            self.metric = distances.METRICS.index(distances.metric)
+            self.xs = np.asarray(distances.xs, dtype=np.float64)
+            self.ys = np.asarray(distances.ys, dtype=np.float64)
+            self.cos_xs = np.asarray(getattr(distances, "cos_xs", []), dtype=np.float64)
+
+        # Integer locations that are not the indices themselves are looked up in a sorted copy
+        self.identity = list(locations) == list(range(self.size))
+        self.sorted_locations = None
+        if not self.identity and all(type(location) is int for location in locations):
+            self.order = np.argsort(np.asarray(locations, dtype=np.int64), kind="stable")
+            self.sorted_locations = np.asarray(locations, dtype=np.int64)[self.order]
+
+        # Whether the kernels apply: numeric distances, and integer locations
+        numeric_matrix = self.matrix is not None and self.matrix.ndim == 2 and self.matrix.dtype.kind in "iuf"
+        self.supported = (numeric_matrix or self.metric is not None) and (self.identity or self.sorted_locations is not None)
+
+    def lengths(self, chromosomes: List["Chromosome"]) -> Optional[List[float]]:
+        """
+        Calculate the length of closed tours.
+
+        :param chromosomes: The chromosomes, whose values are the tours.
+        :return: The length of each tour, or None if the instance is not supported, or a tour is not an integer
+        array of every location or visits an unknown location (the pure-Python path then handles it).
+        """
+        if not self.supported or not chromosomes or not all(_int_arrays(c.values) and len(c.values) == self.size for c in chromosomes):
+            return None
+
+        tours = np.frombuffer(b"".join(c.values.tobytes() for c in chromosomes), dtype=np.int32).reshape(len(chromosomes), self.size)
+        if self.sorted_locations is not None:
+            positions = np.searchsorted(self.sorted_locations, tours).clip(0, self.size - 1)
+            if not np.array_equal(self.sorted_locations[positions], tours):
+                return None
+            tours = self.order[positions]
+        elif tours.min() < 0 or tours.max() >= self.size:
+            return None
+
+        if self.matrix is not None:
+            lengths = np.zeros(len(chromosomes), dtype=np.int64 if self.matrix.dtype.kind in "iu" else np.float64)
+            _kernels["_matrix_tour_lengths"](tours, self.matrix, lengths)
+        else:
+            lengths = np.zeros(len(chromosomes), dtype=np.float64)
+            _kernels["_coordinate_tour_lengths"](tours, self.xs, self.ys, self.cos_xs, self.metric, lengths)
+        return lengths.tolist()
+
+class KnapsackRepair:
+    """
+    Compiled repair of knapsack units (see `KnapsackFitnessFunction.repair_chromosome`), with the items of the
+    instance as arrays.
+    """
+    def __init__(self, capacity: Sequence[int], weight: Sequence[float], order: Sequence[int], max_weight: float):
+        """
+        Prepare the arrays of an instance.
+
+        :param capacity: The capacity of each item.
+        :param weight: The weight of each item.
+        :param order: The items with a positive weight, by increasing value/weight ratio.
+        :param max_weight: The maximum weight.
+        """
+        if not _compile():
+            raise ValueError("Numba is required by the compiled backend.")
+
+        self.capacity = np.asarray(capacity, dtype=np.int64)
+        self.weight = np.asarray(weight)
+        self.order = np.asarray(order, dtype=np.int64)
+        self.max_weight = max_weight
+
+    def repair(self, values: Sequence[Any], chromosome_size: int) -> List[int]:
+        """
+        Repair the units of a solution.
+
+        :param values: The units taken of each item.
+        :param chromosome_size: The size of the chromosome.
+        :return: The repaired units.
+        """
+        given = np.frombuffer(values, dtype=np.int32) if _int_arrays(values) else np.asarray(list(values), dtype=np.float64)
+        units = np.zeros(chromosome_size, dtype=np.int64)
+        units[:min(len(given), chromosome_size)] = given[:chromosome_size]
+        _kernels["_repair_units"](
+            units,
+            self.capacity[:chromosome_size],
+            self.weight[:chromosome_size],
+            self.order[self.order < chromosome_size],
+            self.max_weight,
+        )
+        return units.tolist()
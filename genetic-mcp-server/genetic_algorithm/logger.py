@@ -3,13 +3,29 @@ import logging
 
 from typing import Optional
 
-def logger_config(process_name: Optional[str], pretty: Optional[bool] = True):
+import os
+
+_configured = False
+
+def configure_logging(pretty: Optional[bool] = True):
     """
-    Configure the logger to use structlog with optional pretty-print output.
+    Configure logging and structlog once per process, with the level read from the LOG_LEVEL
+    environment variable (or the .env file). Later calls do nothing.
 
     :param pretty: Whether to enable pretty-printing for logs.
     """
-    logging.basicConfig(level=logging.DEBUG)
+    global _configured
+    if _configured:
+        return
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    level = os.getenv("LOG_LEVEL", "INFO").upper()
+    if level not in ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]:
+        raise ValueError(f"Invalid LOG_LEVEL: {level}. Must be one of DEBUG, INFO, WARNING, ERROR, CRITICAL.")
+
+    logging.basicConfig(level=level)
 
     processors = [
         structlog.processors.TimeStamper(fmt="iso"),  # Add timestamp to logs
@@ -23,9 +39,19 @@ def logger_config(process_name: Optional[str], pretty: Optional[bool] = True):
         wrapper_class=structlog.stdlib.BoundLogger,
         cache_logger_on_first_use=True,
     )
+    _configured = True
+
+def logger_config(process_name: Optional[str], pretty: Optional[bool] = True):
+    """
+    Get a logger bound to a process name, configuring logging on first use.
+
+    :param process_name: Name bound to every log entry of the logger.
+    :param pretty: Whether to enable pretty-printing for logs (only used by the first call).
+    """
+    configure_logging(pretty=pretty)
 
     logger = structlog.get_logger()
     if process_name:
         logger = logger.bind(process=process_name)
 
-    return logger
\ No newline at end of file
+    return logger
@@ -1,17 +1,41 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 import json
+import random
 import sys
 from math import factorial
 
-from gen_alg import GeneticAlgorithm
-from logger import logger_config
+from genetic_algorithm.gen_alg import GeneticAlgorithm
+from genetic_algorithm.logger import logger_config
 
-from fitness_functions.knapsack_function import KnapsackFitnessFunction
-from fitness_functions.tsp_function import TravelingSalesmanFitnessFunction
-from fitness_functions.vrp_function import VehicleRoutingFitnessFunction
+from genetic_algorithm.fitness_functions.fitness_function import FitnessFunction
 
 logger = logger_config(process_name="genetic_algorithm_main", pretty=True)
 
+def build_fitness_function(problem: str, fields: Dict[str, Any]) -> FitnessFunction:
+    """
+    Parse and validate the fitness function parameters of a problem.
+
+    :param problem: The problem type: "knapsack", "traveling_salesman" or "vehicle_routing".
+    :param fields: The fitness function parameters.
+    :return: The fitness function.
+    """
+    # Only the module of the requested problem is imported
+    if problem == "knapsack":
+        from genetic_algorithm.fitness_functions.knapsack_function import KnapsackFitnessFunction
+        fitness_function = KnapsackFitnessFunction(fields)
+    elif problem == "vehicle_routing":
+        from genetic_algorithm.fitness_functions.vrp_function import VehicleRoutingFitnessFunction
+        fitness_function = VehicleRoutingFitnessFunction(fields)
+    elif problem == "traveling_salesman":
+        from genetic_algorithm.fitness_functions.tsp_function import TravelingSalesmanFitnessFunction
+        fitness_function = TravelingSalesmanFitnessFunction(fields)
+    else:
+        logger.error(f"Unknown problem type: {problem}")
+        raise ValueError(f"Unknown problem type: {problem}")
+
+    logger.info(f"Using {type(fitness_function).__name__} with parameters: {list(fields)}")
+    return fitness_function
+
 def main(
         options: Optional[Dict[str, Any]] = None, 
         problem: Optional[str] = "knapsack",
@@ -20,48 +44,146 @@ def main(
     """
     Main function to run the genetic algorithm for a specified problem.
 
-    :param options: A dictionary of options to configure the genetic algorithm.
+    :param options: A dictionary of options to configure the genetic algorithm. Its "fitness_function" is either
+    the fitness function parameters or an already built FitnessFunction (see `build_fitness_function`). With a
+    "portfolio" list of configurations, they are raced against each other (see `portfolio.run_portfolio`).
     :param problem: The problem to solve. Default is "knapsack".
     """
+    result, _ = solve(options=options, problem=problem, generations=generations)
+    return result
+
+def solve(
+        options: Optional[Dict[str, Any]] = None,
+        problem: Optional[str] = "knapsack",
+        generations: Optional[int] = 100,
+        genetic_algorithm: Optional[GeneticAlgorithm] = None
+) -> Tuple[Dict[str, Any], Optional[GeneticAlgorithm]]:
+    """
+    Run the genetic algorithm for a specified problem, and also return the algorithm so it can be continued.
+
+    :param options: A dictionary of options to configure the genetic algorithm (see `main`).
+    :param problem: The problem to solve. Default is "knapsack".
+    :param generations: The number of generations to run.
+    :param genetic_algorithm (optional): A genetic algorithm returned by a previous call with the same options,
+    continued for `generations` more generations from its current population instead of starting a new one.
+    :return: The result and the genetic algorithm (None in portfolio mode).
+    """
     logger.info("Starting the genetic algorithm with options: %s", options)
 
+    # Portfolio mode: race several configurations and return the best one (it cannot be continued)
+    if options.get("portfolio"):
+        from genetic_algorithm.portfolio import run_portfolio
+        return run_portfolio(options=options, problem=problem, generations=generations), None
+
     population_size = int(options.get("population_size", 1000))
     chromosome_size = int(options.get("chromosome_size", 10))
+    replacement = options.get("replacement", "generational")
+    elite_size = int(options.get("elite_size", 1))
+    mutation_rate = float(options.get("mutation_rate", 0.05))
+    crossover_rate = float(options.get("crossover_rate", 0.8))
+    adaptation = options.get("adaptation", "fixed")
+    diversity_measure = options.get("diversity_measure")
+    diversity_bounds = options.get("diversity_bounds", (0.1, 0.4))
+    seed_fraction = float(options.get("seed_fraction", 0.0))
+    seed = options.get("seed")
+    initial_population = options.get("initial_population")
+    objectives = options.get("objectives")
+    constraint_handling = options.get("constraint_handling", "rejection")
+    penalty_weight = float(options.get("penalty_weight", 1.0))
+    selection = options.get("selection", "roulette")
+    crossover = options.get("crossover", "two_point")
+    mutation = options.get("mutation", "random_reset")
+    migration = options.get("migration")
+    telemetry = options.get("telemetry")
+    history = bool(options.get("history", False))
+    history_points = options.get("history_points")
+    backend = options.get("backend")
     generations = int(generations)
 
+    # A seed makes the run reproducible; a continued run keeps the random state it has reached
+    if seed is not None and genetic_algorithm is None:
+        random.seed(seed)
+
     ff_arg = options.get("fitness_function")  # Mandatory field for fitness function parameters
     if ff_arg is None:
         logger.error("Fitness function parameters must be provided.")
         raise ValueError("Fitness function parameters must be provided.")
 
-    # Initialize the fitness function based on the problem type
-    if problem == "knapsack":
-        fitness_function = KnapsackFitnessFunction(ff_arg)
-        logger.info("Using KnapsackFitnessFunction with parameters: %s", ff_arg)
-    elif problem == "vehicle_routing":
-        fitness_function = VehicleRoutingFitnessFunction(ff_arg)
-        logger.info("Using VehicleRoutingFitnessFunction with parameters: %s", ff_arg)
-    elif problem == "traveling_salesman":
-        fitness_function = TravelingSalesmanFitnessFunction(ff_arg)
-        logger.info("Using TravelingSalesmanFitnessFunction with parameters: %s", ff_arg)
+    # Initialize the fitness function based on the problem type, unless it was built beforehand
+    if isinstance(ff_arg, FitnessFunction):
+        fitness_function = ff_arg
+    else:
+        fitness_function = build_fitness_function(problem, ff_arg)
 
+    if problem == "vehicle_routing":
+        # Each chromosome is a permutation of all the clients
+        if chromosome_size != len(fitness_function.clients):
+            raise ValueError(f"Chromosome size must be the number of clients ({len(fitness_function.clients)}) for this problem.")
+        max_pop = factorial(chromosome_size)
+        if population_size > (max_pop):
+            raise ValueError(f"Population size must not exceed {chromosome_size}! ({max_pop}) for this problem.")
+    elif problem == "traveling_salesman":
         # Check if population size is leq (chromosome_size!), which is the max size of permutations of chromosome_size
         max_pop = factorial(chromosome_size)
         if population_size > (max_pop):
             raise ValueError(f"Population size must not exceed {chromosome_size}! ({max_pop}) for this problem.")
-    else:
-        logger.error(f"Unknown problem type: {problem}")
-        raise ValueError(f"Unknown problem type: {problem}")
 
-    # Initialize and run the genetic algorithm
-    ga = GeneticAlgorithm(
+    # An island of a distributed run exchanges migrants through a broker
+    if migration is not None and genetic_algorithm is None:
+        from genetic_algorithm.islands import Migration
+        migration = Migration(**migration)
+
+    # Per-generation records, optionally written to a JSONL file
+    if telemetry is not None and genetic_algorithm is None:
+        from genetic_algorithm.telemetry import Telemetry
+        telemetry = Telemetry(**telemetry)
+
+    # Initialize and run the genetic algorithm, or continue the given one
+    ga = genetic_algorithm or GeneticAlgorithm(
         population_size=population_size,
         chromosome_size=chromosome_size,
         fitness_function=fitness_function,
         problem=problem,
+        replacement=replacement,
+        elite_size=elite_size,
+        mutation_rate=mutation_rate,
+        crossover_rate=crossover_rate,
+        adaptation=adaptation,
+        diversity_measure=diversity_measure,
+        diversity_bounds=diversity_bounds,
+        seed_fraction=seed_fraction,
+        initial_population=initial_population,
+        objectives=objectives,
+        constraint_handling=constraint_handling,
+        penalty_weight=penalty_weight,
+        method=selection,
+        crossover_operator=crossover,
+        mutation_operator=mutation,
+        migration=migration,
+        telemetry=telemetry,
+        history=history,
+        backend=backend,
     )
 
-    result = ga.run(generations=generations)
+    try:
+        result = ga.run(generations=generations)
+    finally:
+        # Leave the island group; a continued run joins it again
+        if ga.migration is not None:
+            ga.migration.close()
+    result.update({
+        "mutation_rate": ga.mutation_rate,
+        "crossover_rate": ga.crossover_rate,
+        "diversity": ga.diversity,
+        "constraint_violation": result["best_chromosome"].violation,
+        "backend": ga.backend,
+    })
+    if ga.history is not None:
+        result["history"] = ga.history.summary(max_points=int(history_points) if history_points else None)
+    if ga.migration is not None:
+        result["migration"] = ga.migration.summary()
+    if ga.constraint_handling == "adaptive_penalty":
+        result["penalty_weight"] = ga.penalty_weight
     if problem == "knapsack":
         result.update({
             "max_weight": fitness_function.max_weight,
@@ -71,17 +193,25 @@ def main(
         result.update({
             "distance": result["best_chromosome"].distance,
         })
+    elif problem == "vehicle_routing":
+        result.update({
+            "distance": result["best_chromosome"].distance,
+            "routes": result["best_chromosome"].routes,
+            "vehicles": len(result["best_chromosome"].routes),
+        })
 
     # Log the result in a readable format
     log = ""
     for key in result:
         if key == "best_chromosome":
-            result[key] = [g.value for g in result[key].genes]
+            result[key] = list(result[key].values)
+        if key == "history":
+            continue
         log += f"{key.capitalize().replace('_', ' ')}: {result[key]} "
     log += "\n"
     logger.info(f"{log}")
 
-    return result
+    return result, ga
         
 if __name__ == "__main__":
     if len(sys.argv) > 1:
@@ -0,0 +1,274 @@
+from typing import Any, Callable, Dict, List, MutableSequence, Sequence, Tuple
+import heapq
+import random
+
+from genetic_algorithm.chromosome import Chromosome
+
+# Registries of the genetic operators, selectable by name. Every operator works on the compact
+# genotype arrays (`Chromosome.values`), so they can be swapped and benchmarked on equal terms.
+
+# Selection: (population, number of parents) -> distinct parents, drawn from the whole population at once
+SelectionOperator = Callable[[List[Chromosome], int], List[Chromosome]]
+# Crossover: (parent1, parent2, child1, child2) -> None; the children buffers (same size as the parents) are filled in place
+CrossoverOperator = Callable[[Sequence[Any], Sequence[Any], MutableSequence[Any], MutableSequence[Any]], None]
+# Mutation: (values, mutation rate, new gene for an index, accept) -> None; the values are changed in place, and every
+# elementary move is undone when `accept()` returns False
+MutationOperator = Callable[[MutableSequence[Any], float, Callable[[int], Any], Callable[[], bool]], None]
+
+SELECTION_OPERATORS: Dict[str, SelectionOperator] = {}
+CROSSOVER_OPERATORS: Dict[str, CrossoverOperator] = {}
+MUTATION_OPERATORS: Dict[str, MutationOperator] = {}
+
+# Operators that only make sense for permutations (tours), by kind
+PERMUTATION_OPERATORS = {"crossover": set(), "mutation": set()}
+
+def register(kind: str, name: str, permutation_only: bool = False) -> Callable:
+    """
+    Register an operator under a name.
+
+    :param kind: The kind of operator: "selection", "crossover" or "mutation".
+    :param name: The name used to select the operator.
+    :param permutation_only (optional): Whether the operator requires permutation chromosomes. Default is False.
+    :return: A decorator registering the function.
+    """
+    registry = {"selection": SELECTION_OPERATORS, "crossover": CROSSOVER_OPERATORS, "mutation": MUTATION_OPERATORS}[kind]
+
+    def decorator(operator: Callable) -> Callable:
+        registry[name] = operator
+        if permutation_only:
+            PERMUTATION_OPERATORS[kind].add(name)
+        return operator
+
+    return decorator
+
+# Selection
+
+def _weighted_selection(chromosomes: List[Chromosome], weights: List[float], parents: int) -> List[Chromosome]:
+    """
+    Draw distinct chromosomes with probabilities proportional to their weights (roulette wheel). The wheel
+    only holds the chromosomes not drawn yet; when their weights are all zero, the draw is uniform.
+
+    The draws are done in one pass as an exponential race (Efraimidis-Spirakis): each chromosome arrives after
+    an exponential time of rate its weight, and the first arrivals are the successive draws of the wheel, with
+    the same distribution. This takes O(P log P) instead of a scan of the wheel per draw.
+
+    :param chromosomes: The population.
+    :param weights: The weight of each chromosome.
+    :param parents: The number of parents to select.
+    :return: The selected chromosomes.
+    """
+    # Chromosomes without weight arrive after all the weighted ones, in a uniformly random order
+    arrivals = [
+        (0, random.expovariate(weight), index) if weight > 0 else (1, random.random(), index)
+        for index, weight in enumerate(weights)
+    ]
+    return [chromosomes[index] for _, _, index in heapq.nsmallest(parents, arrivals)]
+
+@register("selection", "roulette")
+def roulette_selection(chromosomes: List[Chromosome], parents: int) -> List[Chromosome]:
+    """
+    Roulette wheel selection: chromosomes are drawn with probabilities proportional to their fitness.
+    """
+    return _weighted_selection(chromosomes, [chromosome.fitness for chromosome in chromosomes], parents)
+
+@register("selection", "tournament")
+def tournament_selection(chromosomes: List[Chromosome], parents: int, tournament_size: int = 3) -> List[Chromosome]:
+    """
+    Tournament selection: the fittest of `tournament_size` random chromosomes wins each draw.
+    """
+    selected = []
+    current_pop = list(chromosomes)
+
+    while len(selected) < parents:
+        tournament = random.sample(current_pop, min(tournament_size, len(current_pop)))
+        winner = max(tournament, key=lambda c: c.fitness)
+        selected.append(winner)
+        current_pop.remove(winner)
+
+    return selected
+
+@register("selection", "rank")
+def rank_selection(chromosomes: List[Chromosome], parents: int) -> List[Chromosome]:
+    """
+    Linear rank selection: chromosomes are drawn with probabilities proportional to their rank (1 for the worst),
+    so the selection pressure does not depend on the scale of the fitness.
+    """
+    ranked = sorted(chromosomes, key=lambda c: c.fitness)
+    return _weighted_selection(ranked, list(range(1, len(ranked) + 1)), parents)
+
+@register("selection", "sus")
+def stochastic_universal_sampling(chromosomes: List[Chromosome], parents: int) -> List[Chromosome]:
+    """
+    Stochastic universal sampling: evenly spaced pointers over the fitness wheel, with a single random offset,
+    select all the parents in one pass with minimal spread. Pointers landing on an already selected chromosome
+    are drawn again over the remaining ones.
+    """
+    selected = []
+    remaining = list(chromosomes)
+
+    while len(selected) < parents:
+        count = parents - len(selected)
+        total_fitness = sum(chromosome.fitness for chromosome in remaining)
+        if total_fitness <= 0:
+            selected.extend(random.sample(remaining, count))
+            break
+
+        step = total_fitness / count
+        pointer = random.uniform(0, step)
+        current_sum = 0
+        picked = []
+        for chromosome in remaining:
+            current_sum += chromosome.fitness
+            if pointer < current_sum:
+                picked.append(chromosome)
+                while pointer < current_sum:
+                    pointer += step
+
+        picked_ids = {id(chromosome) for chromosome in picked}
+        remaining = [chromosome for chromosome in remaining if id(chromosome) not in picked_ids]
+        selected.extend(picked[:count])
+
+    return selected
+
+# Crossover
+
+@register("crossover", "two_point")
+def two_point_crossover(parent1: Sequence[Any], parent2: Sequence[Any], child1: MutableSequence[Any], child2: MutableSequence[Any]):
+    """
+    Two-point crossover: the children swap the segment between two random points (one-point when they coincide).
+    """
+    i = random.randint(0, len(parent1) - 1)
+    j = random.randint(0, len(parent2) - 1)
+
+    if i != j:
+        min_index, max_index = min(i, j), max(i, j)
+
+        child1[:] = parent1
+        child1[min_index:max_index] = parent2[min_index:max_index]
+
+        child2[:] = parent2
+        child2[min_index:max_index] = parent1[min_index:max_index]
+    else:
+        child1[:i] = parent2[:i]
+        child1[i:] = parent1[i:]
+
+        child2[:i] = parent1[:i]
+        child2[i:] = parent2[i:]
+
+@register("crossover", "uniform")
+def uniform_crossover(parent1: Sequence[Any], parent2: Sequence[Any], child1: MutableSequence[Any], child2: MutableSequence[Any]):
+    """
+    Uniform crossover: every gene comes from either parent with equal probability.
+    """
+    child1[:] = parent1
+    child2[:] = parent2
+    for k in range(len(parent1)):
+        if random.random() < 0.5:
+            child1[k], child2[k] = parent2[k], parent1[k]
+
+def _cut_points(size: int) -> Tuple[int, int]:
+    """
+    Draw two cut points 0 <= a < b <= size.
+    """
+    a, b = sorted(random.sample(range(size + 1), 2))
+    return a, b
+
+def _order_child(donor: Sequence[Any], other: Sequence[Any], child: MutableSequence[Any], a: int, b: int):
+    """
+    Fill `child` with the segment [a, b) of `donor`, then the genes of `other` missing from it, in their order
+    starting after the segment.
+    """
+    size = len(donor)
+    child[:] = donor
+    kept = set(donor[a:b])
+    position = b % size
+    for k in range(size):
+        gene = other[(b + k) % size]
+        if gene not in kept:
+            child[position] = gene
+            position = (position + 1) % size
+
+@register("crossover", "ox", permutation_only=True)
+def order_crossover(parent1: Sequence[Any], parent2: Sequence[Any], child1: MutableSequence[Any], child2: MutableSequence[Any]):
+    """
+    Order crossover (OX): each child keeps a segment of one parent and the relative order of the other parent's
+    remaining genes, so permutations stay permutations.
+    """
+    a, b = _cut_points(len(parent1))
+    _order_child(parent1, parent2, child1, a, b)
+    _order_child(parent2, parent1, child2, a, b)
+
+def _pmx_child(donor: Sequence[Any], other: Sequence[Any], child: MutableSequence[Any], a: int, b: int):
+    """
+    Fill `child` with the segment [a, b) of `donor` and the other genes of `other`, following the mapping
+    of the segment for the genes that would repeat.
+    """
+    child[:] = other
+    child[a:b] = donor[a:b]
+    mapping = {donor[k]: other[k] for k in range(a, b)}
+    for k in list(range(a)) + list(range(b, len(donor))):
+        gene = other[k]
+        while gene in mapping:
+            gene = mapping[gene]
+        child[k] = gene
+
+@register("crossover", "pmx", permutation_only=True)
+def partially_mapped_crossover(parent1: Sequence[Any], parent2: Sequence[Any], child1: MutableSequence[Any], child2: MutableSequence[Any]):
+    """
+    Partially mapped crossover (PMX): each child keeps a segment of one parent and the positions of the other
+    parent's genes, resolving conflicts through the mapping between the two segments.
+    """
+    a, b = _cut_points(len(parent1))
+    _pmx_child(parent1, parent2, child1, a, b)
+    _pmx_child(parent2, parent1, child2, a, b)
+
+# Mutation
+
+@register("mutation", "random_reset")
+def random_reset_mutation(values: MutableSequence[Any], rate: float, new_gene: Callable[[int], Any], accept: Callable[[], bool]):
+    """
+    Random reset mutation: each gene is replaced, with probability `rate`, by a random gene.
+    """
+    for index in range(len(values)):
+        if random.random() <= rate:
+            original_value = values[index]
+            new_value = new_gene(index)
+            if new_value != original_value:
+                values[index] = new_value
+                if not accept():
+                    values[index] = original_value
+
+@register("mutation", "swap", permutation_only=True)
+def swap_mutation(values: MutableSequence[Any], rate: float, new_gene: Callable[[int], Any], accept: Callable[[], bool]):
+    """
+    Swap mutation: each gene is swapped, with probability `rate`, with another random gene.
+    """
+    size = len(values)
+    if size < 2:
+        return
+
+    for index in range(size):
+        if random.random() <= rate:
+            other = random.randrange(size)
+            if other != index:
+                values[index], values[other] = values[other], values[index]
+                if not accept():
+                    values[index], values[other] = values[other], values[index]
+
+@register("mutation", "inversion", permutation_only=True)
+def inversion_mutation(values: MutableSequence[Any], rate: float, new_gene: Callable[[int], Any], accept: Callable[[], bool]):
+    """
+    Inversion mutation: a random segment is reversed, with the probability that at least one gene would
+    mutate at `rate` (1 - (1 - rate) ** size).
+    """
+    size = len(values)
+    if size < 2 or random.random() > 1 - (1 - rate) ** size:
+        return
+
+    a, b = _cut_points(size)
+    if b - a < 2:
+        return
+
+    values[a:b] = values[a:b][::-1]
+    if not accept():
+        values[a:b] = values[a:b][::-1]
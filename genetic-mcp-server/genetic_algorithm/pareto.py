@@ -0,0 +1,77 @@
+from typing import List, Sequence
+
+# Pareto dominance helpers for multi-objective runs. Every objective vector is maximized.
+
+def dominates(a: Sequence[float], b: Sequence[float]) -> bool:
+    """
+    Check whether objective vector `a` Pareto-dominates `b`: at least as good in every objective and
+    strictly better in one.
+
+    :param a: The first objective vector.
+    :param b: The second objective vector.
+    :return: True if `a` dominates `b`.
+    """
+    better = False
+    for x, y in zip(a, b):
+        if x < y:
+            return False
+        if x > y:
+            better = True
+    return better
+
+def fast_non_dominated_sort(vectors: List[Sequence[float]]) -> List[List[int]]:
+    """
+    Sort objective vectors into Pareto fronts, as in NSGA-II: O(M * N^2) for N vectors of M objectives.
+
+    :param vectors: The objective vectors.
+    :return: The fronts, best first, as lists of indices into `vectors`.
+    """
+    n = len(vectors)
+    dominated = [[] for _ in range(n)]  # Indices each vector dominates
+    domination_count = [0] * n  # Number of vectors dominating each one
+
+    for i in range(n):
+        for j in range(i + 1, n):
+            if dominates(vectors[i], vectors[j]):
+                dominated[i].append(j)
+                domination_count[j] += 1
+            elif dominates(vectors[j], vectors[i]):
+                dominated[j].append(i)
+                domination_count[i] += 1
+
+    fronts = [[i for i in range(n) if domination_count[i] == 0]]
+    while fronts[-1]:
+        next_front = []
+        for i in fronts[-1]:
+            for j in dominated[i]:
+                domination_count[j] -= 1
+                if domination_count[j] == 0:
+                    next_front.append(j)
+        fronts.append(next_front)
+
+    return fronts[:-1]
+
+def crowding_distance(vectors: List[Sequence[float]], front: List[int]) -> List[float]:
+    """
+    Compute the crowding distance of the vectors of a front: the normalized size of the box formed by
+    their neighbors in every objective. The extreme vectors get an infinite distance.
+
+    :param vectors: The objective vectors.
+    :param front: The indices of the front.
+    :return: The crowding distance of each index of the front, in the same order.
+    """
+    distance = {i: 0.0 for i in front}
+    if len(front) <= 2:
+        return [float("inf")] * len(front)
+
+    for objective in range(len(vectors[front[0]])):
+        ordered = sorted(front, key=lambda i: vectors[i][objective])
+        low, high = vectors[ordered[0]][objective], vectors[ordered[-1]][objective]
+        distance[ordered[0]] = distance[ordered[-1]] = float("inf")
+        if high == low or high - low == float("inf"):
+            continue
+
+        for k in range(1, len(ordered) - 1):
+            distance[ordered[k]] += (vectors[ordered[k + 1]][objective] - vectors[ordered[k - 1]][objective]) / (high - low)
+
+    return [distance[i] for i in front]
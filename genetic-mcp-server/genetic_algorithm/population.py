@@ -1,5 +1,5 @@
 from typing import List
-from chromosome import Chromosome
+from genetic_algorithm.chromosome import Chromosome
 
 class Population:
     """
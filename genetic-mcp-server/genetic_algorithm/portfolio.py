@@ -0,0 +1,243 @@
+from typing import Any, Dict, List, Optional, Tuple
+import math
+import multiprocessing
+import random
+import time
+
+from genetic_algorithm.logger import logger_config
+
+logger = logger_config(process_name="portfolio", pretty=True)
+
+# Options of the portfolio itself, not passed to the configurations
+PORTFOLIO_OPTIONS = ("portfolio", "race_interval", "race_tolerance", "portfolio_parallel")
+
+def _advance(options: Dict[str, Any], problem: str, generations: int, genetic_algorithm: Optional[Any]) -> Tuple[Dict[str, Any], Any, float]:
+    """
+    Run a configuration for some more generations.
+
+    :param options: The options of the configuration.
+    :param problem: The problem type.
+    :param generations: The number of generations.
+    :param genetic_algorithm: The genetic algorithm of the previous rounds, or None for the first one.
+    :return: The result, the genetic algorithm and the CPU time spent.
+    """
+    from genetic_algorithm.main import solve
+
+    start = time.process_time()
+    result, genetic_algorithm = solve(options=options, problem=problem, generations=generations, genetic_algorithm=genetic_algorithm)
+    return result, genetic_algorithm, time.process_time() - start
+
+def _race_worker(connection, options: Dict[str, Any], problem: str):
+    """
+    Worker process of a configuration: run the number of generations received for each round and send back
+    the result, until None is received.
+
+    :param connection: The worker end of the pipe.
+    :param options: The options of the configuration.
+    :param problem: The problem type.
+    """
+    genetic_algorithm = None
+    while True:
+        generations = connection.recv()
+        if generations is None:
+            break
+        try:
+            result, genetic_algorithm, cpu_time = _advance(options, problem, generations, genetic_algorithm)
+            connection.send((result, cpu_time))
+        except Exception as error:
+            connection.send(({"error": f"{type(error).__name__}: {error}"}, 0.0))
+            break
+        # Only the first round is seeded; later rounds continue the random sequence
+        options = {**options, "seed": None}
+
+class _Racer:
+    """
+    A configuration of the portfolio, advanced round by round in its own worker process, or in the
+    current process when the portfolio runs in turn (e.g. inside a batch worker). In the current process,
+    each configuration keeps its own random state between rounds, so it runs as it would in its own process.
+    """
+    def __init__(self, index: int, configuration: Dict[str, Any], options: Dict[str, Any], problem: str, parallel: bool):
+        """
+        Initialize a configuration, starting its worker process if parallel.
+
+        :param index: The position of the configuration in the portfolio.
+        :param configuration: The options overridden by the configuration, as given.
+        :param options: The complete options of the configuration.
+        :param problem: The problem type.
+        :param parallel: Whether to run the configuration in its own worker process.
+        """
+        self.index = index
+        self.configuration = configuration
+        self.options = options
+        self.problem = problem
+        self.result = None
+        self.generations = 0
+        self.cpu_time = 0.0
+        self.eliminated = None
+        self._genetic_algorithm = None
+        self._random_state = None
+        self._pending = 0
+        self._process = None
+        if parallel:
+            self._connection, child = multiprocessing.Pipe()
+            self._process = multiprocessing.Process(target=_race_worker, args=(child, options, problem), daemon=True)
+            self._process.start()
+
+    @property
+    def alive(self) -> bool:
+        """
+        Whether the configuration is still racing (neither eliminated nor failed).
+        """
+        return self.eliminated is None and not (self.result and "error" in self.result)
+
+    def start_round(self, generations: int):
+        """
+        Start running `generations` more generations (in the background for worker processes).
+
+        :param generations: The number of generations of the round.
+        """
+        self._pending = generations
+        if self._process is not None:
+            self._connection.send(generations)
+
+    def finish_round(self):
+        """
+        Wait for the round to finish and record its result.
+        """
+        if self._process is not None:
+            try:
+                result, cpu_time = self._connection.recv()
+            except EOFError:
+                result, cpu_time = {"error": "The configuration's worker process died."}, 0.0
+        else:
+            try:
+                if self._random_state is not None:
+                    random.setstate(self._random_state)
+                result, self._genetic_algorithm, cpu_time = _advance(self.options, self.problem, self._pending, self._genetic_algorithm)
+                self._random_state = random.getstate()
+                self.options = {**self.options, "seed": None}
+            except Exception as error:
+                result, cpu_time = {"error": f"{type(error).__name__}: {error}"}, 0.0
+
+        self.cpu_time += cpu_time
+        if "error" in result:
+            logger.warning(f"Configuration {self.index} failed: {result['error']}")
+            self.result = {**(self.result or {}), "error": result["error"]}
+        else:
+            self.result = result
+            self.generations += self._pending
+
+    def stop(self):
+        """
+        Stop the worker process, if any.
+        """
+        if self._process is not None and self._process.is_alive():
+            try:
+                self._connection.send(None)
+            except OSError:
+                pass
+            self._process.join(timeout=1)
+            if self._process.is_alive():
+                self._process.terminate()
+
+    def statistics(self) -> Dict[str, Any]:
+        """
+        Get the statistics of the configuration, reported with the portfolio result.
+
+        :return: The configuration, its best fitness, the generations run, the generation at which it was
+        eliminated (None if it ran to the end), its CPU time and its error, if any.
+        """
+        statistics = {
+            "configuration": self.configuration,
+            "best_fitness": (self.result or {}).get("best_fitness"),
+            "generations": self.generations,
+            "eliminated": self.eliminated,
+            "cpu_time": round(self.cpu_time, 3),
+        }
+        if self.result and "error" in self.result:
+            statistics["error"] = self.result["error"]
+        return statistics
+
+def run_portfolio(options: Dict[str, Any], problem: str, generations: int) -> Dict[str, Any]:
+    """
+    Race several configurations of the genetic algorithm on the same instance.
+
+    Every configuration runs in parallel (one process each, unless "portfolio_parallel" is False, in which case
+    they run in turn in the calling process), in rounds of `race_interval` generations. After
+    each round, the configurations whose best fitness trails the leader's by more than `race_tolerance`
+    (relative) are stopped, so the remaining CPU budget goes to the promising ones.
+
+    :param options: The genetic algorithm options, with "portfolio": a list of configurations, each one a dict
+    of options overriding the others (e.g. {"population_size": 200, "selection": "tournament"}). Optional
+    "race_interval" (default 10) and "race_tolerance" (default 0.05) tune the race, and "portfolio_parallel"
+    (default True) whether the configurations get their own processes.
+    :param problem: The problem type.
+    :param generations: The number of generations of each configuration.
+    :return: The result of the best configuration, with "configuration" (its index) and "portfolio" (the
+    statistics of every configuration).
+    """
+    configurations = options.get("portfolio")
+    if not configurations or not isinstance(configurations, list) or not all(isinstance(c, dict) for c in configurations):
+        raise ValueError("Portfolio must be a non-empty list of option dictionaries.")
+    interval = int(options.get("race_interval", 10))
+    tolerance = float(options.get("race_tolerance", 0.05))
+    if interval <= 0:
+        raise ValueError("Race interval must be a positive integer.")
+    if tolerance < 0:
+        raise ValueError("Race tolerance must be non-negative.")
+
+    base = {key: value for key, value in options.items() if key not in PORTFOLIO_OPTIONS}
+    seed = base.get("seed")
+    # Callers that already run in a worker pool (e.g. batch workers) race in turn, to stay within the pool size;
+    # daemonic processes cannot start children at all
+    parallel = (
+        len(configurations) > 1
+        and bool(options.get("portfolio_parallel", True))
+        and not multiprocessing.current_process().daemon
+    )
+    logger.info(f"Racing {len(configurations)} configurations for {generations} generations ({'in parallel' if parallel else 'in turn'}).")
+
+    racers = []
+    for index, configuration in enumerate(configurations):
+        overrides = {key: value for key, value in configuration.items() if key not in PORTFOLIO_OPTIONS + ("fitness_function",)}
+        racer_options = {**base, **overrides}
+        # Distinct seeds, so identical configurations do not repeat the same run
+        if seed is not None and "seed" not in overrides:
+            racer_options["seed"] = seed + index
+        racers.append(_Racer(index, overrides, racer_options, problem, parallel))
+
+    try:
+        for start in range(0, max(int(generations), 1), interval):
+            round_generations = min(interval, int(generations) - start) if generations > 0 else 0
+            alive = [racer for racer in racers if racer.alive]
+            for racer in alive:
+                racer.start_round(round_generations)
+            for racer in alive:
+                racer.finish_round()
+
+            # Eliminate the configurations clearly behind the leader, unless this was the last round
+            alive = [racer for racer in alive if racer.alive]
+            if not alive or start + interval >= generations:
+                continue
+            leader = max(racer.result["best_fitness"] for racer in alive)
+            for racer in alive:
+                fitness = racer.result["best_fitness"]
+                losing = fitness < leader if math.isinf(leader) else leader - fitness > tolerance * abs(leader)
+                if losing:
+                    racer.eliminated = racer.generations
+                    racer.stop()
+                    logger.info(f"Eliminated configuration {racer.index} at generation {racer.generations} (best fitness {racer.result['best_fitness']}, leader {leader}).")
+    finally:
+        for racer in racers:
+            racer.stop()
+
+    finished = [racer for racer in racers if racer.result and "error" not in racer.result]
+    if not finished:
+        raise ValueError(f"Every configuration failed: {racers[0].result.get('error') if racers[0].result else 'no result'}")
+
+    winner = max(finished, key=lambda racer: racer.result["best_fitness"])
+    result = dict(winner.result)
+    result["configuration"] = winner.index
+    result["portfolio"] = [racer.statistics() for racer in racers]
+    logger.info(f"Configuration {winner.index} won the race with best fitness {result['best_fitness']}.")
+    return result
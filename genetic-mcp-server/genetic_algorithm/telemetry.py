@@ -0,0 +1,167 @@
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from array import array
+import json
+import math
+import random
+import time
+
+from genetic_algorithm.logger import logger_config
+
+if TYPE_CHECKING:
+    from genetic_algorithm.gen_alg import GeneticAlgorithm
+
+logger = logger_config(process_name="telemetry", pretty=True)
+
+class Telemetry:
+    """
+    Per-generation telemetry of a genetic algorithm run: one structured record per generation, instead of
+    log lines for every chromosome, crossover and mutation.
+
+    Each record holds the fitness statistics of the evaluated population, its diversity, the current rates
+    and the operator counters since the previous record (i.e. of the breeding that produced the population).
+    Records are logged at INFO level (every `interval` generations) and, with a `file`, appended to it as
+    JSON lines along with a small sample of chromosomes.
+    """
+    def __init__(self, file: Optional[str] = None, interval: Optional[int] = 1, sample_size: Optional[int] = 3):
+        """
+        Initialize the telemetry.
+
+        :param file (optional): Path of a JSONL file receiving every record. Default is None (logs only).
+        :param interval (optional): Number of generations between two logged (and written) records. Default is 1.
+        :param sample_size (optional): Number of chromosomes (the best one, then random ones) sampled in the
+        records written to the file. Default is 3.
+        """
+        if interval is None or interval <= 0:
+            raise ValueError("Telemetry interval must be a positive integer.")
+        if sample_size is None or sample_size < 0:
+            raise ValueError("Telemetry sample size must be a non-negative integer.")
+
+        self.file = file
+        self.interval = int(interval)
+        self.sample_size = int(sample_size)
+        self.start = time.perf_counter()
+        self._sink = None
+
+    def record(self, genetic_algorithm: "GeneticAlgorithm") -> Dict[str, Any]:
+        """
+        Build the record of the current generation, from the evaluated population, then log and write it
+        if the generation is due.
+
+        :param genetic_algorithm: The genetic algorithm.
+        :return: The record.
+        """
+        chromosomes = genetic_algorithm.population.chromosomes
+        fitnesses = [chromosome.fitness for chromosome in chromosomes]
+        record = {
+            "generation": genetic_algorithm.generation,
+            "elapsed": round(time.perf_counter() - self.start, 6),
+            "best_fitness": max(fitnesses, default=None),
+            "mean_fitness": sum(fitnesses) / len(fitnesses) if fitnesses else None,
+            "worst_fitness": min(fitnesses, default=None),
+            "diversity": genetic_algorithm.diversity,
+            "mutation_rate": genetic_algorithm.mutation_rate,
+            "crossover_rate": genetic_algorithm.crossover_rate,
+            **genetic_algorithm.counters,
+        }
+        if genetic_algorithm.constraint_handling != "rejection":
+            record["penalty_weight"] = genetic_algorithm.penalty_weight
+            record["feasible"] = sum(1 for chromosome in chromosomes if not chromosome.violation) / len(chromosomes) if chromosomes else None
+
+        if genetic_algorithm.generation % self.interval == 0:
+            logger.info("Generation summary", **record)
+            if self.file:
+                self._write({**record, "sample": self._sample(genetic_algorithm)})
+
+        return record
+
+    def _sample(self, genetic_algorithm: "GeneticAlgorithm") -> list:
+        """
+        Sample chromosomes of the population: the best one, then random ones.
+
+        :param genetic_algorithm: The genetic algorithm.
+        :return: The gene values and fitness of the sampled chromosomes.
+        """
+        chromosomes = genetic_algorithm.population.chromosomes
+        if not chromosomes or self.sample_size == 0:
+            return []
+
+        best = max(chromosomes, key=lambda c: c.fitness)
+        others = [chromosome for chromosome in chromosomes if chromosome is not best]
+        sample = [best] + random.Random(genetic_algorithm.generation).sample(others, min(self.sample_size - 1, len(others)))
+        return [{"values": list(chromosome.values), "fitness": chromosome.fitness} for chromosome in sample]
+
+    def _write(self, record: Dict[str, Any]):
+        """
+        Append a record to the JSONL file, opening it on first use.
+
+        :param record: The record.
+        """
+        if self._sink is None:
+            self._sink = open(self.file, "a")
+        self._sink.write(json.dumps(record, default=str) + "\n")
+        self._sink.flush()
+
+    def close(self):
+        """
+        Close the JSONL file, if open. Later records open it again.
+        """
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
+
+class History:
+    """
+    A compact history of a run: the generation number and float arrays of the best, mean and worst fitness,
+    the diversity and the elapsed time of every generation, taken from the telemetry records.
+    """
+    SERIES = ("best_fitness", "mean_fitness", "worst_fitness", "diversity", "elapsed")
+
+    def __init__(self):
+        """
+        Initialize an empty history.
+        """
+        self.generations = array("i")
+        self.series = {name: array("d") for name in self.SERIES}
+
+    def __len__(self) -> int:
+        return len(self.generations)
+
+    def append(self, record: Dict[str, Any]):
+        """
+        Add the record of a generation. Missing values are stored as NaN.
+
+        :param record: The telemetry record.
+        """
+        self.generations.append(record["generation"])
+        for name, values in self.series.items():
+            value = record.get(name)
+            values.append(float("nan") if value is None else value)
+
+    def summary(self, max_points: Optional[int] = None) -> Dict[str, List[Optional[float]]]:
+        """
+        Get the history as lists, downsampled to at most `max_points` points for long runs. Each point then
+        summarizes a block of consecutive generations: the best of the best fitness, the mean of the mean
+        fitness and diversity, the worst of the worst fitness, and the generation and elapsed time at its end.
+
+        :param max_points (optional): Maximum number of points. Default is None (every generation).
+        :return: "generation" and the series, as lists of the same length (NaN becomes None).
+        """
+        if max_points is not None and max_points <= 0:
+            raise ValueError("History points must be a positive integer.")
+
+        size = len(self.generations)
+        block = math.ceil(size / max_points) if max_points and size > max_points else 1
+        reducers = {
+            "best_fitness": max,
+            "mean_fitness": lambda values: math.fsum(values) / len(values),
+            "worst_fitness": min,
+            "diversity": lambda values: math.fsum(values) / len(values),
+            "elapsed": lambda values: values[-1],
+        }
+
+        summary = {"generation": [self.generations[min(start + block, size) - 1] for start in range(0, size, block)]}
+        for name, values in self.series.items():
+            points = [reducers[name](values[start:start + block]) if block > 1 else values[start] for start in range(0, size, block)]
+            summary[name] = [None if math.isnan(value) else value for value in points]
+
+        return summary
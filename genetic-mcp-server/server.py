@@ -1,22 +1,153 @@
-from mcp.server.fastmcp import FastMCP
-from typing import Any, Dict
+from mcp.server.fastmcp import Context, FastMCP
+from typing import Any, Callable, Dict, List, Tuple
+import inspect
 
-import sys
-sys.path.append("genetic_algorithm")
-from genetic_algorithm.main import main as genetic_algorithm_main
+from cache import InstanceCache, ResultCache
+from batch import run_batch
 
 # Create a server
 mcp = FastMCP("genetic-mcp-server")
 
+# Validated instances and completed results, shared by every solve request
+instances = InstanceCache()
+results = ResultCache()
+
+# Genetic algorithm options of every solve tool and of solve_batch problems: name -> (type, default).
+# Batch problems get the same defaults as the tools, so they share their cached results.
+GA_OPTIONS: Dict[str, Tuple[Any, Any]] = {
+    "population_size": (int, 1000),
+    "chromosome_size": (int, 10),
+    "replacement": (str, "generational"),
+    "elite_size": (int, 1),
+    "mutation_rate": (float, 0.05),
+    "crossover_rate": (float, 0.8),
+    "adaptation": (str, "fixed"),
+    "diversity_measure": (str, None),
+    "diversity_bounds": (List[float], [0.1, 0.4]),
+    "seed_fraction": (float, 0.0),
+    "seed": (int, None),
+    "initial_population": (List[List[Any]], None),
+    "objectives": (List[str], None),
+    "constraint_handling": (str, "rejection"),
+    "penalty_weight": (float, 1.0),
+    "selection": (str, "roulette"),
+    "crossover": (str, "two_point"),
+    "mutation": (str, "random_reset"),
+    "portfolio": (List[Dict[str, Any]], None),
+    "race_interval": (int, 10),
+    "race_tolerance": (float, 0.05),
+    "history": (bool, False),
+    "history_points": (int, None),
+    "backend": (str, None),
+}
+
+# Parameters of every solve tool besides the genetic algorithm options: name -> (type, default)
+SOLVE_PARAMETERS: Dict[str, Tuple[Any, Any]] = {
+    "generations": (int, 100),
+    "fitness_function": (Dict[str, Any], None),
+    "instance_id": (str, None),
+    "warm_start": (bool, False),
+}
+
+def ga_options(fitness_function: Any, values: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the genetic algorithm options of a solve request, with the defaults of the options not given.
+
+    :param fitness_function: The fitness function of the instance.
+    :param values: The parameters of the request; those that are not genetic algorithm options are ignored.
+    :return: The options.
+    """
+    options = {key: values.get(key, default) for key, (_, default) in GA_OPTIONS.items()}
+    if not isinstance(options["population_size"], int) or options["population_size"] <= 0:
+        raise ValueError("Population size must be a positive integer.")
+    if not isinstance(options["chromosome_size"], int) or options["chromosome_size"] <= 0:
+        raise ValueError("Chromosome size must be a positive integer.")
+
+    options["fitness_function"] = fitness_function
+    return options
+
+def solve_request(
+        problem: str,
+        generations: int = 100,
+        fitness_function: Dict[str, Any] = None,
+        instance_id: str = None,
+        warm_start: bool = False,
+        **values
+) -> Dict[str, Any]:
+    """
+    Solve a problem, or get its result from the cache.
+
+    :param problem: The problem type.
+    :param generations (optional): The number of generations. Default is 100.
+    :param fitness_function (optional): The fitness function parameters, if sent inline.
+    :param instance_id (optional): The ID returned by `upload_instance`, used instead of `fitness_function`.
+    :param warm_start (optional): Whether to continue a cached run with fewer generations. Default is False.
+    :param values: The genetic algorithm options (see GA_OPTIONS).
+    :return: The result.
+    """
+    instance_id, fitness_function = instances.resolve(problem, fitness_function, instance_id)
+    options = ga_options(fitness_function, values)
+    return results.solve(problem, instance_id, options, generations, warm_start=warm_start)
+
+def solve_tool(description: str) -> Callable:
+    """
+    Register a solve tool whose parameters are SOLVE_PARAMETERS and GA_OPTIONS, with their types and defaults.
+    The decorated function receives them as keyword arguments.
+
+    :param description: The description of the tool.
+    :return: The decorator.
+    """
+    def register(function: Callable) -> Callable:
+        function.__signature__ = inspect.Signature(
+            [
+                inspect.Parameter(name, inspect.Parameter.KEYWORD_ONLY, annotation=annotation, default=default)
+                for name, (annotation, default) in {**SOLVE_PARAMETERS, **GA_OPTIONS}.items()
+            ],
+            return_annotation=Dict[str, Any],
+        )
+        return mcp.tool(description=description)(function)
+    return register
+
 # ------- Adding tools -------
-# Tool: knapsack problem
-@mcp.tool(description="Solve a knapsack problem using a genetic algorithm.")
-async def knapsack_problem(
-    population_size: int = 1000,
-    chromosome_size: int = 10,
-    generations: int = 100,
-    fitness_function: Dict[str, Any] = None,
+# Tool: upload instance
+@mcp.tool(description="Validate a problem instance once and get an ID to solve it repeatedly.")
+async def upload_instance(
+    problem: str,
+    fitness_function: Dict[str, Any],
 ) -> Dict[str, Any]:
+    """
+    Validates a problem instance and keeps it in memory, so it can be solved many times (e.g. with
+    different genetic algorithm settings) without sending and parsing it again.
+
+    Parameters:
+        problem (str): "knapsack", "traveling_salesman" or "vehicle_routing".
+        fitness_function (dict): The problem parameters, as accepted by the matching solve tool.
+
+    Returns:
+        instance_id (str): Pass it as `instance_id` to the solve tool instead of `fitness_function`.
+        Identical instances get the same ID. Rarely used instances may be evicted; solving an evicted
+        instance fails and the instance must be uploaded again.
+
+    Example:
+        upload_instance(
+            problem="knapsack",
+            fitness_function={
+                "capacity": [5, 4, 3, 2, 1],
+                "weight": [2, 3, 4, 5, 7],
+                "value": [40, 50, 60, 80, 100],
+                "max_weight": 50
+            }
+        )
+    """
+    if not fitness_function or not isinstance(fitness_function, dict):
+        raise ValueError("Fitness function parameters must be provided.")
+
+    instance_id = instances.add(problem, fitness_function)
+    return {"instance_id": instance_id, "problem": problem}
+
+# Tool: knapsack problem
+@solve_tool(description="Solve a knapsack problem using a genetic algorithm.")
+async def knapsack_problem(**parameters) -> Dict[str, Any]:
     """
     A tool to solve the knapsack problem using a genetic algorithm.
 
@@ -24,9 +155,50 @@ async def knapsack_problem(
         population_size (int): Number of individuals in the population.
       chromosome_size (int): Number of genes in each chromosome.
         generations (int): Number of generations to run.
+        replacement (str): Replacement strategy: "generational", "elitism", "steady_state" or "mu_plus_lambda".
+        elite_size (int): Number of best individuals kept untouched with the "elitism" strategy.
+        mutation_rate (float): Initial probability of mutating each gene.
+        crossover_rate (float): Initial probability of crossing over each pair of parents.
+        adaptation (str): Rate control: "fixed", "diversity" (rates follow the population diversity) or "self_adaptive" (per-individual rates).
+        diversity_measure (str): Population diversity measure, "hamming" or "edge_entropy" (default "hamming").
+        diversity_bounds (list of 2 floats): [low, high] diversity window of the "diversity" adaptation: below it the mutation
+            rate is raised and the crossover rate lowered, above it the opposite (default [0.1, 0.4]).
+        seed_fraction (float): Fraction of the initial population built with greedy heuristics instead of at random.
+        instance_id (str): ID returned by upload_instance, used instead of fitness_function.
+        seed (int): Random seed, for reproducible runs. Identical requests (same instance, settings and seed) return
+            the cached result, marked with "cached": true; change the seed to get a new run. Runs without a seed are
+            never cached.
+        warm_start (bool): Continue a cached run of the same request with fewer generations instead of starting over
+            (seeded runs only). The continued result is cached apart and only returned to warm_start requests.
+        initial_population (list of lists): Chromosomes to start from, e.g. [best_chromosome] of a previous call. They are
+            adapted if the instance changed (e.g. new items or cities), and the rest of the population is generated as usual.
+        objectives (list of strings): Two or more objectives to optimize at once with NSGA-II: "value" (maximized) and "weight" (minimized).
+            The result then includes the Pareto front ("pareto_front"), each entry with its chromosome and objective values.
+        constraint_handling (str): How infeasible solutions (exceeding max_weight) are handled: "rejection" (discarded), "static_penalty"
+            (kept with a fitness divided by 1 + penalty_weight * violation) or "adaptive_penalty" (the weight grows while the
+            best solution is infeasible and shrinks once it is feasible). The result reports "constraint_violation" of the best.
+        penalty_weight (float): The (initial) penalty weight of the penalty strategies.
+        selection (str): Parent selection operator: "roulette", "tournament", "rank" or "sus" (stochastic universal sampling).
+        crossover (str): Crossover operator: "two_point" or "uniform".
+        mutation (str): Mutation operator: "random_reset" (each gene is redrawn with the mutation rate).
+        portfolio (list of dicts): Several configurations to race on the instance instead of a single run, each one overriding
+            some of the parameters above, e.g. [{"population_size": 200}, {"selection": "tournament", "mutation_rate": 0.1}].
+            They run in parallel, and every race_interval generations those whose best fitness trails the leader's by more
+            than race_tolerance (relative) are stopped. The best result is returned with "configuration" (its index) and
+            "portfolio" (best fitness, generations, elimination and CPU time of every configuration).
+        race_interval (int): Generations between two eliminations of a portfolio race.
+        race_tolerance (float): Relative fitness gap to the leader above which a configuration is eliminated.
+        history (bool): Return the history of the run ("history"): the generation and the best, mean and worst fitness,
+            diversity and elapsed seconds of each generation, as lists.
+        history_points (int): Maximum number of history points; longer runs are summarized over blocks of generations.
+        backend (str): "python", "numba" (compiled kernels for the hot loops, when Numba is installed) or "auto"
+            (Numba for chromosomes of 200 genes or more, or GA_NUMBA_MIN_SIZE). Defaults to the GA_BACKEND
+            environment variable, or "auto".
         fitness_function (dict): Knapsack problem parameters:
-            - cities (list of strings): Name of each city.
-            - distance_matrix (list of lists (matrix) of numbers): Distance between all the cities.
+            - capacity (list of numbers): Capacity of each item.
+            - weight (list of numbers): Weight of each item.
+            - value (list of numbers): Value of each item.
+            - max_weight (number): Maximum total weight allowed.
 
     Example:
         knapsack_problem(
@@ -42,46 +214,70 @@ async def knapsack_problem(
         )
 
     """
-    if not isinstance(population_size, int) or population_size <= 0:
-        raise ValueError("Population size must be a positive integer.")
-    if not isinstance(chromosome_size, int) or chromosome_size <= 0:
-        raise ValueError("Chromosome size must be a positive integer.")
-    if not fitness_function or not isinstance(fitness_function, dict):
-        raise ValueError("Fitness function parameters must be provided.")
-    
-    options = {
-        "population_size": population_size,
-        "chromosome_size": chromosome_size,
-        "fitness_function": fitness_function,  # Mandatory field for fitness function parameters
-    }
-    
-    # Run the genetic algorithm for the knapsack problem
-    result = genetic_algorithm_main(options=options, problem="knapsack", generations=generations)
-    return result
+    return solve_request("knapsack", **parameters)
 
 # Tool: traveling salesman problem
-@mcp.tool(description="Solve a traveling salesman problem using a genetic algorithm.")
-async def traveling_salesman_problem(
-    population_size: int = 1000,
-    chromosome_size: int = 10,
-    generations: int = 100,
-    fitness_function: Dict[str, Any] = None,
-) -> Dict[str, Any]:
+@solve_tool(description="Solve a traveling salesman problem using a genetic algorithm.")
+async def traveling_salesman_problem(**parameters) -> Dict[str, Any]:
     """
     Solves the traveling salesman problem using a genetic algorithm.
+    Large instances can send city coordinates instead of a full distance matrix.
 
     Parameters:
         population_size (int): Number of individuals in the population.
         chromosome_size (int): Number of genes in each chromosome.
         generations (int): Number of generations to run.
-        fitness_function (dict): Knapsack problem parameters:
-            - capacity (list of numbers): Capacity of each item.
-            - weight (list of numbers): Weight of each item.
-            - value (list of numbers): Value of each item.
-            - max_weight (number): Maximum total weight allowed.
+        replacement (str): Replacement strategy: "generational", "elitism", "steady_state" or "mu_plus_lambda".
+        elite_size (int): Number of best individuals kept untouched with the "elitism" strategy.
+        mutation_rate (float): Initial probability of mutating each gene.
+        crossover_rate (float): Initial probability of crossing over each pair of parents.
+        adaptation (str): Rate control: "fixed", "diversity" (rates follow the population diversity) or "self_adaptive" (per-individual rates).
+        diversity_measure (str): Population diversity measure, "hamming" or "edge_entropy" (default "edge_entropy").
+        diversity_bounds (list of 2 floats): [low, high] diversity window of the "diversity" adaptation: below it the mutation
+            rate is raised and the crossover rate lowered, above it the opposite (default [0.1, 0.4]).
+        seed_fraction (float): Fraction of the initial population built with greedy heuristics instead of at random.
+        instance_id (str): ID returned by upload_instance, used instead of fitness_function.
+        seed (int): Random seed, for reproducible runs. Identical requests (same instance, settings and seed) return
+            the cached result, marked with "cached": true; change the seed to get a new run. Runs without a seed are
+            never cached.
+        warm_start (bool): Continue a cached run of the same request with fewer generations instead of starting over
+            (seeded runs only). The continued result is cached apart and only returned to warm_start requests.
+        initial_population (list of lists): Chromosomes to start from, e.g. [best_chromosome] of a previous call. They are
+            adapted if the instance changed (e.g. new items or cities), and the rest of the population is generated as usual.
+        objectives (list of strings): Two or more objectives to optimize at once with NSGA-II: "distance" and "longest_edge" (both minimized).
+            The result then includes the Pareto front ("pareto_front"), each entry with its chromosome and objective values.
+        constraint_handling (str): "rejection", "static_penalty" or "adaptive_penalty", as in knapsack_problem. Tours are
+            always kept as permutations, whatever the strategy.
+        penalty_weight (float): The (initial) penalty weight of the penalty strategies.
+        selection (str): Parent selection operator: "roulette", "tournament", "rank" or "sus" (stochastic universal sampling).
+        crossover (str): Crossover operator: "two_point", "uniform", "ox" (order crossover) or "pmx" (partially mapped crossover).
+            "ox" and "pmx" always produce valid tours.
+        mutation (str): Mutation operator: "random_reset", "swap" (swaps pairs of genes) or "inversion" (reverses a segment).
+        portfolio (list of dicts): Several configurations to race on the instance instead of a single run, each one overriding
+            some of the parameters above, e.g. [{"population_size": 200}, {"selection": "tournament", "mutation_rate": 0.1}].
+            They run in parallel, and every race_interval generations those whose best fitness trails the leader's by more
+            than race_tolerance (relative) are stopped. The best result is returned with "configuration" (its index) and
+            "portfolio" (best fitness, generations, elimination and CPU time of every configuration).
+        race_interval (int): Generations between two eliminations of a portfolio race.
+        race_tolerance (float): Relative fitness gap to the leader above which a configuration is eliminated.
+        history (bool): Return the history of the run ("history"): the generation and the best, mean and worst fitness,
+            diversity and elapsed seconds of each generation, as lists.
+        history_points (int): Maximum number of history points; longer runs are summarized over blocks of generations.
+        backend (str): "python", "numba" (compiled kernels for the hot loops, when Numba is installed) or "auto"
+            (Numba for chromosomes of 200 genes or more, or GA_NUMBA_MIN_SIZE). Defaults to the GA_BACKEND
+            environment variable, or "auto".
+        fitness_function (dict): Traveling salesman problem parameters:
+            - cities (list of strings): Name of each city.
+            - distance_matrix (list of lists (matrix) of numbers): Distance between all the cities.
+            - coordinates (list of [x, y] pairs): Alternative to distance_matrix, distances are computed on demand.
+            - metric (str): Metric used with coordinates: "euclidean", "manhattan" or "haversine".
+            - cache_size (int): Number of distance rows kept in memory with coordinates.
+            - instance_file (str): Path to a .npz file whose arrays are used as fields (e.g. "distance_matrix").
+              Any field may also be {"file": "path.npy"} or {"file": "path.npz", "key": "array_name"};
+              matrices are memory-mapped instead of being sent inline.
 
     Example:
-        knapsack_problem(
+        traveling_salesman_problem(
             population_size=100,
             chromosome_size=5,
             generations=75,
@@ -96,23 +292,170 @@ async def traveling_salesman_problem(
                 ]
             }
         )
+
+        With coordinates, distances are computed on demand ("euclidean", "manhattan" or "haversine" for
+        [latitude, longitude] in degrees), and "cities" defaults to the indices of the coordinates:
+        fitness_function={
+            "coordinates": [[-12.97, -38.50], [-12.26, -38.96], [-11.81, -39.39]],
+            "metric": "haversine"
+        }
     """
-    if not isinstance(population_size, int) or population_size <= 0:
-        raise ValueError("Population size must be a positive integer.")
-    if not isinstance(chromosome_size, int) or chromosome_size <= 0:
-        raise ValueError("Chromosome size must be a positive integer.")
-    if not fitness_function or not isinstance(fitness_function, dict):
-        raise ValueError("Fitness function parameters must be provided.")
-    
-    options = {
-        "population_size": population_size,
-        "chromosome_size": chromosome_size,
-        "fitness_function": fitness_function,  # Mandatory field for fitness function parameters
-    }
-    
-    # Run the genetic algorithm for the traveling salesman problem
-    result = genetic_algorithm_main(options=options, problem="traveling_salesman", generations=generations)
-    return result
+    return solve_request("traveling_salesman", **parameters)
+
+# Tool: vehicle routing problem
+@solve_tool(description="Solve a capacitated vehicle routing problem using a genetic algorithm.")
+async def vehicle_routing_problem(**parameters) -> Dict[str, Any]:
+    """
+    Solves the capacitated vehicle routing problem using a genetic algorithm.
+    Each individual is a giant tour over all the clients, split into capacity-feasible routes.
+
+    Parameters:
+        population_size (int): Number of individuals in the population.
+        chromosome_size (int): Number of clients (every location except the depot).
+        generations (int): Number of generations to run.
+        replacement (str): Replacement strategy: "generational", "elitism", "steady_state" or "mu_plus_lambda".
+        elite_size (int): Number of best individuals kept untouched with the "elitism" strategy.
+        mutation_rate (float): Initial probability of mutating each gene.
+        crossover_rate (float): Initial probability of crossing over each pair of parents.
+        adaptation (str): Rate control: "fixed", "diversity" (rates follow the population diversity) or "self_adaptive" (per-individual rates).
+        diversity_measure (str): Population diversity measure, "hamming" or "edge_entropy" (default "edge_entropy").
+        diversity_bounds (list of 2 floats): [low, high] diversity window of the "diversity" adaptation: below it the mutation
+            rate is raised and the crossover rate lowered, above it the opposite (default [0.1, 0.4]).
+        seed_fraction (float): Fraction of the initial population built with greedy heuristics instead of at random.
+        instance_id (str): ID returned by upload_instance, used instead of fitness_function.
+        seed (int): Random seed, for reproducible runs. Identical requests (same instance, settings and seed) return
+            the cached result, marked with "cached": true; change the seed to get a new run. Runs without a seed are
+            never cached.
+        warm_start (bool): Continue a cached run of the same request with fewer generations instead of starting over
+            (seeded runs only). The continued result is cached apart and only returned to warm_start requests.
+        initial_population (list of lists): Chromosomes to start from, e.g. [best_chromosome] of a previous call. They are
+            adapted if the instance changed (e.g. new items or cities), and the rest of the population is generated as usual.
+        objectives (list of strings): Two or more objectives to optimize at once with NSGA-II: "distance" and "vehicles" (both minimized).
+            The result then includes the Pareto front ("pareto_front"), each entry with its chromosome and objective values.
+        constraint_handling (str): "rejection", "static_penalty" or "adaptive_penalty", as in knapsack_problem. Tours are
+            always kept as permutations, whatever the strategy.
+        penalty_weight (float): The (initial) penalty weight of the penalty strategies.
+        selection (str): Parent selection operator: "roulette", "tournament", "rank" or "sus" (stochastic universal sampling).
+        crossover (str): Crossover operator: "two_point", "uniform", "ox" (order crossover) or "pmx" (partially mapped crossover).
+            "ox" and "pmx" always produce valid tours.
+        mutation (str): Mutation operator: "random_reset", "swap" (swaps pairs of genes) or "inversion" (reverses a segment).
+        portfolio (list of dicts): Several configurations to race on the instance instead of a single run, each one overriding
+            some of the parameters above, e.g. [{"population_size": 200}, {"selection": "tournament", "mutation_rate": 0.1}].
+            They run in parallel, and every race_interval generations those whose best fitness trails the leader's by more
+            than race_tolerance (relative) are stopped. The best result is returned with "configuration" (its index) and
+            "portfolio" (best fitness, generations, elimination and CPU time of every configuration).
+        race_interval (int): Generations between two eliminations of a portfolio race.
+        race_tolerance (float): Relative fitness gap to the leader above which a configuration is eliminated.
+        history (bool): Return the history of the run ("history"): the generation and the best, mean and worst fitness,
+            diversity and elapsed seconds of each generation, as lists.
+        history_points (int): Maximum number of history points; longer runs are summarized over blocks of generations.
+        backend (str): "python", "numba" (compiled kernels for the hot loops, when Numba is installed) or "auto"
+            (Numba for chromosomes of 200 genes or more, or GA_NUMBA_MIN_SIZE). Defaults to the GA_BACKEND
+            environment variable, or "auto".
+        fitness_function (dict): Vehicle routing problem parameters:
+            - depot (int): Index of the depot location.
+            - client_demands (list of numbers): Demand of each location (the depot's demand is ignored).
+            - vehicle_capacity (number or list of numbers): Capacity of the vehicles. A list limits the fleet to one vehicle per entry.
+            - distance_matrix (list of lists (matrix) of numbers): Distance between all the locations.
+            - instance_file (str): Path to a .npz file whose arrays are used as fields. Any field may also be
+              {"file": "path.npy"} or {"file": "path.npz", "key": "array_name"}; matrices are memory-mapped.
+
+    Example:
+        vehicle_routing_problem(
+            population_size=100,
+            chromosome_size=4,
+            generations=75,
+            fitness_function={
+                "depot": 0,
+                "client_demands": [0, 4, 3, 5, 2],
+                "vehicle_capacity": 8,
+                "distance_matrix": [
+                    [0, 10, 20, 30, 40],
+                    [10, 0, 20, 30, 40],
+                    [20, 20, 0, 30, 40],
+                    [30, 30, 30, 0, 40],
+                    [40, 40, 40, 40, 0]
+                ]
+            }
+        )
+    """
+    return solve_request("vehicle_routing", **parameters)
+
+# Tool: batch of problems
+PROBLEMS = ("knapsack", "traveling_salesman", "vehicle_routing")
+
+
+@mcp.tool(description="Solve many knapsack, traveling salesman or vehicle routing problems in one call, in parallel.")
+async def solve_batch(
+    problems: List[Dict[str, Any]],
+    max_workers: int = None,
+    ctx: Context = None,
+) -> List[Dict[str, Any]]:
+    """
+    Solves a list of problems on a pool of worker processes and returns their results in the same order.
+    Small problems are packed together so each worker task runs several of them. Progress is reported
+    as problems finish.
+
+    Parameters:
+        problems (list of dicts): The problems. Each one has:
+            - problem (str): "knapsack", "traveling_salesman" or "vehicle_routing".
+            - generations (int): Number of generations to run (default 100).
+            - fitness_function (dict) or instance_id (str): The instance, as in the matching solve tool.
+            - Any other parameter of the matching solve tool (population_size, chromosome_size, replacement,
+              elite_size, mutation_rate, crossover_rate, adaptation, diversity_measure, diversity_bounds, seed_fraction,
+              seed, initial_population, objectives, constraint_handling, penalty_weight, selection, crossover, mutation,
+              portfolio, race_interval, race_tolerance, history, history_points, backend).
+        max_workers (int): Maximum number of worker processes used by this batch. Portfolio problems race their
+            configurations in turn inside their worker, so the batch never uses more processes.
+
+    Returns:
+        A list with the result of each problem. A problem that fails gets {"error": "..."} instead of failing
+        the whole batch. Results already cached are returned with "cached": true without being solved again.
+
+    Example:
+        solve_batch(problems=[
+            {"problem": "knapsack", "chromosome_size": 3, "generations": 50, "fitness_function": {
+                "capacity": [2, 2, 2], "weight": [1, 2, 3], "value": [10, 15, 40], "max_weight": 6}},
+            {"problem": "traveling_salesman", "chromosome_size": 3, "population_size": 6, "instance_id": "..."}
+        ])
+    """
+    if not problems or not isinstance(problems, list):
+        raise ValueError("Problems must be a non-empty list.")
+
+    outputs = [None] * len(problems)
+    instance_ids = {}
+    jobs = []
+    for index, request in enumerate(problems):
+        try:
+            problem = request.get("problem")
+            if problem not in PROBLEMS:
+                raise ValueError(f"Unknown problem type: {problem}. Must be one of {', '.join(PROBLEMS)}.")
+
+            instance_id, fitness_function = instances.resolve(problem, request.get("fitness_function"), request.get("instance_id"))
+            options = ga_options(fitness_function, request)
+            generations = int(request.get("generations", SOLVE_PARAMETERS["generations"][1]))
+        except Exception as error:
+            outputs[index] = {"error": f"{type(error).__name__}: {error}"}
+            continue
+
+        outputs[index] = results.get(problem, instance_id, options, generations)
+        if outputs[index] is None:
+            instance_ids[index] = instance_id
+            jobs.append((index, problem, options, generations))
+
+    async def report_progress(finished: int):
+        if ctx is not None:
+            await ctx.report_progress(len(problems) - len(jobs) + finished, len(problems))
+
+    if jobs:
+        finished = await run_batch(jobs, max_workers=max_workers, progress=report_progress)
+        for index, problem, options, generations in jobs:
+            result = finished[index]
+            if "error" not in result:
+                result = results.put(problem, instance_ids[index], options, generations, result)
+            outputs[index] = result
+
+    return outputs
 
 # Add a dynamic greeting resource
 @mcp.resource("/greeting://{name}")
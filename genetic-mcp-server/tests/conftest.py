@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Logging is configured on first import; keep the test runs quiet
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,103 @@
+import pytest
+
+from cache import InstanceCache, ResultCache
+
+FIELDS = {
+    "capacity": [1, 2, 1, 3, 1, 2],
+    "weight": [12, 7, 11, 8, 9, 5],
+    "value": [24, 13, 23, 15, 16, 9],
+    "max_weight": 40,
+}
+
+@pytest.fixture
+def instance():
+    instances = InstanceCache()
+    return instances.resolve("knapsack", FIELDS, None)
+
+def options_for(fitness_function, **overrides):
+    options = {"population_size": 20, "chromosome_size": 6, "fitness_function": fitness_function, "seed": 3}
+    return {**options, **overrides}
+
+def test_identical_seeded_requests_hit_the_cache(instance):
+    instance_id, fitness_function = instance
+    results = ResultCache()
+    options = options_for(fitness_function)
+
+    first = results.solve("knapsack", instance_id, options, 5)
+    second = results.solve("knapsack", instance_id, options, 5)
+
+    assert first["cached"] is False
+    assert second["cached"] is True
+    assert {**second, "cached": False} == first
+
+def test_key_depends_on_options_and_generations(instance):
+    instance_id, fitness_function = instance
+    results = ResultCache()
+    results.solve("knapsack", instance_id, options_for(fitness_function), 5)
+
+    assert results.get("knapsack", instance_id, options_for(fitness_function), 5) is not None
+    assert results.get("knapsack", instance_id, options_for(fitness_function), 6) is None
+    assert results.get("knapsack", instance_id, options_for(fitness_function, seed=4), 5) is None
+    assert results.get("knapsack", instance_id, options_for(fitness_function, mutation_rate=0.5), 5) is None
+    assert ResultCache.run_key("knapsack", instance_id, options_for(fitness_function)) \
+        != ResultCache.run_key("knapsack", instance_id, options_for(fitness_function, crossover="uniform"))
+
+def test_unseeded_runs_are_not_cached(instance):
+    instance_id, fitness_function = instance
+    results = ResultCache()
+    options = options_for(fitness_function, seed=None)
+
+    assert results.solve("knapsack", instance_id, options, 5)["cached"] is False
+    assert results.solve("knapsack", instance_id, options, 5)["cached"] is False
+    assert len(results) == 0
+
+def test_warm_results_are_not_served_to_cold_requests(instance):
+    instance_id, fitness_function = instance
+    results = ResultCache()
+    options = options_for(fitness_function)
+
+    results.solve("knapsack", instance_id, options, 3)
+    warm = results.solve("knapsack", instance_id, options, 6, warm_start=True)
+    assert warm["warm_start"] == 3
+    assert results.get("knapsack", instance_id, options, 6) is None
+    assert results.get("knapsack", instance_id, options, 6, warm_start=True)["warm_start"] == 3
+
+    # A cold run gives the reproducible result, the same as on a fresh cache
+    cold = results.solve("knapsack", instance_id, options, 6)
+    assert cold["cached"] is False
+    assert "warm_start" not in cold
+    assert cold == ResultCache().solve("knapsack", instance_id, options, 6)
+
+def test_entries_expire_after_the_ttl(instance, monkeypatch):
+    instance_id, fitness_function = instance
+    results = ResultCache(ttl=10)
+    options = options_for(fitness_function)
+    now = [1000.0]
+    monkeypatch.setattr("cache.time.monotonic", lambda: now[0])
+
+    results.solve("knapsack", instance_id, options, 5)
+    now[0] += 9
+    assert results.get("knapsack", instance_id, options, 5) is not None
+    now[0] += 2
+    assert results.get("knapsack", instance_id, options, 5) is None
+    assert len(results) == 0
+    assert results.total_bytes == 0
+
+def test_negative_ttl_is_rejected():
+    with pytest.raises(ValueError):
+        ResultCache(ttl=-1)
+
+def test_backends_do_not_leak_between_runs_of_a_cached_instance(instance):
+    instance_id, fitness_function = instance
+    compiled = fitness_function.with_backend("numba")
+
+    assert compiled is not fitness_function
+    assert (compiled.backend, fitness_function.backend) == ("numba", "python")
+    assert compiled.with_backend("numba") is compiled
+    # The copy shares the instance data and the compiled kernels
+    assert compiled.weight is fitness_function.weight
+    assert compiled._kernels is fitness_function._kernels
+
+    results = ResultCache()
+    results.solve("knapsack", instance_id, options_for(fitness_function, backend="numba"), 3)
+    assert fitness_function.backend == "python"
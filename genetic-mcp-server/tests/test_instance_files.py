@@ -0,0 +1,69 @@
+import pickle
+import zipfile
+
+import pytest
+
+from genetic_algorithm.fitness_functions.instance_files import load_instance_fields
+from genetic_algorithm.main import build_fitness_function, main
+from genetic_algorithm.chromosome import Chromosome
+
+np = pytest.importorskip("numpy")
+
+@pytest.fixture
+def instance_file(tmp_path):
+    points = np.random.default_rng(0).uniform(0, 100, size=(50, 2))
+    matrix = np.sqrt(((points[:, None, :] - points[None, :, :]) ** 2).sum(axis=2))
+    path = str(tmp_path / "instance.npz")
+    np.savez(path, distance_matrix=matrix, cities=np.arange(50))
+    return path, matrix
+
+def test_matrices_stay_mapped_and_vectors_become_lists(instance_file):
+    path, matrix = instance_file
+    fields = load_instance_fields({"instance_file": path})
+
+    assert isinstance(fields["distance_matrix"], np.memmap)
+    assert fields["cities"] == list(range(50))
+    assert np.array_equal(fields["distance_matrix"], matrix)
+
+def test_mapped_matrices_are_pickled_without_their_data(instance_file):
+    path, matrix = instance_file
+    fields = load_instance_fields({"instance_file": path})
+    data = pickle.dumps(fields["distance_matrix"])
+
+    assert len(data) < matrix.nbytes / 10
+    restored = pickle.loads(data)
+    assert isinstance(restored, np.memmap)
+    assert np.array_equal(restored, matrix)
+
+def test_fitness_functions_with_mapped_matrices_survive_pickling(instance_file):
+    path, _ = instance_file
+    fitness_function = build_fitness_function("traveling_salesman", {"instance_file": path})
+    restored = pickle.loads(pickle.dumps(fitness_function))
+    tour = list(range(50))
+
+    assert restored.calculate_fitness(Chromosome(size=50, values=tour)) \
+        == fitness_function.calculate_fitness(Chromosome(size=50, values=tour))
+
+@pytest.mark.parametrize("reference", ["instance_file", "field"])
+def test_traveling_salesman_solves_from_coordinates_files(tmp_path, reference):
+    points = np.random.default_rng(1).uniform(0, 100, size=(30, 2))
+    path = str(tmp_path / "coordinates.npz")
+    np.savez(path, coordinates=points)
+    fields = {"instance_file": path} if reference == "instance_file" else {"coordinates": {"file": path, "key": "coordinates"}}
+    inline = build_fitness_function("traveling_salesman", {"coordinates": points.tolist()})
+
+    options = {"population_size": 20, "chromosome_size": 30, "crossover": "ox", "mutation": "inversion", "seed": 3}
+    from_file = main(options={**options, "fitness_function": fields}, problem="traveling_salesman", generations=5)
+    from_list = main(options={**options, "fitness_function": inline}, problem="traveling_salesman", generations=5)
+
+    assert sorted(from_file["best_chromosome"]) == list(range(30))
+    assert from_file["best_fitness"] == from_list["best_fitness"]
+
+def test_unsupported_npy_versions_are_rejected(tmp_path):
+    path = str(tmp_path / "instance.npz")
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED) as archive:
+        with archive.open("distance_matrix.npy", "w") as member:
+            np.lib.format.write_array(member, np.ones((3, 3)), version=(3, 0))
+
+    with pytest.raises(ValueError, match="version 3.0"):
+        load_instance_fields({"instance_file": path})
@@ -0,0 +1,58 @@
+import socket
+
+import pytest
+
+from genetic_algorithm.islands import FRAME_HEADER, HELLO, PUT, Migration, MigrationBroker, _receive_frame, _send_frame, encode_migrants
+
+def test_oversized_frame_is_rejected_before_its_payload():
+    sender, receiver = socket.socketpair()
+    with sender, receiver:
+        # Only the header is sent: reading the announced payload would block
+        sender.sendall(FRAME_HEADER.pack(PUT, 1 << 31))
+        receiver.settimeout(1)
+        with pytest.raises(ConnectionError):
+            _receive_frame(receiver, max_size=1024)
+
+def test_broker_closes_connections_sending_oversized_frames():
+    broker = MigrationBroker(max_frame_size=1024).start()
+    try:
+        with socket.create_connection(broker.server_address, timeout=2) as sock:
+            _send_frame(sock, HELLO, b"group")
+            assert _receive_frame(sock)[0] == HELLO
+            sock.sendall(FRAME_HEADER.pack(PUT, 4096))
+            assert sock.recv(1) == b""
+    finally:
+        broker.shutdown()
+        broker.server_close()
+
+def test_migrants_are_exchanged_within_the_frame_size():
+    broker = MigrationBroker().start()
+    try:
+        first, second = Migration(broker.address, group="ring"), Migration(broker.address, group="ring")
+        assert first.exchange([]) == [] and second.exchange([]) == []
+        first.exchange([[1, 2, 3], [3, 2, 1]])
+        assert second.exchange([]) == [[1, 2, 3], [3, 2, 1]]
+        first.close()
+        second.close()
+    finally:
+        broker.shutdown()
+        broker.server_close()
+
+def test_broker_defaults_to_localhost():
+    broker = MigrationBroker()
+    try:
+        assert broker.server_address[0] == "127.0.0.1"
+    finally:
+        broker.server_close()
+
+def test_broker_sends_waiting_batches_over_several_messages():
+    batch = encode_migrants([[1, 2, 3]])
+    broker = MigrationBroker(max_frame_size=2 * (4 + len(batch)))
+    try:
+        island = broker.join("group")
+        broker.mailboxes[island].extend([batch] * 3)
+        assert len(broker.get(island)) == 2
+        assert len(broker.get(island)) == 1
+        assert broker.get(island) == []
+    finally:
+        broker.server_close()
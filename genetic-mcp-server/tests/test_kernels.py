@@ -0,0 +1,99 @@
+from array import array
+import importlib.util
+import random
+
+import pytest
+
+from genetic_algorithm import kernels, operators
+from genetic_algorithm.chromosome import Chromosome
+from genetic_algorithm.main import build_fitness_function, main
+
+requires_numba = pytest.mark.skipif(importlib.util.find_spec("numba") is None, reason="Numba is not installed")
+
+def test_auto_keeps_small_instances_on_python():
+    assert kernels.resolve_backend("auto", kernels.NUMBA_MIN_SIZE - 1) == "python"
+    assert kernels.resolve_backend("python", kernels.NUMBA_MIN_SIZE * 10) == "python"
+    with pytest.raises(ValueError):
+        kernels.resolve_backend("fortran")
+
+def test_runs_pass_their_chromosome_size_to_auto():
+    options = {
+        "population_size": 10, "chromosome_size": 8, "crossover": "ox", "mutation": "swap", "seed": 0, "backend": "auto",
+        "fitness_function": {"coordinates": [[random.Random(i).uniform(0, 100), i] for i in range(8)]},
+    }
+    assert main(options=options, problem="traveling_salesman", generations=2)["backend"] == "python"
+
+@requires_numba
+def test_auto_selects_numba_for_large_instances():
+    assert kernels.resolve_backend("auto", kernels.NUMBA_MIN_SIZE) == "numba"
+    assert kernels.resolve_backend("auto") == "numba"
+
+@requires_numba
+@pytest.mark.parametrize("python_operator, compiled_operator", [
+    (operators.order_crossover, kernels.compiled_order_crossover),
+    (operators.partially_mapped_crossover, kernels.compiled_partially_mapped_crossover),
+])
+def test_compiled_crossovers_match_python(python_operator, compiled_operator):
+    rng = random.Random(1)
+    for _ in range(50):
+        size = rng.randint(2, 40)
+        genes = rng.sample(range(1000), size)
+        parent1, parent2 = array("i", rng.sample(genes, size)), array("i", rng.sample(genes, size))
+        children = [array("i", [0] * size) for _ in range(4)]
+        state = rng.random()
+        random.seed(state)
+        python_operator(parent1, parent2, children[0], children[1])
+        random.seed(state)
+        compiled_operator(parent1, parent2, children[2], children[3])
+
+        assert children[:2] == children[2:]
+
+@requires_numba
+def test_compiled_swap_mutation_keeps_permutations():
+    values = array("i", random.Random(2).sample(range(100), 50))
+    kernels.compiled_swap_mutation(values, 0.3, None, lambda: True)
+    assert sorted(values) == sorted(random.Random(2).sample(range(100), 50))
+
+@requires_numba
+@pytest.mark.parametrize("metric", ["euclidean", "manhattan", "haversine"])
+def test_compiled_tour_lengths_match_python(metric):
+    rng = random.Random(3)
+    fitness_function = build_fitness_function("traveling_salesman", {
+        "coordinates": [[rng.uniform(-80, 80), rng.uniform(-170, 170)] for _ in range(60)], "metric": metric,
+    })
+    tours = [Chromosome(size=60, values=rng.sample(fitness_function.cities, 60)) for _ in range(20)]
+    expected = [fitness_function.calculate_fitness(tour.copy()) for tour in tours]
+
+    assert fitness_function.with_backend("numba").calculate_fitness_batch(tours) == expected
+
+@requires_numba
+def test_compiled_knapsack_repair_matches_python():
+    rng = random.Random(4)
+    fitness_function = build_fitness_function("knapsack", {
+        "capacity": [rng.randint(1, 5) for _ in range(30)],
+        "weight": [rng.randint(1, 100) for _ in range(30)],
+        "value": [rng.randint(1, 100) for _ in range(30)],
+        "max_weight": 500,
+    })
+    for _ in range(50):
+        values = [rng.randint(-2, 8) for _ in range(rng.randint(1, 30))]
+        expected = list(fitness_function.repair_chromosome(values, 30).values)
+        assert list(fitness_function.with_backend("numba").repair_chromosome(values, 30).values) == expected
+
+@requires_numba
+def test_runs_with_different_backends_share_a_cached_instance():
+    from cache import InstanceCache
+
+    rng = random.Random(5)
+    fields = {"coordinates": [[rng.uniform(0, 100), rng.uniform(0, 100)] for _ in range(30)]}
+    _, fitness_function = InstanceCache().resolve("traveling_salesman", fields, None)
+    options = {"population_size": 20, "chromosome_size": 30, "fitness_function": fitness_function, "crossover": "ox", "seed": 1}
+
+    compiled = main(options={**options, "backend": "numba"}, problem="traveling_salesman", generations=3)
+    assert compiled["backend"] == "numba"
+    assert fitness_function.backend == "python"
+    assert "tour_lengths" in fitness_function._kernels
+
+    python = main(options={**options, "backend": "python"}, problem="traveling_salesman", generations=3)
+    assert python["backend"] == "python"
+    assert python["best_fitness"] == pytest.approx(compiled["best_fitness"])
@@ -0,0 +1,97 @@
+from array import array
+from collections import Counter
+import json
+import os
+import random
+
+import pytest
+
+from genetic_algorithm.chromosome import Chromosome
+from genetic_algorithm.main import main
+from genetic_algorithm.operators import (
+    _weighted_selection, CROSSOVER_OPERATORS, MUTATION_OPERATORS, PERMUTATION_OPERATORS, SELECTION_OPERATORS
+)
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "genetic_algorithm", "samples", "tsp.json")
+
+def population(fitnesses):
+    chromosomes = []
+    for k, fitness in enumerate(fitnesses):
+        chromosome = Chromosome(size=1, values=[k])
+        chromosome.fitness = fitness
+        chromosomes.append(chromosome)
+    return chromosomes
+
+def test_weighted_selection_with_all_zero_weights_draws_uniformly():
+    random.seed(0)
+    chromosomes = population([0] * 10)
+    selected = _weighted_selection(chromosomes, [0] * 10, 8)
+
+    assert len(selected) == 8
+    assert len({id(chromosome) for chromosome in selected}) == 8
+
+def test_weighted_selection_draws_zero_weights_once_the_weighted_ones_are_taken():
+    random.seed(0)
+    chromosomes = population([5, 0, 0, 0])
+    selected = _weighted_selection(chromosomes, [5, 0, 0, 0], 4)
+
+    assert selected[0] is chromosomes[0]
+    assert {id(chromosome) for chromosome in selected} == {id(chromosome) for chromosome in chromosomes}
+
+@pytest.mark.parametrize("name", sorted(SELECTION_OPERATORS))
+def test_selection_operators_return_distinct_parents_with_zero_fitness(name):
+    random.seed(0)
+    chromosomes = population([0] * 6 + [1, 2])
+    selected = SELECTION_OPERATORS[name](chromosomes, 6)
+
+    assert len(selected) == 6
+    assert len({id(chromosome) for chromosome in selected}) == 6
+
+@pytest.mark.parametrize("name", sorted(PERMUTATION_OPERATORS["crossover"]))
+@pytest.mark.parametrize("container", [list, lambda values: array("i", values)])
+def test_permutation_crossovers_produce_permutations(name, container):
+    rng = random.Random(0)
+    for size in list(range(1, 12)) * 5 + [50]:
+        genes = rng.sample(range(1000), size)
+        parent1, parent2 = container(rng.sample(genes, size)), container(rng.sample(genes, size))
+        child1, child2 = container([0] * size), container([0] * size)
+        CROSSOVER_OPERATORS[name](parent1, parent2, child1, child2)
+
+        assert sorted(child1) == sorted(genes)
+        assert sorted(child2) == sorted(genes)
+
+@pytest.mark.parametrize("name", sorted(PERMUTATION_OPERATORS["mutation"]))
+@pytest.mark.parametrize("accepted", [True, False])
+def test_permutation_mutations_produce_permutations(name, accepted):
+    rng = random.Random(1)
+    for size in list(range(1, 12)) * 5 + [50]:
+        genes = rng.sample(range(1000), size)
+        values = array("i", genes)
+        MUTATION_OPERATORS[name](values, 0.5, None, lambda: accepted)
+
+        assert sorted(values) == sorted(genes)
+        if not accepted:
+            assert list(values) == genes
+
+@pytest.mark.parametrize("crossover", sorted(CROSSOVER_OPERATORS))
+@pytest.mark.parametrize("mutation", sorted(MUTATION_OPERATORS))
+def test_every_operator_keeps_tours_valid(crossover, mutation):
+    with open(SAMPLE) as file:
+        options = json.load(file)["options"]
+    options = {**options, "population_size": 20, "crossover": crossover, "mutation": mutation, "mutation_rate": 0.3, "seed": 0}
+    result = main(options=options, problem="traveling_salesman", generations=10)
+
+    assert sorted(result["best_chromosome"]) == sorted(options["fitness_function"]["cities"])
+
+def test_weighted_selection_draws_in_proportion_to_the_weights():
+    random.seed(0)
+    chromosomes = population([1, 2, 3, 4])
+    firsts = Counter(id(_weighted_selection(chromosomes, [1, 2, 3, 4], 2)[0]) for _ in range(20000))
+    seconds = Counter(id(_weighted_selection(chromosomes, [1, 2, 3, 4], 2)[1]) for _ in range(20000))
+
+    for weight, chromosome in zip([1, 2, 3, 4], chromosomes):
+        assert firsts[id(chromosome)] / 20000 == pytest.approx(weight / 10, abs=0.015)
+    # Second draw of the wheel without the first chromosome, e.g. P(1 second) = sum of P(k first) * 1 / (10 - k)
+    expected = {1: sum(k / 10 * 1 / (10 - k) for k in (2, 3, 4)), 4: sum(k / 10 * 4 / (10 - k) for k in (1, 2, 3))}
+    assert seconds[id(chromosomes[0])] / 20000 == pytest.approx(expected[1], abs=0.015)
+    assert seconds[id(chromosomes[3])] / 20000 == pytest.approx(expected[4], abs=0.015)
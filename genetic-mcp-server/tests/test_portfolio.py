@@ -0,0 +1,35 @@
+from batch import run_pack
+from genetic_algorithm.main import main
+import genetic_algorithm.portfolio as portfolio
+
+FIELDS = {
+    "capacity": [1, 2, 1, 3, 1, 2],
+    "weight": [12, 7, 11, 8, 9, 5],
+    "value": [24, 13, 23, 15, 16, 9],
+    "max_weight": 40,
+}
+
+def portfolio_options(**overrides):
+    options = {
+        "population_size": 20, "chromosome_size": 6, "fitness_function": FIELDS, "seed": 2,
+        "portfolio": [{"selection": "tournament"}, {"crossover": "uniform"}], "race_interval": 2,
+    }
+    return {**options, **overrides}
+
+def no_processes(*args, **kwargs):
+    raise AssertionError("The portfolio started a process.")
+
+def test_sequential_portfolio_matches_the_parallel_one():
+    parallel = main(options=portfolio_options(), problem="knapsack", generations=6)
+    sequential = main(options=portfolio_options(portfolio_parallel=False), problem="knapsack", generations=6)
+
+    assert sequential["configuration"] == parallel["configuration"]
+    assert sequential["best_fitness"] == parallel["best_fitness"]
+
+def test_batch_workers_race_portfolios_in_turn(monkeypatch):
+    monkeypatch.setattr(portfolio.multiprocessing, "Process", no_processes)
+    [(index, result)] = run_pack([(0, "knapsack", portfolio_options(), 6)])
+
+    assert index == 0
+    assert "error" not in result
+    assert len(result["portfolio"]) == 2
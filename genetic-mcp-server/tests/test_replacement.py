@@ -0,0 +1,41 @@
+import json
+import os
+
+import pytest
+
+from genetic_algorithm.gen_alg import GeneticAlgorithm
+from genetic_algorithm.main import main
+
+SAMPLES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "genetic_algorithm", "samples")
+
+def sample_options(name):
+    with open(os.path.join(SAMPLES, f"{name}.json")) as file:
+        return json.load(file)["options"]
+
+@pytest.mark.parametrize("replacement", ["elitism", "steady_state", "mu_plus_lambda"])
+@pytest.mark.parametrize("problem, sample, operators", [
+    ("knapsack", "knapsack", {}),
+    ("traveling_salesman", "tsp", {"crossover": "ox", "mutation": "inversion"}),
+])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_replacement_never_loses_the_best_fitness(replacement, problem, sample, operators, seed):
+    options = {
+        **sample_options(sample), **operators,
+        "population_size": 30, "replacement": replacement, "mutation_rate": 0.3, "seed": seed, "history": True,
+    }
+    result = main(options=options, problem=problem, generations=25)
+    best = result["history"]["best_fitness"]
+
+    assert all(later >= earlier for earlier, later in zip(best, best[1:]))
+    assert result["best_fitness"] >= best[-1]
+
+def test_elitism_evaluates_only_the_changed_chromosomes(monkeypatch):
+    batches = []
+    evaluate = GeneticAlgorithm.evaluate
+    monkeypatch.setattr(GeneticAlgorithm, "evaluate", lambda self, chromosomes: batches.append(len(chromosomes)) or evaluate(self, chromosomes))
+    options = {**sample_options("knapsack"), "population_size": 30, "replacement": "elitism", "seed": 0}
+
+    # Without crossover and mutation, the elitism step has nothing to evaluate
+    main(options={**options, "mutation_rate": 0.0, "crossover_rate": 0.0}, problem="knapsack", generations=5)
+    population = batches[0]
+    assert batches == [population, 0] * 5 + [population]
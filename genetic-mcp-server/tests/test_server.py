@@ -0,0 +1,72 @@
+import asyncio
+import json
+
+import pytest
+
+server = pytest.importorskip("server")
+
+FIELDS = {"capacity": [2, 2, 2], "weight": [1, 2, 3], "value": [10, 15, 40], "max_weight": 6}
+
+def call_tool(name, arguments):
+    return asyncio.run(server.mcp.call_tool(name, arguments))
+
+def structured(output):
+    content, structured_output = output if isinstance(output, tuple) else (output, None)
+    return structured_output.get("result", structured_output) if structured_output else json.loads(content[0].text)
+
+@pytest.mark.parametrize("tool", ["knapsack_problem", "traveling_salesman_problem", "vehicle_routing_problem"])
+def test_solve_tools_expose_every_option_with_its_default(tool):
+    [definition] = [definition for definition in asyncio.run(server.mcp.list_tools()) if definition.name == tool]
+    properties = definition.inputSchema["properties"]
+
+    for name, (_, default) in {**server.SOLVE_PARAMETERS, **server.GA_OPTIONS}.items():
+        assert properties[name]["default"] == default
+
+def test_batch_problems_share_the_cached_results_of_the_tools():
+    arguments = {"chromosome_size": 3, "population_size": 10, "generations": 5, "seed": 11, "fitness_function": FIELDS}
+    single = structured(call_tool("knapsack_problem", arguments))
+    [batched] = structured(call_tool("solve_batch", {"problems": [{"problem": "knapsack", **arguments}]}))
+
+    assert single["cached"] is False
+    assert batched["cached"] is True
+    assert batched["best_fitness"] == single["best_fitness"]
+
+def test_invalid_options_fail_only_their_batch_problem():
+    outputs = structured(call_tool("solve_batch", {"problems": [
+        {"problem": "knapsack", "chromosome_size": 0, "fitness_function": FIELDS},
+        {"problem": "unknown"},
+    ]}))
+
+    assert "Chromosome size must be a positive integer." in outputs[0]["error"]
+    assert "Unknown problem type" in outputs[1]["error"]
+
+def test_diversity_options_reach_the_genetic_algorithm():
+    arguments = {"chromosome_size": 3, "population_size": 10, "generations": 3, "fitness_function": FIELDS, "adaptation": "diversity"}
+    result = structured(call_tool("knapsack_problem", {**arguments, "diversity_measure": "hamming", "diversity_bounds": [0.2, 0.3]}))
+    assert result["best_fitness"] > 0
+
+    # The options are checked when the problems run in the worker processes (called directly: progress needs a request)
+    outputs = asyncio.run(server.solve_batch(problems=[
+        {"problem": "knapsack", **arguments, "diversity_measure": "unknown"},
+        {"problem": "knapsack", **arguments, "diversity_bounds": [0.5, 0.1]},
+    ]))
+    assert "Unknown diversity measure" in outputs[0]["error"]
+    assert "error" in outputs[1]
+
+def test_coordinates_files_round_trip_through_upload_and_batch(tmp_path):
+    np = pytest.importorskip("numpy")
+    path = str(tmp_path / "coordinates.npz")
+    np.savez(path, coordinates=np.random.default_rng(5).uniform(0, 100, size=(25, 2)))
+    instance_id = structured(call_tool("upload_instance", {"problem": "traveling_salesman", "fitness_function": {"instance_file": path}}))["instance_id"]
+
+    arguments = {"chromosome_size": 25, "population_size": 20, "generations": 5, "crossover": "ox", "instance_id": instance_id}
+    single = structured(call_tool("traveling_salesman_problem", {**arguments, "seed": 1}))
+    # New seeds, so the batch problems run in the worker processes (called directly: progress needs a request)
+    outputs = asyncio.run(server.solve_batch(problems=[
+        {"problem": "traveling_salesman", **arguments, "seed": seed} for seed in (2, 3)
+    ]))
+
+    for result in [single] + outputs:
+        assert "error" not in result
+        assert sorted(result["best_chromosome"]) == list(range(25))
+    assert [output["cached"] for output in outputs] == [False, False]
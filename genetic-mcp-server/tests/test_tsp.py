@@ -0,0 +1,31 @@
+import random
+
+from genetic_algorithm.fitness_functions.tsp_function import TravelingSalesmanFitnessFunction
+
+def clustered_instance(clusters, size):
+    rng = random.Random(0)
+    centers = [(rng.uniform(0, 10000), rng.uniform(0, 10000)) for _ in range(clusters)]
+    return TravelingSalesmanFitnessFunction({
+        "coordinates": [[x + rng.uniform(0, 10), y + rng.uniform(0, 10)] for x, y in centers for _ in range(size)]
+    })
+
+def tour_length(fitness_function, tour):
+    return sum(fitness_function.distance_matrix.distance(tour[k - 1], tour[k]) for k in range(len(tour)))
+
+def test_greedy_edge_tour_joins_the_paths_left_by_the_nearest_neighbors():
+    # With 4 neighbors per city, no candidate edge leaves a cluster of 10 cities
+    fitness_function = clustered_instance(8, 10)
+    fitness_function.GREEDY_NEIGHBORS = 4
+    tour = fitness_function._greedy_edge_tour()
+
+    assert sorted(tour) == fitness_function.cities
+
+def test_nearest_neighbor_candidates_keep_the_greedy_edge_tour_quality():
+    rng = random.Random(1)
+    fitness_function = TravelingSalesmanFitnessFunction({"coordinates": [[rng.uniform(0, 1000), rng.uniform(0, 1000)] for _ in range(200)]})
+    limited = fitness_function._greedy_edge_tour()
+    fitness_function.GREEDY_NEIGHBORS = 200
+    complete = fitness_function._greedy_edge_tour()
+
+    assert sorted(limited) == fitness_function.cities
+    assert tour_length(fitness_function, limited) <= 1.05 * tour_length(fitness_function, complete)
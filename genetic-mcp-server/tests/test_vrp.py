@@ -0,0 +1,94 @@
+import json
+import os
+import random
+
+import pytest
+
+from genetic_algorithm.chromosome import Chromosome
+from genetic_algorithm.fitness_functions.vrp_function import VehicleRoutingFitnessFunction
+from genetic_algorithm.main import main
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "genetic_algorithm", "samples", "vrp.json")
+
+def sample_fields(**overrides):
+    with open(SAMPLE) as file:
+        fields = json.load(file)["options"]["fitness_function"]
+    return {**fields, **overrides}
+
+def loads(fitness_function, routes):
+    return [sum(fitness_function.client_demands[client] for client in route) for route in routes]
+
+def test_split_unlimited_fleet_serves_every_client_within_capacity():
+    fitness_function = VehicleRoutingFitnessFunction(sample_fields())
+    distance, routes = fitness_function.split(fitness_function.clients)
+
+    assert distance < float("inf")
+    assert sorted(client for route in routes for client in route) == fitness_function.clients
+    assert all(load <= 20 for load in loads(fitness_function, routes))
+
+def test_split_limited_fleet_respects_vehicle_count_and_capacities():
+    fitness_function = VehicleRoutingFitnessFunction(sample_fields(vehicle_capacity=[20, 17, 15]))
+    tour = [9, 4, 1, 11, 12, 8, 6, 5, 2, 3, 7, 10]
+    distance, routes = fitness_function.split(tour)
+
+    assert distance < float("inf")
+    assert len(routes) <= 3
+    assert [client for route in routes for client in route] == tour
+    assert all(load <= capacity for load, capacity in zip(loads(fitness_function, routes), fitness_function.fleet))
+
+def test_unsplittable_tour_keeps_a_positive_fitness_and_reports_a_violation():
+    # The demands sum to 47: two vehicles of 10 can never serve them
+    fitness_function = VehicleRoutingFitnessFunction(sample_fields(vehicle_capacity=[10, 10]))
+    chromosome = Chromosome(size=12, values=fitness_function.clients)
+
+    assert fitness_function.split(chromosome.values)[0] == float("inf")
+    [fitness] = fitness_function.calculate_fitness_batch([chromosome])
+    assert 0 < fitness < float("inf")
+    [violation] = fitness_function.calculate_violation_batch([chromosome])
+    assert violation > 0
+    assert violation == fitness_function.constraint_violation(chromosome)
+    assert fitness_function.objective(chromosome, "distance") == float("inf")
+
+@pytest.mark.parametrize("constraint_handling", ["rejection", "static_penalty"])
+@pytest.mark.parametrize("capacity", [[16, 16, 16], [10, 10]])
+def test_limited_fleet_runs_finish(capacity, constraint_handling):
+    options = {
+        "population_size": 20,
+        "chromosome_size": 12,
+        "fitness_function": sample_fields(vehicle_capacity=capacity),
+        "constraint_handling": constraint_handling,
+        "seed": 1,
+    }
+    result = main(options=options, problem="vehicle_routing", generations=5)
+
+    assert result["best_fitness"] > 0
+    assert sorted(client for route in result["routes"] for client in route) == list(range(1, 13))
+
+def test_rejection_checks_reuse_the_split_of_evaluated_tours(monkeypatch):
+    fitness_function = VehicleRoutingFitnessFunction(sample_fields(vehicle_capacity=[10, 10]))
+    chromosome = Chromosome(size=12, values=fitness_function.clients)
+    splits = []
+    split = fitness_function.split
+    monkeypatch.setattr(fitness_function, "split", lambda tour, relaxed=False: splits.append(relaxed) or split(tour, relaxed))
+
+    fitness_function.calculate_fitness_batch([chromosome])
+    assert splits == [True, False]
+    assert fitness_function.constraint_violation(chromosome) > 0
+    assert fitness_function.constraint_violation(Chromosome(size=12, values=list(fitness_function.clients))) > 0
+    assert splits == [True, False]
+
+@pytest.mark.parametrize("capacity", [16, [16, 16, 16], [20, 12, 12, 8]])
+def test_relaxed_first_decoding_matches_the_fleet_split(capacity):
+    fitness_function = VehicleRoutingFitnessFunction(sample_fields(vehicle_capacity=capacity))
+    rng = random.Random(5)
+    for _ in range(50):
+        tour = rng.sample(fitness_function.clients, len(fitness_function.clients))
+        distance, routes = fitness_function.split(tour)
+        chromosome = Chromosome(size=12, values=tour)
+        fitness_function.calculate_fitness_batch([chromosome])
+
+        if distance == float("inf"):
+            assert fitness_function.constraint_violation(chromosome) > 0
+        else:
+            assert chromosome.distance == pytest.approx(distance)
+            assert fitness_function.constraint_violation(chromosome) == 0